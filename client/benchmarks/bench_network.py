@@ -0,0 +1,41 @@
+"""
+Benchmark for building a network: `Router`s with `Computer`s behind them (every host opens the identity database,
+creates its root user and boots its file system).
+
+Run from the `client` directory:
+    python -m benchmarks.bench_network [--routers 10] [--hosts 10] [--db blackhat.db]
+"""
+import argparse
+import time
+
+from blackhat.computer import Computer, Router, ISPRouter
+from blackhat.database import MEMORY, get_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark building a network of Computers")
+    parser.add_argument("--routers", type=int, default=10)
+    parser.add_argument("--hosts", type=int, default=10, help="Computers behind each router")
+    parser.add_argument("--db", default="blackhat.db", help=f"The identity database ({MEMORY} for in-memory)")
+    args = parser.parse_args()
+
+    database = get_database(args.db)
+    start = time.perf_counter()
+
+    isp = ISPRouter(database)
+    for _ in range(args.routers):
+        router = Router(database)
+        for _ in range(args.hosts):
+            router.add_new_client(Computer(database))
+        isp.add_new_client(router)
+
+    elapsed = time.perf_counter() - start
+    total = 1 + args.routers * (args.hosts + 1)
+
+    print(f"routers={args.routers} hosts={args.hosts} ({total} machines) db={args.db}")
+    print(f"  total:        {elapsed:10.3f} s")
+    print(f"  per machine:  {elapsed / total * 1e3:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark for seeding a `Computer` with lots of accounts: one `adduser` per user (a commit each) compared with one
+`newusers` batch (a single transaction). Each run gets a fresh `Computer` in its own in-memory database.
+
+Run from the `client` directory:
+    python -m benchmarks.bench_newusers [--users 2000]
+"""
+import argparse
+import time
+
+from blackhat.computer import Computer
+from blackhat.database import MEMORY, Database
+from blackhat.session import Session
+
+
+def new_computer() -> Computer:
+    computer = Computer(Database(MEMORY))
+    computer.sessions.append(Session(0, computer.fs.files, 0))
+    return computer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark creating users with adduser and newusers")
+    parser.add_argument("--users", type=int, default=2000)
+    args = parser.parse_args()
+
+    computer = new_computer()
+    start = time.perf_counter()
+    for number in range(args.users):
+        computer.run_command("adduser", [f"user{number}", "-p", "password", "-n"], True)
+    adduser = time.perf_counter() - start
+
+    computer = new_computer()
+    computer.sys_creat("/root/users", 0o600)
+    computer.sys_write("/root/users", "".join(f"user{number}:password\n" for number in range(args.users)))
+    start = time.perf_counter()
+    computer.run_command("newusers", ["/root/users"], True)
+    newusers = time.perf_counter() - start
+
+    print(f"users={args.users}")
+    print(f"  adduser (each):    {adduser:10.3f} s ({adduser / args.users * 1e3:.3f} ms/user)")
+    print(f"  newusers (batch):  {newusers:10.3f} s ({newusers / args.users * 1e3:.3f} ms/user)")
+
+
+if __name__ == "__main__":
+    main()
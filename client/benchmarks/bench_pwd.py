@@ -0,0 +1,60 @@
+"""
+Microbenchmark for `FSBaseObject.pwd()` on deep trees.
+
+Compares the memoized path with the old behaviour (walking every parent pointer on every call, simulated by
+invalidating the cache before each call), and measures the cost of re-caching after moving a subtree.
+
+Run from the `client` directory:
+    python -m benchmarks.bench_pwd [--depth 200] [--calls 10000]
+"""
+import argparse
+import timeit
+
+from blackhat.fs import Directory, File
+
+
+def build_tree(depth: int):
+    root = Directory("/", None, 0, 0)
+    current = root
+
+    for level in range(depth):
+        current = Directory(f"dir{level}", current, 0, 0)
+
+    leaf = File("leaf", "content", current, 0, 0)
+
+    return root, leaf
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FSBaseObject.pwd() on deep trees")
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=10000)
+    args = parser.parse_args()
+
+    root, leaf = build_tree(args.depth)
+
+    def uncached():
+        root.invalidate_path()
+        leaf.pwd()
+
+    cold = timeit.timeit(uncached, number=args.calls)
+    warm = timeit.timeit(leaf.pwd, number=args.calls)
+
+    # Moving the top directory invalidates the whole chain below it once
+    top = root.files["dir0"]
+    other = Directory("other", root, 0, 0)
+
+    def move_and_pwd():
+        top.move(other if top.parent is root else root)
+        leaf.pwd()
+
+    moved = timeit.timeit(move_and_pwd, number=min(args.calls, 1000))
+
+    print(f"depth={args.depth} calls={args.calls}")
+    print(f"  walk every call:   {cold / args.calls * 1e6:10.3f} us/call")
+    print(f"  memoized:          {warm / args.calls * 1e6:10.3f} us/call ({cold / warm:.0f}x faster)")
+    print(f"  move + re-cache:   {moved / min(args.calls, 1000) * 1e6:10.3f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark for saving and loading a world: `Router`s with `Computer`s behind them are pickled to a save file (a full
+snapshot), one file is changed and saved again (only the change is appended to the journal), then the world is loaded
+back (and every machine writes its identities back to the database the first time it needs it).
+
+Run from the `client` directory:
+    python -m benchmarks.bench_save [--routers 10] [--hosts 10] [--save /tmp/blackhat.save]
+"""
+import argparse
+import os
+import time
+
+from blackhat.computer import Computer, Router, ISPRouter
+from blackhat.database import MEMORY, Database
+from blackhat.journal import JOURNAL_SUFFIX
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark saving and loading a network of Computers")
+    parser.add_argument("--routers", type=int, default=10)
+    parser.add_argument("--hosts", type=int, default=10, help="Computers behind each router")
+    parser.add_argument("--save", default="/tmp/blackhat.save", help="Where to write the save file")
+    args = parser.parse_args()
+
+    database = Database(MEMORY)
+    isp = ISPRouter(database)
+    for _ in range(args.routers):
+        router = Router(database)
+        for _ in range(args.hosts):
+            router.add_new_client(Computer(database))
+        isp.add_new_client(router)
+    total = 1 + args.routers * (args.hosts + 1)
+
+    start = time.perf_counter()
+    if not isp.save(args.save):
+        raise SystemExit("Failed to save!")
+    save_time = time.perf_counter() - start
+
+    isp.fs.find("/etc/hostname").data.write("changed", isp)
+    start = time.perf_counter()
+    if not isp.save(args.save):
+        raise SystemExit("Failed to save!")
+    incremental_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = Computer.load(args.save, Database(MEMORY)).data
+    load_time = time.perf_counter() - start
+
+    # Touching the database writes the machine's identities back
+    start = time.perf_counter()
+    for computer in loaded.get_world():
+        computer.db
+    reconnect_time = time.perf_counter() - start
+
+    print(f"routers={args.routers} hosts={args.hosts} ({total} machines) save={os.path.getsize(args.save)} bytes")
+    print(f"  save:         {save_time:10.3f} s")
+    print(f"  incremental:  {incremental_time * 1e3:10.3f} ms (one file changed, "
+          f"{os.path.getsize(args.save + JOURNAL_SUFFIX)} byte journal)")
+    print(f"  load:         {load_time:10.3f} s")
+    print(f"  reconnect:    {reconnect_time:10.3f} s")
+    print(f"  per machine:  {(save_time + load_time + reconnect_time) / total * 1e3:10.3f} ms")
+
+    os.remove(args.save)
+    os.remove(args.save + JOURNAL_SUFFIX)
+
+
+if __name__ == "__main__":
+    main()
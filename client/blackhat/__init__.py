@@ -1 +1 @@
-from . import bin, lib, services, computer, fs, helpers, session, shell, user, tests
+from . import bin, lib, services, computer, events, fs, helpers, session, shell, user, tests
@@ -1,4 +1,5 @@
 from . import touch, rm, printenv, mv, installable, rmdir, ssh, nano, uname, sha512sum, exit, sudo, \
     echo, chmod, uptime, passwd, sha1sum, cat, hostname, sha256sum, pwd, base32, su, chown, save, adduser, \
     sha224sum, base64, cd, who, export, cp, date, commands, id, tail, clear, ls, wc, env, md5sum, man, sha384sum, \
-    whoami, reboot, head, apt, unset, mkdir, users, load, poweroff
+    whoami, reboot, head, apt, unset, mkdir, users, load, poweroff, updatedb, locate, grep, du, df, ln, readlink, mount, \
+    search, newusers
@@ -9,12 +9,13 @@
 from ..lib.input import ArgParser
 from ..lib.output import output
 from ..lib.sys.stat import stat, mkdir
-from ..lib.unistd import get_user, get_all_users, write, add_user, add_group, add_user_to_group, chown, geteuid, read
+from ..lib.unistd import get_user, allocate_uid, write, add_user, add_group, add_user_to_group, chown, geteuid, read, \
+    identity_transaction
 
 __COMMAND__ = "adduser"
 __DESCRIPTION__ = ""
 __DESCRIPTION_LONG__ = ""
-__VERSION__ = "1.0"
+__VERSION__ = "1.2"
 
 
 def parse_args(args=None, doc=False):
@@ -97,17 +98,7 @@ def main(args: list, pipe: bool) -> Result:
             return output(f"{__COMMAND__}: The user '{args.username}' already exists.", pipe, success=False,
                           success_message=ResultMessages.ALREADY_EXISTS)
 
-        prev_uid = get_all_users().data[-1].uid
-
-        if prev_uid == 0:
-            next_uid = 1000
-        else:
-            next_uid = prev_uid + 1
-            user_with_next_uid = get_user(uid=next_uid)
-
-            while user_with_next_uid.success:
-                next_uid += 1
-                user_with_next_uid = get_user(uid=next_uid)
+        next_uid = allocate_uid()
 
         if not args.password:
             if args.noninteractive:
@@ -138,10 +129,20 @@ def main(args: list, pipe: bool) -> Result:
         else:
             password = args.password
 
-        user_result = add_user(args.username, password)
-        group_result = add_group(args.username)
-        # Find the user object and its group to the new group
-        add_user_to_group(user_result.data, group_result.data, membership_type="primary")
+        # The user, its group and the membership are added together (or not at all)
+        try:
+            with identity_transaction():
+                user_result = add_user(args.username, password)
+                group_result = add_group(args.username)
+
+                if not user_result.success or not group_result.success:
+                    raise Exception
+
+                # Find the user object and its group to the new group
+                if not add_user_to_group(user_result.data, group_result.data, membership_type="primary").success:
+                    raise Exception
+        except Exception:
+            return output(f"{__COMMAND__}: Failed to add the user '{args.username}'", pipe, success=False)
 
         # Create the users home directory (from /etc/skel)
 
@@ -172,9 +173,9 @@ def main(args: list, pipe: bool) -> Result:
                 else:
                     mkdir(f"/home/{args.username}/{file}", 0o700)
 
-                chown(f"/home/{args.username}/{file}", next_uid, next_uid)
+                chown(f"/home/{args.username}/{file}", user_result.data, group_result.data)
 
-            chown(f"/home/{args.username}", next_uid, next_uid)
+            chown(f"/home/{args.username}", user_result.data, group_result.data)
 
             # Write `export HOME=/home/args.username` and `export PATH=/bin:` to the new ~/.shellrc
             new_shellrc_result = stat(f"/home/{args.username}/.shellrc")
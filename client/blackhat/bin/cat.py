@@ -100,6 +100,10 @@ def main(args: list, pipe: bool) -> Result:
                     output_text += f"{__COMMAND__}: {file}: Is a directory\n"
                 elif try_read.message == ResultMessages.NOT_ALLOWED_READ:
                     output_text += f"{__COMMAND__}: {file}: Permission denied\n"
+                elif try_read.message == ResultMessages.TOO_LARGE:
+                    output_text += f"{__COMMAND__}: {file}: File too large\n"
+                elif try_read.message == ResultMessages.TOO_MANY_LINKS:
+                    output_text += f"{__COMMAND__}: {file}: Too many levels of symbolic links\n"
             else:
                 # Make sure there are no extra \n at the end
                 if try_read.data.endswith("\n"):
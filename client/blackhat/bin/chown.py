@@ -4,12 +4,12 @@
 from ..lib.input import ArgParser
 from ..lib.output import output
 from ..lib.sys.stat import stat
-from ..lib.unistd import get_user, get_group, chown
+from ..lib.unistd import get_user, get_group, chown, chown_tree
 
 __COMMAND__ = "chown"
 __DESCRIPTION__ = ""
 __DESCRIPTION_LONG__ = ""
-__VERSION__ = "1.1"
+__VERSION__ = "1.2"
 
 
 def parse_args(args=None, doc=False):
@@ -28,6 +28,7 @@ def parse_args(args=None, doc=False):
     parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
     parser.add_argument("owner")
     parser.add_argument("file")
+    parser.add_argument("-R", "--recursive", action="store_true", help="operate on files and directories recursively")
     parser.add_argument("--version", action="store_true", help=f"output version information and exit")
 
     args = parser.parse_args(args)
@@ -117,6 +118,11 @@ def main(args: list, pipe: bool) -> Result:
             # Check if the dir we're trying to change is the root dir (we can't change perm)
             if result.data.st_path == "/":
                 return output(f"{__COMMAND__}: Can't change owner of /", pipe, success=False)
+            elif args.recursive:
+                update_response = chown_tree(args.file, owner, group_owner)
+                if not update_response.success:
+                    return output("\n".join(f"{__COMMAND__}: changing ownership of '{path}': Operation not permitted"
+                                             for path in update_response.data or [args.file]), pipe, success=False)
             else:
                 # Syscall
                 update_response = chown(args.file, owner, group_owner)
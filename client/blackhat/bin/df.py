@@ -0,0 +1,117 @@
+__package__ = "blackhat.bin"
+
+from ..helpers import Result, human_readable_size
+from ..lib.input import ArgParser
+from ..lib.output import output
+from ..lib.sys.statfs import statfs
+
+__COMMAND__ = "df"
+__DESCRIPTION__ = "report file system space usage"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.0"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    # -h is --human-readable, so only keep the long form of --help
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}", add_help=False)
+    parser.add_argument("--help", action="help", help="display this help and exit")
+    parser.add_argument("files", nargs="*", default=["/"])
+    parser.add_argument("-h", "--human-readable", action="store_true",
+                        help="print sizes in powers of 1024 (e.g., 1023M)")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat coreutils) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        rows = [["Filesystem", "Size" if args.human_readable else "1K-blocks", "Used", "Avail", "Use%", "Mounted on"]]
+        errors = []
+
+        for path in args.files:
+            statfs_result = statfs(path)
+
+            if not statfs_result.success:
+                errors.append(f"{__COMMAND__}: {path}: No such file or directory")
+                continue
+
+            info = statfs_result.data
+            used_blocks = info.f_blocks - info.f_bfree
+            # Same as coreutils, the percentage is rounded up
+            percent = -(-used_blocks * 100 // (used_blocks + info.f_bavail)) if info.f_blocks else 0
+
+            if args.human_readable:
+                sizes = [human_readable_size(x * info.f_bsize) for x in [info.f_blocks, used_blocks, info.f_bavail]]
+            else:
+                sizes = [str(x * info.f_bsize // 1024) for x in [info.f_blocks, used_blocks, info.f_bavail]]
+
+            # There's only one file system (for now), so it's always mounted at /
+            rows.append(["/dev/sda1", *sizes, f"{percent}%", "/"])
+
+        widths = [max(len(row[x]) for row in rows) for x in range(len(rows[0]))]
+        output_lines = errors + [" ".join(cell.ljust(widths[x]) if x in [0, 5] else cell.rjust(widths[x])
+                                          for x, cell in enumerate(row)).rstrip() for row in rows]
+
+        return output("\n".join(output_lines), pipe, success=not errors)
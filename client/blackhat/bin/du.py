@@ -0,0 +1,187 @@
+__package__ = "blackhat.bin"
+
+import os
+from typing import List
+
+from ..helpers import AccessMode, Result, ResultMessages, human_readable_size
+from ..lib.dirent import readdir
+from ..lib.input import ArgParser
+from ..lib.output import output
+from ..lib.sys.stat import lstat, stat, usage
+from ..lib.unistd import access, get_user
+
+__COMMAND__ = "du"
+__DESCRIPTION__ = "estimate file space usage"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.0"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    # -h is --human-readable, so only keep the long form of --help
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}", add_help=False)
+    parser.add_argument("--help", action="help", help="display this help and exit")
+    parser.add_argument("files", nargs="*", default=["."])
+    parser.add_argument("-a", "--all", action="store_true", help="write counts for all files, not just directories")
+    parser.add_argument("-b", "--bytes", action="store_true", help="print sizes in bytes")
+    parser.add_argument("-h", "--human-readable", action="store_true",
+                        help="print sizes in human readable format (e.g., 1K 234M 2G)")
+    parser.add_argument("-s", "--summarize", action="store_true", help="display only a total for each argument")
+    parser.add_argument("--max-depth", type=int,
+                        help="print the total for a directory (or file, with --all) only if it is N or fewer levels below the command line argument")
+    parser.add_argument("--by-user", action="store_true", help="print how much space each user's files use instead")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def format_size(size: int, args) -> str:
+    """
+    Format a size in bytes based on the given flags (1K blocks by default)
+
+    Args:
+        size (int): The size in bytes
+        args: The parsed arguments
+
+    Returns:
+        str: The formatted size
+    """
+    if args.human_readable:
+        return human_readable_size(size)
+    if args.bytes:
+        return str(size)
+    # Round up to the next block
+    return str(-(-size // 1024))
+
+
+def disk_usage(path: str, depth: int, max_depth: int, args) -> List[str]:
+    """
+    List the size of `path` (and everything inside of it, up to `max_depth`).
+    Directory sizes are cached by the file system, so we only walk as deep as we're going to print
+
+    Args:
+        path (str): The path to list
+        depth (int): How deep `path` is below the command line argument
+        max_depth (int): The deepest level to print (`None` for no limit)
+        args: The parsed arguments
+
+    Returns:
+        list: The output lines (deepest entries first, like coreutils)
+    """
+    # Command line arguments are followed, but links found while walking aren't
+    stat_result = stat(path) if depth == 0 else lstat(path)
+
+    if not stat_result.success:
+        return [f"{__COMMAND__}: cannot access '{path}': No such file or directory"]
+
+    lines = []
+
+    is_directory = not stat_result.data.st_isfile and not stat_result.data.st_islink
+
+    if is_directory and (max_depth is None or depth < max_depth):
+        if not access(path, AccessMode.R_OK).success:
+            lines.append(f"{__COMMAND__}: cannot read directory '{path}': Permission denied")
+        else:
+            readdir_result = readdir(path)
+            for child in sorted(readdir_result.data if readdir_result.success else []):
+                child_path = os.path.join(path, child)
+                child_stat = lstat(child_path)
+                if child_stat.success and (args.all or not child_stat.data.st_isfile and not child_stat.data.st_islink):
+                    lines.extend(disk_usage(child_path, depth + 1, max_depth, args))
+
+    lines.append(f"{format_size(stat_result.data.st_size, args)}\t{path}")
+
+    return lines
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat coreutils) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        output_lines = []
+        success = True
+
+        for path in args.files:
+            if args.by_user:
+                usage_result = usage(path)
+
+                if not usage_result.success:
+                    if usage_result.message == ResultMessages.NOT_FOUND:
+                        output_lines.append(f"{__COMMAND__}: cannot access '{path}': No such file or directory")
+                    else:
+                        output_lines.append(f"{__COMMAND__}: cannot read directory '{path}': Permission denied")
+                    success = False
+                    continue
+
+                # Biggest users first
+                for uid, used in sorted(usage_result.data.items(), key=lambda x: (-x[1], x[0])):
+                    get_user_result = get_user(uid=uid)
+                    username = get_user_result.data.username if get_user_result.success else str(uid)
+                    output_lines.append(f"{format_size(used, args)}\t{username}\t{path}")
+                continue
+
+            max_depth = 0 if args.summarize else args.max_depth
+            lines = disk_usage(path, 0, max_depth, args)
+            success = success and not any(x.startswith(f"{__COMMAND__}: ") for x in lines)
+            output_lines.extend(lines)
+
+        return output("\n".join(output_lines), pipe, success=success)
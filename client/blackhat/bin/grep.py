@@ -0,0 +1,317 @@
+__package__ = "blackhat.bin"
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from typing import Iterator, List, Pattern, Tuple
+
+from ..helpers import AccessMode, Result, ResultMessages
+from ..lib.dirent import readdir
+from ..lib.input import ArgParser
+from ..lib.locate import content_candidates
+from ..lib.output import output
+from ..lib.stdio import read_stdin, read_stdin_args
+from ..lib.sys.stat import lstat, stat
+from ..lib.unistd import access, read
+
+__COMMAND__ = "grep"
+__DESCRIPTION__ = "print lines that match patterns"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.3"
+
+# Only bother with a thread pool when there's enough files to make it worth it
+THREAD_POOL_THRESHOLD = 32
+THREAD_POOL_WORKERS = 8
+# Characters that are special in an ERE but literal in a BRE (unless escaped)
+BRE_LITERALS = "+?|(){}"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
+    parser.add_argument("pattern")
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("-E", "--extended-regexp", action="store_true",
+                        help="interpret PATTERN as an extended regular expression")
+    parser.add_argument("-i", "--ignore-case", action="store_true",
+                        help="ignore case distinctions in patterns and input data")
+    parser.add_argument("-n", "--line-number", action="store_true",
+                        help="prefix each line of output with the 1-based line number within its input file")
+    parser.add_argument("-l", "--files-with-matches", action="store_true",
+                        help="print only names of FILEs with selected lines")
+    parser.add_argument("-c", "--count", action="store_true", help="print only a count of selected lines per FILE")
+    parser.add_argument("-r", "--recursive", action="store_true", help="read all files under each directory, recursively")
+    parser.add_argument("-s", "--no-messages", action="store_true",
+                        help="suppress error messages about nonexistent or unreadable files")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def compile_pattern(pattern: str, extended: bool, ignore_case: bool) -> Pattern:
+    """
+    Compile the given `pattern` once so every line can reuse it
+
+    Args:
+        pattern (str): The (basic or extended) regular expression
+        extended (bool): If the pattern is an ERE (-E). Otherwise `+?|(){}` are literal unless they're escaped
+        ignore_case (bool): Match without case sensitivity
+
+    Returns:
+        Pattern: The compiled pattern
+    """
+    if not extended:
+        translated = ""
+        escaped = False
+
+        for char in pattern:
+            if escaped:
+                # In a BRE, \+ \? \| \( \) \{ \} are the special versions
+                translated += char if char in BRE_LITERALS else "\\" + char
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char in BRE_LITERALS:
+                translated += "\\" + char
+            else:
+                translated += char
+
+        if escaped:
+            translated += "\\\\"
+
+        pattern = translated
+
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+
+def match_lines(pattern: Pattern, content: str) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily go through `content` line by line and yield every line matching `pattern`
+
+    Args:
+        pattern (Pattern): The compiled pattern
+        content (str): The text to search
+
+    Returns:
+        Iterator: (line number, line) for every matching line
+    """
+    for line_number, line in enumerate(StringIO(content), start=1):
+        line = line.rstrip("\n")
+        if pattern.search(line):
+            yield line_number, line
+
+
+def collect_files(paths: List[str], recursive: bool) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Expand the given paths into the list of files to search
+
+    Args:
+        paths (list): The paths given on the command line
+        recursive (bool): If directories should be searched recursively
+
+    Returns:
+        tuple: The files to search (as given, full path) and the error messages for paths that can't be searched
+    """
+    files = []
+    errors = []
+    stack = list(reversed(paths))
+
+    # Only the paths given on the command line are followed if they're links (like `grep -r`, not `grep -R`)
+    command_line = set(paths)
+
+    while stack:
+        path = stack.pop()
+        stat_result = stat(path) if path in command_line else lstat(path)
+
+        if not stat_result.success:
+            errors.append(f"{__COMMAND__}: {path}: No such file or directory")
+            continue
+
+        if stat_result.data.st_isfile:
+            files.append((path, stat_result.data.st_path))
+            continue
+
+        if stat_result.data.st_islink:
+            continue
+
+        if not recursive:
+            errors.append(f"{__COMMAND__}: {path}: Is a directory")
+            continue
+
+        if not access(path, AccessMode.R_OK | AccessMode.X_OK).success:
+            errors.append(f"{__COMMAND__}: {path}: Permission denied")
+            continue
+
+        readdir_result = readdir(path)
+        if readdir_result.success:
+            stack.extend(os.path.join(path, x) for x in sorted(readdir_result.data, reverse=True))
+
+    return files, errors
+
+
+def prune_files(pattern: Pattern, files: List[Tuple[str, str]]) -> List[str]:
+    """
+    Drop the files that the content index says can't match (if there is a usable index)
+
+    Args:
+        pattern (Pattern): The compiled pattern
+        files (list): (path, full path) of every file to search
+
+    Returns:
+        list: The paths that still need to be searched
+    """
+    candidates = content_candidates(pattern.pattern).data
+
+    if candidates is None:
+        return [path for path, _ in files]
+
+    # The index only answers for files we can read, the rest still need their "Permission denied"
+    return [path for path, full_path in files if full_path in candidates or not access(path, AccessMode.R_OK).success]
+
+
+def search_file(pattern: Pattern, path: str, args) -> Tuple[str, List[Tuple[int, str]], bool]:
+    """
+    Search a single file. Unreadable files are skipped before their content is touched
+
+    Args:
+        pattern (Pattern): The compiled pattern
+        path (str): The path of the file to search
+        args: The parsed arguments
+
+    Returns:
+        tuple: The path, the matching lines and if the file could be read
+    """
+    if not access(path, AccessMode.R_OK).success:
+        return path, [], False
+
+    read_result = read(path)
+
+    if not read_result.success:
+        return path, [], False
+
+    matches = match_lines(pattern, read_result.data)
+
+    # -l only needs to know if there's a single match
+    if args.files_with_matches:
+        first_match = next(matches, None)
+        return path, [first_match] if first_match else [], True
+
+    return path, list(matches), True
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+    # Text piped into grep also shows up (split up) at the end of our args, we read the real lines from stdin instead
+    stdin_result = read_stdin()
+    if stdin_result.success:
+        args = args[:len(args) - read_stdin_args()]
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat grep) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        try:
+            pattern = compile_pattern(args.pattern, args.extended_regexp, args.ignore_case)
+        except re.error:
+            return output(f"{__COMMAND__}: Invalid regular expression", pipe, success=False,
+                          success_message=ResultMessages.INVALID_ARGUMENT)
+
+        output_lines = []
+
+        if not args.files and stdin_result.success:
+            results = [("(standard input)", list(match_lines(pattern, stdin_result.data)), True)]
+            show_names = False
+        else:
+            files, errors = collect_files(args.files or ["."], args.recursive)
+            files = prune_files(pattern, files)
+            show_names = args.recursive or len(args.files) > 1
+
+            if len(files) >= THREAD_POOL_THRESHOLD:
+                # At most `THREAD_POOL_WORKERS` files at once (reading mounted host files waits on the disk, not the
+                # GIL). `map` keeps the results in the same order as `files`, so the output doesn't depend on scheduling
+                with ThreadPoolExecutor(max_workers=THREAD_POOL_WORKERS) as pool:
+                    results = list(pool.map(lambda x: search_file(pattern, x, args), files))
+            else:
+                results = [search_file(pattern, x, args) for x in files]
+
+            if not args.no_messages:
+                output_lines.extend(errors)
+
+        found = False
+
+        for path, matches, readable in results:
+            if not readable:
+                if not args.no_messages:
+                    output_lines.append(f"{__COMMAND__}: {path}: Permission denied")
+                continue
+
+            found = found or bool(matches)
+            prefix = f"{path}:" if show_names else ""
+
+            if args.files_with_matches:
+                if matches:
+                    output_lines.append(path)
+            elif args.count:
+                output_lines.append(f"{prefix}{len(matches)}")
+            else:
+                for line_number, line in matches:
+                    output_lines.append(f"{prefix}{line_number}:{line}" if args.line_number else f"{prefix}{line}")
+
+        return output("\n".join(output_lines), pipe, success=found)
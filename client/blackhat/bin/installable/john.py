@@ -6,13 +6,16 @@
 from ...lib.input import ArgParser
 from ...lib.output import output
 from ...lib.sys.stat import stat
-from ...lib.unistd import read, write
+from ...lib.unistd import read, write, pread
 from ...lib.fcntl import creat
 
 __COMMAND__ = "john"
 __DESCRIPTION__ = ""
 __DESCRIPTION_LONG__ = ""
-__VERSION__ = "1.0"
+__VERSION__ = "1.1"
+
+WORDLIST_CHUNK_SIZE = 1 << 20
+"""int: How many bytes of the wordlist are read at a time (the wordlist is streamed, never read all at once)"""
 
 
 def parse_args(args=None, doc=False):
@@ -73,6 +76,36 @@ def parse_args(args=None, doc=False):
     return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
 
 
+def read_wordlist(path: str):
+    """
+    Stream the lines of the wordlist using ranged reads, so (huge) mounted wordlists are never loaded into memory
+
+    Args:
+        path (str): The path of the wordlist
+
+    Returns:
+        Generator: Every line (as bytes, without the line ending)
+    """
+    offset = 0
+    remainder = b""
+
+    while True:
+        chunk = pread(path, WORDLIST_CHUNK_SIZE, offset).data
+
+        if not chunk:
+            break
+
+        offset += len(chunk)
+        lines = (remainder + chunk).split(b"\n")
+        # The last line might continue in the next chunk
+        remainder = lines.pop()
+
+        for line in lines:
+            yield line.rstrip(b"\r")
+
+    yield remainder.rstrip(b"\r")
+
+
 def main(args: list, pipe: bool) -> Result:
     # TODO: Add ability for john to crack more than just user passwords
     args, parser = parse_args(args)
@@ -98,7 +131,8 @@ def main(args: list, pipe: bool) -> Result:
             return output(f"{__COMMAND__}: {args.wordlist}: No such file or directory", pipe, success=False)
 
         try_read_password_file = read(args.password)
-        try_read_wordlist_file = read(args.wordlist)
+        # Only check that we can read the wordlist, it's streamed later on
+        try_read_wordlist_file = pread(args.wordlist, 0, 0)
 
         if not try_read_password_file.success:
             return output(f"{__COMMAND__}: {args.password}: Permission denied", pipe, success=False)
@@ -107,7 +141,6 @@ def main(args: list, pipe: bool) -> Result:
             return output(f"{__COMMAND__}: {args.wordlist}: Permission denied", pipe, success=False)
 
         password_content = try_read_password_file.data
-        wordlist_content = try_read_wordlist_file.data.split("\n")
 
         user_password_split = [x.split(":") for x in password_content.split("\n") if x != ""]
 
@@ -135,9 +168,10 @@ def main(args: list, pipe: bool) -> Result:
         output_text = ""
 
         # Loop through all items in the password list and check if the hash matches any of our users
-        for password in wordlist_content:
-            hashed_password = md5(password.encode()).hexdigest()
+        for password_bytes in read_wordlist(args.wordlist):
+            hashed_password = md5(password_bytes).hexdigest()
             if hashed_password in to_crack.keys():
+                password = password_bytes.decode(errors="replace")
                 for item in to_crack[hashed_password]:
                     response = f"{password}\t({item})"
                     output_text += response + "\n"
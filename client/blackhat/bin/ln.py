@@ -0,0 +1,107 @@
+__package__ = "blackhat.bin"
+
+from ..helpers import Result, ResultMessages
+from ..lib.input import ArgParser
+from ..lib.output import output
+from ..lib.unistd import symlink
+
+__COMMAND__ = "ln"
+__DESCRIPTION__ = "make links between files"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.0"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
+    parser.add_argument("target")
+    parser.add_argument("link_name", nargs="?")
+    parser.add_argument("-s", "--symbolic", action="store_true", help="make symbolic links instead of hard links")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat coreutils) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        if not args.symbolic:
+            return output(f"{__COMMAND__}: hard links are not supported (use -s)", pipe, success=False)
+
+        # Without a link name, the link is made in the current directory with the same name as the target
+        link_name = args.link_name or args.target.rstrip("/").split("/")[-1]
+
+        symlink_result = symlink(args.target, link_name)
+
+        if not symlink_result.success:
+            if symlink_result.message == ResultMessages.ALREADY_EXISTS:
+                return output(f"{__COMMAND__}: failed to create symbolic link '{link_name}': File exists", pipe,
+                              success=False)
+            elif symlink_result.message == ResultMessages.NOT_ALLOWED:
+                return output(f"{__COMMAND__}: failed to create symbolic link '{link_name}': Permission denied", pipe,
+                              success=False)
+            else:
+                return output(f"{__COMMAND__}: failed to create symbolic link '{link_name}': No such file or directory",
+                              pipe, success=False)
+
+        return output("", pipe)
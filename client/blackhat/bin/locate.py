@@ -0,0 +1,113 @@
+__package__ = "blackhat.bin"
+
+from ..helpers import Result, ResultMessages
+from ..lib.input import ArgParser
+from ..lib.locate import locate
+from ..lib.output import output
+
+__COMMAND__ = "locate"
+__DESCRIPTION__ = "find files by name"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.0"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
+    parser.add_argument("patterns", nargs="+")
+    parser.add_argument("-i", "--ignore-case", action="store_true", help="ignore case distinctions when matching patterns")
+    parser.add_argument("-b", "--basename", action="store_true",
+                        help="match only the base name against the specified patterns")
+    parser.add_argument("-c", "--count", action="store_true",
+                        help="instead of writing file names on standard output, write the number of matching entries only")
+    parser.add_argument("-e", "--existing", action="store_true",
+                        help="print only entries that refer to files existing at the time locate is run")
+    parser.add_argument("-l", "--limit", type=int, help="exit successfully after finding LIMIT entries")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat findutils) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        matches = []
+
+        for pattern in args.patterns:
+            remaining = None if args.limit is None else args.limit - len(matches)
+            if remaining is not None and remaining <= 0:
+                break
+
+            locate_result = locate(pattern, args.ignore_case, args.basename, remaining, args.existing)
+
+            if not locate_result.success:
+                return output(f"{__COMMAND__}: database not found (run updatedb as root first)", pipe, success=False,
+                              success_message=ResultMessages.NOT_FOUND)
+
+            # A path matching several patterns is only printed once
+            matches.extend(x for x in locate_result.data if x not in matches)
+
+        if args.count:
+            return output(str(len(matches)), pipe, success=bool(matches))
+
+        return output("\n".join(matches), pipe, success=bool(matches))
@@ -4,18 +4,18 @@
 
 from colorama import Fore, Style
 
-from ..helpers import Result
+from ..helpers import Result, ResultMessages
 from ..helpers import stat_struct
 from ..lib.dirent import readdir
 from ..lib.input import ArgParser
 from ..lib.output import output
-from ..lib.sys.stat import stat
+from ..lib.sys.stat import lstat, stat
 from ..lib.unistd import get_user, get_group
 
 __COMMAND__ = "ls"
 __DESCRIPTION__ = ""
 __DESCRIPTION_LONG__ = ""
-__VERSION__ = "2.0"
+__VERSION__ = "2.1"
 
 
 def parse_args(args=None, doc=False):
@@ -100,8 +100,12 @@ def calculate_permission_string(perm_octal: int) -> str:
 def calculate_output(filename, file_struct: stat_struct, long=False, nocolor=False):
     output_text = ""
 
-    base_filename = filename.split("/")[-1]
-    color = Fore.WHITE if file_struct.st_isfile or nocolor else Fore.LIGHTBLUE_EX
+    if nocolor or file_struct.st_isfile:
+        color = Fore.WHITE
+    elif file_struct.st_islink:
+        color = Fore.LIGHTCYAN_EX
+    else:
+        color = Fore.LIGHTBLUE_EX
 
     if long:
         username_lookup = get_user(uid=file_struct.st_uid)
@@ -112,13 +116,39 @@ def calculate_output(filename, file_struct: stat_struct, long=False, nocolor=Fal
 
         file_size_in_kb = round(file_struct.st_size / 1024, 1)
 
-        output_text += f'{calculate_permission_string(file_struct.st_mode)} {username} {group_name} {file_size_in_kb}kB {color}{base_filename}{Style.RESET_ALL}\n'
+        output_text += f'{calculate_permission_string(file_struct.st_mode)} {username} {group_name} ' \
+                       f'{file_size_in_kb}kB {color}{filename}{Style.RESET_ALL}\n'
     else:
-        output_text += f"{color}{base_filename}{Style.RESET_ALL} "
+        output_text += f"{color}{filename}{Style.RESET_ALL} "
 
     return output_text
 
 
+def lookup(path: str, report_loops: bool = True) -> Result:
+    """
+    Stat a path, following symlinks. A dangling link can't be followed, so it's listed as the link itself
+
+    Args:
+        path (str): The path to look up
+        report_loops (bool): If a symlink loop should fail the lookup (otherwise the link itself is listed)
+
+    Returns:
+        Result: The `Result` of the stat (`TOO_MANY_LINKS` if the path ends in a symlink loop)
+    """
+    stat_result = stat(path)
+
+    if stat_result.success or (report_loops and stat_result.message == ResultMessages.TOO_MANY_LINKS):
+        return stat_result
+
+    return lstat(path)
+
+
+def error_text(path: str, result: Result) -> str:
+    if result.message == ResultMessages.TOO_MANY_LINKS:
+        return f"{__COMMAND__}: cannot access '{path}': Too many levels of symbolic links\n"
+    return f"{__COMMAND__}: Cannot stat file: {path}\n"
+
+
 def main(args: list, pipe: bool) -> Result:
     args, parser = parse_args(args)
 
@@ -143,22 +173,28 @@ def main(args: list, pipe: bool) -> Result:
             to_list = ["."]
 
         for file in to_list:
-            stat_result = stat(file)
+            stat_result = lookup(file)
 
             if not stat_result.success:
-                output_text += f"{__COMMAND__}: Cannot stat file: {file}\n"
+                output_text += error_text(file, stat_result)
                 continue
 
-            if stat_result.data.st_isfile:
+            # Operands are printed as they were typed, not by the path they resolve to
+            if stat_result.data.st_isfile or stat_result.data.st_islink:
                 output_text += calculate_output(file, stat_result.data, args.long, args.nocolor)
             else:
                 read_result = readdir(file)
 
+                if not read_result.success:
+                    output_text += f"{__COMMAND__}: cannot open directory '{file}': Permission denied\n"
+                    continue
+
                 for subfile in read_result.data:
                     if args.all or not subfile.startswith("."):
-                        stat_result = stat(os.path.join(file, subfile))
+                        # Entries of a directory are listed even if they're part of a loop
+                        stat_result = lookup(os.path.join(file, subfile), report_loops=False)
                         if not stat_result.success:
-                            output_text += f"{__COMMAND__}: Cannot stat file: {file}\n"
+                            output_text += error_text(os.path.join(file, subfile), stat_result)
                         else:
                             output_text += calculate_output(subfile, stat_result.data, args.long, args.nocolor)
 
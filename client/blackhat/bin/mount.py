@@ -0,0 +1,123 @@
+__package__ = "blackhat.bin"
+
+from ..fs import MOUNT_ROOTS_VARIABLE
+from ..helpers import Result, ResultMessages
+from ..lib.input import ArgParser
+from ..lib.output import output
+from ..lib.sys.mount import mount_host, getmounts
+
+__COMMAND__ = "mount"
+__DESCRIPTION__ = "mount a filesystem"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.0"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
+    parser.add_argument("source", nargs="?", help="The directory on the host machine")
+    parser.add_argument("target", nargs="?", help="The (empty) directory to mount it on")
+    parser.add_argument("--bind-host", action="store_true",
+                        help="mount a directory of the host machine read-only (its files are read when needed, not copied)")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat coreutils) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat coreutils) {__VERSION__}", pipe)
+
+        # No arguments: list the mounts
+        if not args.source and not args.target:
+            mounts = getmounts().data
+            output_text = "/dev/sda1 on / type ext4 (rw)\n"
+            for target, source in sorted(mounts.items()):
+                output_text += f"{source} on {target} type hostfs (ro,bind)\n"
+            return output(output_text, pipe)
+
+        if not args.bind_host:
+            return output(f"{__COMMAND__}: only --bind-host mounts are supported", pipe, success=False)
+
+        if not args.target:
+            return output(f"{__COMMAND__}: missing mount point", pipe, success=False)
+
+        mount_result = mount_host(args.source, args.target)
+
+        if not mount_result.success:
+            if mount_result.message == ResultMessages.NOT_ALLOWED:
+                return output(f"{__COMMAND__}: only root can do that", pipe, success=False)
+            elif mount_result.message == ResultMessages.NOT_ALLOWED_READ:
+                return output(f"{__COMMAND__}: {args.source}: not allowed by {MOUNT_ROOTS_VARIABLE}", pipe,
+                              success=False)
+            elif mount_result.message == ResultMessages.NOT_EMPTY:
+                return output(f"{__COMMAND__}: {args.target}: mount point is not empty", pipe, success=False)
+            elif mount_result.message == ResultMessages.IS_FILE:
+                return output(f"{__COMMAND__}: {args.target}: mount point is not a directory", pipe, success=False)
+            else:
+                return output(f"{__COMMAND__}: {args.source} on {args.target}: No such file or directory", pipe,
+                              success=False)
+
+        return output("", pipe)
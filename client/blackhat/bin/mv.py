@@ -109,4 +109,12 @@ def main(args: list, pipe: bool) -> Result:
                 return output(f"{__COMMAND__}: cannot write '{args.destination}: Directory already exists", pipe,
                               success=False)
 
+            elif result.message == ResultMessages.INVALID_ARGUMENT:
+                return output(f"{__COMMAND__}: cannot move '{args.source}' to a subdirectory of itself", pipe,
+                              success=False)
+
+            elif result.message == ResultMessages.IS_FILE:
+                return output(f"{__COMMAND__}: cannot overwrite non-directory '{args.destination}' with directory "
+                              f"'{args.source}'", pipe, success=False)
+
         return output("", pipe)
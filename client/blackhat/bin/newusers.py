@@ -0,0 +1,230 @@
+__package__ = "blackhat.bin"
+
+import os
+from typing import List, Tuple
+
+from ..helpers import Result, ResultMessages
+from ..lib.dirent import readdir
+from ..lib.fcntl import creat
+from ..lib.input import ArgParser
+from ..lib.output import output
+from ..lib.sys.stat import stat, mkdir
+from ..lib.unistd import get_user, get_group, write, add_user, add_group, add_user_to_group, chown, geteuid, read, \
+    identity_transaction
+
+__COMMAND__ = "newusers"
+__DESCRIPTION__ = "update and create new users in batch"
+__DESCRIPTION_LONG__ = "Read a file of new users (one per line, in the format " \
+                       "**name:password[:uid[:gid[:gecos[:dir[:shell]]]]]*/) and create them, their primary groups " \
+                       "and their home directories.\n\tThe password is in plain text. Without a UID, the next free " \
+                       "one is used. The GID can be the number or name of an existing group, or of a new group to " \
+                       "create (without one, a group named after the user is created). The gecos and shell fields " \
+                       "are ignored.\n\tEither every user is added or none are."
+__VERSION__ = "1.0"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
+    parser.add_argument("file",
+                        help="File with one new user per line (name:password[:uid[:gid[:gecos[:dir[:shell]]]]])")
+    parser.add_argument("--version", action="store_true", help=f"print program version")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION_LONG__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            elif item.nargs == "+":
+                SYNOPSIS += f"[{item.dest.upper()}]... "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def parse_line(line: str) -> Tuple[str, str, str, str, str]:
+    """
+    Split a line of the users file into the fields we use
+
+    Args:
+        line (str): name:password[:uid[:gid[:gecos[:dir[:shell]]]]]
+
+    Returns:
+        tuple: The name, password, uid, gid and home directory (missing fields are empty strings)
+    """
+    fields = line.split(":")
+
+    if len(fields) < 2 or len(fields) > 7 or not fields[0] or " " in fields[0]:
+        raise ValueError
+
+    fields += [""] * (7 - len(fields))
+
+    if fields[2] and not fields[2].isdigit():
+        raise ValueError
+
+    return fields[0], fields[1], fields[2], fields[3], fields[5]
+
+
+def create_user(name: str, password: str, uid_field: str, gid_field: str) -> Tuple[int, int]:
+    """
+    Add a user, its primary group (if it doesn't exist yet) and its membership. Must be run in a transaction
+
+    Args:
+        name (str): The username
+        password (str): The plain text password
+        uid_field (str): The UID ("" for the next free one)
+        gid_field (str): The GID or group name ("" for a group named after the user)
+
+    Returns:
+        tuple: The UID and GID of the new user
+    """
+    uid = int(uid_field) if uid_field else None
+
+    # `add_user()` would give a taken UID of 0 a new one, so this is checked here
+    if uid is not None and get_user(uid=uid).success:
+        raise ValueError
+
+    user_result = add_user(name, password, uid)
+    if not user_result.success:
+        raise ValueError
+    uid = user_result.data
+
+    if gid_field.isdigit():
+        group_result = get_group(gid=int(gid_field))
+        if group_result.success:
+            gid = group_result.data.gid
+        else:
+            gid = add_group(name, int(gid_field)).data
+    else:
+        group_name = gid_field or name
+        group_result = get_group(name=group_name)
+        if group_result.success:
+            gid = group_result.data.gid
+        else:
+            # Like `useradd`, the user's own group gets the same number as the user if it's free
+            gid = add_group(group_name, None if get_group(gid=uid).success else uid).data
+
+    if gid is None or not add_user_to_group(uid, gid, membership_type="primary").success:
+        raise ValueError
+
+    return uid, gid
+
+
+def main(args: list, pipe: bool) -> Result:
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat coreutils) {__VERSION__}", pipe)
+
+        if geteuid() != 0:
+            return output(f"{__COMMAND__}: Only root can add new users!", pipe, success=False,
+                          success_message=ResultMessages.NOT_ALLOWED)
+
+        read_result = read(args.file)
+
+        if not read_result.success:
+            return output(f"{__COMMAND__}: cannot open {args.file}", pipe, success=False,
+                          success_message=read_result.message)
+
+        # (name, uid, gid, home directory) of every new user
+        new_users: List[Tuple[str, int, int, str]] = []
+        line_number = 0
+
+        # Every user is added (with one commit and one sync of /etc/passwd, etc.), or none are
+        try:
+            with identity_transaction():
+                for line_number, line in enumerate(read_result.data.split("\n"), start=1):
+                    if not line.strip():
+                        continue
+
+                    name, password, uid_field, gid_field, home = parse_line(line)
+                    uid, gid = create_user(name, password, uid_field, gid_field)
+                    new_users.append((name, uid, gid, home or f"/home/{name}"))
+        except Exception:
+            return output(f"{__COMMAND__}: line {line_number}: can't add user", pipe, success=False)
+
+        # Create the home directories (from /etc/skel)
+        skel_read = readdir("/etc/skel")
+        skel_files = []
+
+        if skel_read.success:
+            for file in skel_read.data:
+                skel_files.append((file, stat(os.path.join("/etc/skel", file)).data.st_isfile))
+
+        default_shellrc_read = read("/etc/skel/.shellrc")
+        default_shellrc_data = default_shellrc_read.data if default_shellrc_read.success else ""
+
+        output_text = ""
+
+        for name, uid, gid, home in new_users:
+            # Existing directories are left alone
+            if stat(home).success:
+                continue
+
+            if not mkdir(home, 0o700).success:
+                output_text += f"{__COMMAND__}: cannot create directory {home}\n"
+                continue
+
+            for file, is_file in skel_files:
+                if is_file:
+                    creat(f"{home}/{file}", 0o700)
+                else:
+                    mkdir(f"{home}/{file}", 0o700)
+
+                chown(f"{home}/{file}", uid, gid)
+
+            chown(home, uid, gid)
+
+            if stat(f"{home}/.shellrc").success:
+                write(f"{home}/.shellrc", f"{default_shellrc_data}\n"
+                                          f"export HOME={home}\n"
+                                          f"export PATH=/bin:/usr/bin\n"
+                                          f"export USER={name}\n")
+
+        return output(output_text, pipe, success=not output_text)
@@ -4,7 +4,7 @@
 from ..lib.input import ArgParser
 from ..lib.output import output
 from ..lib.unistd import getcwd, unlink
-from ..lib.sys.stat import stat
+from ..lib.sys.stat import lstat
 from ..lib.dirent import readdir
 
 __COMMAND__ = "rm"
@@ -110,12 +110,13 @@ def main(args: list, pipe: bool) -> Result:
             to_delete.append(args.source)
 
         for file in to_delete:
-            result = stat(file)
+            # Removing a link removes the link itself, not what it points to
+            result = lstat(file)
 
             if not result.success:
                 return output(f"{__COMMAND__}: cannot find '{file}': No such file or directory", pipe, success=False)
             else:
-                if not result.data.st_isfile and not args.recursive:
+                if not result.data.st_isfile and not result.data.st_islink and not args.recursive:
                     return output(f"{__COMMAND__}: cannot remove '{file}': Is a directory", pipe, success=False)
                 else:
                     response = unlink(result.data.st_path)
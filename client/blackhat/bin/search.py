@@ -0,0 +1,174 @@
+__package__ = "blackhat.bin"
+
+import os
+import re
+from io import StringIO
+from typing import List, Optional, Set
+
+from ..helpers import AccessMode, Result
+from ..lib.dirent import readdir
+from ..lib.input import ArgParser
+from ..lib.locate import content_candidates
+from ..lib.output import output
+from ..lib.sys.stat import lstat
+from ..lib.unistd import access, read
+
+__COMMAND__ = "search"
+__DESCRIPTION__ = "search the content of every file for some text"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.0"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
+    parser.add_argument("text", help="The text to look for")
+    parser.add_argument("paths", nargs="*", default=["/"], help="Where to look (default /)")
+    parser.add_argument("-i", "--ignore-case", action="store_true", help="ignore case distinctions")
+    parser.add_argument("-l", "--files-with-matches", action="store_true", help="only print the names of matching files")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def walk_files(roots: List[str]) -> List[str]:
+    """
+    Find every file under the given paths (without following links). Directories we can't read are skipped
+
+    Args:
+        roots (list): The paths to look in
+
+    Returns:
+        list: The full path of every file found
+    """
+    files = []
+    stack = list(reversed(roots))
+
+    while stack:
+        path = stack.pop()
+        stat_result = lstat(path)
+
+        if not stat_result.success or stat_result.data.st_islink:
+            continue
+
+        if stat_result.data.st_isfile:
+            files.append(stat_result.data.st_path)
+            continue
+
+        if not access(path, AccessMode.R_OK | AccessMode.X_OK).success:
+            continue
+
+        readdir_result = readdir(path)
+        if readdir_result.success:
+            stack.extend(os.path.join(path, x) for x in sorted(readdir_result.data, reverse=True))
+
+    return files
+
+
+def indexed_files(roots: List[str], candidates: Set[str]) -> List[str]:
+    """
+    Narrow the content index's candidates down to the ones under the given paths (nothing else is read or walked)
+
+    Args:
+        roots (list): The paths to look in
+        candidates (set): The full paths of the candidate files
+
+    Returns:
+        list: The candidates under any of the `roots`, sorted
+    """
+    prefixes = []
+
+    for root in roots:
+        stat_result = lstat(root)
+        if stat_result.success:
+            path = stat_result.data.st_path
+            prefixes.append(path if stat_result.data.st_isfile else path.rstrip("/") + "/")
+
+    return sorted(x for x in candidates if any(x == prefix or x.startswith(prefix) for prefix in prefixes))
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat findutils) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        pattern = re.compile(re.escape(args.text), re.IGNORECASE if args.ignore_case else 0)
+
+        # With a content index (`updatedb --content`), only the files that can contain the text are read
+        candidates: Optional[Set[str]] = content_candidates(pattern.pattern).data
+        files = walk_files(args.paths) if candidates is None else indexed_files(args.paths, candidates)
+
+        output_lines = []
+
+        for path in files:
+            read_result = read(path)
+            if not read_result.success:
+                continue
+
+            for line_number, line in enumerate(StringIO(read_result.data), start=1):
+                line = line.rstrip("\n")
+                if pattern.search(line):
+                    if args.files_with_matches:
+                        output_lines.append(path)
+                        break
+                    output_lines.append(f"{path}:{line_number}:{line}")
+
+        return output("\n".join(output_lines), pipe, success=bool(output_lines))
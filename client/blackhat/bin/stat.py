@@ -3,7 +3,8 @@
 from ..helpers import Result
 from ..lib.input import ArgParser
 from ..lib.output import output
-from ..lib.sys.stat import stat
+from ..lib.sys.stat import lstat
+from ..lib.unistd import readlink
 from ..lib.unistd import get_user, get_group
 
 __COMMAND__ = "stat"
@@ -82,7 +83,8 @@ def main(args: list, pipe: bool) -> Result:
         if args.version:
             return output(f"{__COMMAND__} (blackhat coreutils) {__VERSION__}", pipe)
 
-        stat_file = stat(args.file)
+        # Like coreutils, we don't follow links
+        stat_file = lstat(args.file)
 
         if not stat_file.success:
             return output(f"{__COMMAND__}: cannot stat '{args.file}': No such file or directory", pipe, success=False)
@@ -96,8 +98,14 @@ def main(args: list, pipe: bool) -> Result:
 
         output_text = ""
 
-        output_text += f"File: {args.file}\n"
-        output_text += f"Size: {stat_struct.st_size}\t{'regular file' if stat_struct.st_isfile else 'directory'}\n"
+        if stat_struct.st_islink:
+            output_text += f"File: {args.file} -> {readlink(args.file).data}\n"
+            file_type = "symbolic link"
+        else:
+            output_text += f"File: {args.file}\n"
+            file_type = "regular file" if stat_struct.st_isfile else "directory"
+
+        output_text += f"Size: {stat_struct.st_size}\t{file_type}\n"
         # TODO: Links
         output_text += f"Links: 0\n"
         output_text += f"Access: ({stat_struct.st_mode})\tUid: ({stat_struct.st_uid}/{username})\tGid: ({stat_struct.st_gid}/{group})\n"
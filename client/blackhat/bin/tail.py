@@ -3,12 +3,14 @@
 from ..helpers import Result, ResultMessages
 from ..lib.input import ArgParser
 from ..lib.output import output
-from ..lib.unistd import read
+from ..lib.sys.inotify import inotify_init, inotify_add_watch, inotify_read, inotify_rm_watch, IN_MODIFY, \
+    IN_DELETE_SELF, IN_MOVE_SELF, IN_Q_OVERFLOW
+from ..lib.unistd import read, close
 
 __COMMAND__ = "tail"
-__DESCRIPTION__ = ""
+__DESCRIPTION__ = "output the last part of files"
 __DESCRIPTION_LONG__ = ""
-__VERSION__ = "1.2"
+__VERSION__ = "1.3"
 
 
 def parse_args(args=None, doc=False):
@@ -28,6 +30,11 @@ def parse_args(args=None, doc=False):
     parser.add_argument("files", nargs="+")
     parser.add_argument("-w", "--wrap", type=int,
                         help="wrap encoded lines after COLS character (default 76).  Use 0 to disable line wrapping")
+    parser.add_argument("-n", "--lines", type=int, default=10, help="output the last NUM lines, instead of the last 10")
+    parser.add_argument("-f", "--follow", action="store_true",
+                        help="output appended data as the file grows (until interrupted or every file is gone)")
+    parser.add_argument("-s", "--sleep-interval", type=float, default=1.0,
+                        help="with -f, wait at most N seconds (default 1.0) for a change before checking again")
     parser.add_argument("--version", action="store_true", help=f"output version information and exit")
 
     args = parser.parse_args(args)
@@ -67,6 +74,80 @@ def parse_args(args=None, doc=False):
     return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
 
 
+def follow(files: dict, pipe: bool, interval: float) -> str:
+    """
+    Wait for the given files to change and output whatever gets appended to them (`tail -f`).
+    Uses inotify watches instead of polling, so nothing is read until a file actually changes.
+
+    Args:
+        files (dict): File path -> how many characters of it were already output
+        pipe (bool): If we're piping the output (collect it instead of printing it)
+        interval (float): How long to wait for an event before checking again
+
+    Returns:
+        str: The collected output if `pipe` is set, otherwise an empty string (everything was printed as it came)
+    """
+    collected = ""
+    # Our own messages always go on their own line, even if a file didn't end with a newline
+    line_start = True
+
+    def emit(text: str, message: bool = False) -> None:
+        nonlocal collected, line_start
+        if message and not line_start:
+            text = "\n" + text
+        if not text:
+            return
+        line_start = text.endswith("\n")
+        if pipe:
+            collected += text
+        else:
+            print(text, end="", flush=True)
+
+    fd = inotify_init().data
+    # Watch descriptor -> [file path, amount of characters already output]
+    watches = {}
+
+    for file, offset in files.items():
+        add_watch = inotify_add_watch(fd, file, IN_MODIFY | IN_DELETE_SELF | IN_MOVE_SELF)
+        if add_watch.success:
+            watches[add_watch.data] = [file, offset]
+
+    try:
+        while watches:
+            for event in inotify_read(fd, interval).data:
+                if event.wd not in watches:
+                    continue
+
+                file, offset = watches[event.wd]
+
+                if event.mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    emit(f"{__COMMAND__}: '{file}' has become inaccessible: No such file or directory\n", message=True)
+                    inotify_rm_watch(fd, event.wd)
+                    del watches[event.wd]
+                    if not watches:
+                        emit(f"{__COMMAND__}: no files remaining\n", message=True)
+                    continue
+
+                # After an overflow we don't know what changed, but re-reading the file catches us up anyways
+                if event.mask & (IN_MODIFY | IN_Q_OVERFLOW):
+                    try_read = read(file)
+                    if not try_read.success:
+                        continue
+
+                    if len(try_read.data) < offset:
+                        emit(f"{__COMMAND__}: {file}: file truncated\n", message=True)
+                        offset = 0
+
+                    emit(try_read.data[offset:])
+                    watches[event.wd][1] = len(try_read.data)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close(fd)
+
+    return collected
+
+
 def main(args: list, pipe: bool) -> Result:
     """
     # TODO: Add docstring for manpage
@@ -86,6 +167,8 @@ def main(args: list, pipe: bool) -> Result:
         return output("", pipe)
     else:
         output_text = ""
+        # File path -> how much of it we've output (for --follow)
+        followed = {}
 
         for file in args.files:
             try_read = read(file)
@@ -98,12 +181,26 @@ def main(args: list, pipe: bool) -> Result:
                 elif try_read.message == ResultMessages.NOT_ALLOWED_READ:
                     output_text += f"{__COMMAND__}: {file}: Permission denied\n"
             else:
+                followed[file] = len(try_read.data)
+
                 # Make sure they're are no extra \n at the end
-                data = try_read.data.split("\n")
-                data = "\n".join(data[-10:])
+                data = try_read.data
+                if data.endswith("\n"):
+                    data = data[:-1]
 
-                if try_read.data.endswith("\n"):
-                    try_read.data = try_read.data[:-1]
+                data = "\n".join(data.split("\n")[-args.lines:]) if args.lines > 0 else ""
 
                 output_text += data
+
+        if args.follow and followed:
+            if output_text and not output_text.endswith("\n"):
+                output_text += "\n"
+
+            if not pipe:
+                # Show what we have so far before waiting for changes
+                output(output_text, pipe)
+                output_text = ""
+
+            output_text = (output_text + follow(followed, pipe, args.sleep_interval)).rstrip("\n")
+
         return output(output_text, pipe)
@@ -9,7 +9,7 @@
 __COMMAND__ = "touch"
 __DESCRIPTION__ = ""
 __DESCRIPTION_LONG__ = ""
-__VERSION__ = "1.0"
+__VERSION__ = "1.1"
 
 def parse_args(args=None, doc=False):
     """
@@ -86,7 +86,7 @@ def main(args: list, pipe: bool) -> Result:
         at_least_one_failed = False
 
         for filename in args.files:
-            result = creat(filename, 777)
+            result = creat(filename, 0o644)
 
             if not result.success:
                 at_least_one_failed = True
@@ -0,0 +1,114 @@
+__package__ = "blackhat.bin"
+
+from ..helpers import Result
+from ..lib.input import ArgParser
+from ..indexing import MAX_CONTENT_ENTRIES
+from ..lib.locate import updatedb, update_content_index, disable_content_index
+from ..lib.output import output
+
+__COMMAND__ = "updatedb"
+__DESCRIPTION__ = "update a database for locate"
+__DESCRIPTION_LONG__ = ""
+__VERSION__ = "1.1"
+
+
+def parse_args(args=None, doc=False):
+    """
+    Handle parsing of arguments and flags. Generates docs using help from `ArgParser`
+
+    Args:
+        args (list): argv passed to the binary
+        doc (bool): If the function should generate and return manpage
+
+    Returns:
+        Processed args and a copy of the `ArgParser` object if not `doc` else a `string` containing the generated manpage
+    """
+    if args is None:
+        args = []
+    parser = ArgParser(prog=__COMMAND__, description=f"{__COMMAND__} - {__DESCRIPTION__}")
+    parser.add_argument("-t", "--trigrams", action="store_true",
+                        help="also index trigrams of every path (faster substring searches, uses more memory)")
+    parser.add_argument("-c", "--content", action="store_true",
+                        help="also build the content index used by grep -r and search (uses more memory)")
+    parser.add_argument("--content-limit", type=int, default=MAX_CONTENT_ENTRIES,
+                        help=f"the most trigram entries the content index can hold (default {MAX_CONTENT_ENTRIES}). "
+                             f"If it doesn't fit (now or after later writes), searches read every file until "
+                             f"the index is built again")
+    parser.add_argument("--no-content", action="store_true", help="drop the content index")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print the amount of indexed paths")
+    parser.add_argument("--version", action="store_true", help=f"output version information and exit")
+
+    args = parser.parse_args(args)
+
+    if not doc:
+        return args, parser
+
+    arg_helps_with_dups = parser._actions
+
+    arg_helps = []
+    [arg_helps.append(x) for x in arg_helps_with_dups if x not in arg_helps]
+
+    NAME = f"**NAME*/\n\t{__COMMAND__} - {__DESCRIPTION__}"
+    SYNOPSIS = f"**SYNOPSIS*/\n\t{__COMMAND__} [OPTION]... "
+    DESCRIPTION = f"**DESCRIPTION*/\n\t{__DESCRIPTION__}\n\n"
+
+    for item in arg_helps:
+        # it's a positional argument
+        if len(item.option_strings) == 0:
+            # If the argument is optional:
+            if item.nargs == "?":
+                SYNOPSIS += f"[{item.dest.upper()}] "
+            else:
+                SYNOPSIS += f"{item.dest.upper()} "
+        else:
+            # Boolean flag
+            if item.nargs == 0:
+                if len(item.option_strings) == 1:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\t{item.help}\n\n"
+                else:
+                    DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/\n\t\t{item.help}\n\n"
+            elif item.nargs == "+":
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/=[{item.dest.upper()}]...\n\t\t{item.help}\n\n"
+            else:
+                DESCRIPTION += f"\t**{' '.join(item.option_strings)}*/={item.dest.upper()}\n\t\t{item.help}\n\n"
+
+    return f"{NAME}\n\n{SYNOPSIS}\n\n{DESCRIPTION}\n\n"
+
+
+def main(args: list, pipe: bool) -> Result:
+    """
+    # TODO: Add docstring for manpage
+    """
+
+    args, parser = parse_args(args)
+
+    if parser.error_message:
+        if args.version:
+            return output(f"{__COMMAND__} (blackhat findutils) {__VERSION__}", pipe)
+
+        if not args.version:
+            return output(f"{__COMMAND__}: {parser.error_message}", pipe, success=False)
+
+    # If we specific -h/--help, args will be empty, so exit gracefully
+    if not args:
+        return output("", pipe)
+    else:
+        update_result = updatedb(args.trigrams)
+
+        if not update_result.success:
+            return output(f"{__COMMAND__}: Permission denied", pipe, success=False)
+
+        output_text = f"{__COMMAND__}: indexed {update_result.data} paths\n" if args.verbose else ""
+
+        if args.no_content:
+            disable_content_index()
+        elif args.content:
+            content_result = update_content_index(args.content_limit)
+
+            if args.verbose:
+                if content_result.data:
+                    output_text += f"{__COMMAND__}: indexed the content of {content_result.data} files\n"
+                else:
+                    output_text += f"{__COMMAND__}: content index hit --content-limit, searches will read every file\n"
+
+        return output(output_text, pipe)
@@ -84,8 +84,7 @@ def main(args: list, pipe: bool) -> Result:
         if args.version:
             return output(f"uptime from blackhat sysutils {__VERSION__}", pipe)
 
-        # TODO: Create special attribute for files in /proc so that they can't be modified
-        # For now, just trust that they'll exist
+        # /proc is generated (and can't be modified), so this always exists
         read_uptime = read("/proc/uptime")
 
         if not read_uptime.success:
@@ -0,0 +1,171 @@
+import gc
+from hashlib import sha256
+from threading import Lock
+from typing import Dict, Optional
+
+
+class BlobStore:
+    def __init__(self) -> None:
+        """
+        A content-addressed store for the content of every `File` in the game (shared by every `Computer`).
+        Identical content is only stored once, and a `File` only holds the hash of its content, so copying a `File`
+        (even to another `Computer`) is just a reference count increment.
+        A blob is freed as soon as the last `File` referencing it stops using it.
+        """
+        self.blobs: Dict[str, str] = {}
+        """dict: SHA-256 of the content -> the (immutable) content"""
+        self.refcounts: Dict[str, int] = {}
+        """dict: SHA-256 of the content -> the amount of `File`s using it"""
+        self.by_identity: Dict[int, str] = {}
+        """dict: id() of a stored content string -> its hash (lets us store a string we gave out without hashing it)"""
+        self.encoded: Dict[str, bytes] = {}
+        """dict: SHA-256 of the content -> the UTF-8 encoded content (only for blobs that were read by byte range)"""
+        self.lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.blobs)
+
+    @staticmethod
+    def hash(content: str) -> str:
+        """
+        Get the address of the given content
+
+        Args:
+            content (str): The content to hash
+
+        Returns:
+            str: The hex SHA-256 of the (UTF-8 encoded) content
+        """
+        return sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def put(self, content: str) -> str:
+        """
+        Store `content` (if it isn't already stored) and add a reference to it
+
+        Args:
+            content (str): The content to store
+
+        Returns:
+            str: The hash of the content (pass it to `get()`/`release()`)
+        """
+        with self.lock:
+            # Content that came from the store (ex. the `content` of another `File`) doesn't need to be hashed again
+            digest = self.by_identity.get(id(content))
+
+            if digest is None or self.blobs[digest] is not content:
+                digest = self.hash(content)
+
+            if digest in self.blobs:
+                self.refcounts[digest] += 1
+            else:
+                self.blobs[digest] = content
+                self.refcounts[digest] = 1
+                self.by_identity[id(content)] = digest
+
+        return digest
+
+    def acquire(self, digest: str) -> str:
+        """
+        Add a reference to content that's already stored (a copy)
+
+        Args:
+            digest (str): The hash of the content
+
+        Returns:
+            str: The same hash
+        """
+        with self.lock:
+            self.refcounts[digest] += 1
+
+        return digest
+
+    def release(self, digest: Optional[str]) -> None:
+        """
+        Remove a reference to the given content, freeing it if nothing else uses it
+
+        Args:
+            digest (str, optional): The hash of the content (does nothing if `None`)
+
+        Returns:
+            None
+        """
+        if digest is None:
+            return
+
+        with self.lock:
+            refcount = self.refcounts.get(digest)
+            if refcount is None:
+                return
+
+            if refcount > 1:
+                self.refcounts[digest] = refcount - 1
+            else:
+                del self.refcounts[digest]
+                del self.by_identity[id(self.blobs.pop(digest))]
+                self.encoded.pop(digest, None)
+
+    def get(self, digest: Optional[str]) -> str:
+        """
+        Get stored content
+
+        Args:
+            digest (str, optional): The hash of the content
+
+        Returns:
+            str: The content (an empty string if `digest` is `None`)
+        """
+        if digest is None:
+            return ""
+
+        return self.blobs[digest]
+
+    def get_bytes(self, digest: Optional[str]) -> bytes:
+        """
+        Get stored content, UTF-8 encoded. The encoded content is kept until the blob is freed, so reading a big file
+        in chunks only encodes it once
+
+        Args:
+            digest (str, optional): The hash of the content
+
+        Returns:
+            bytes: The encoded content (empty if `digest` is `None`)
+        """
+        if digest is None:
+            return b""
+
+        encoded = self.encoded.get(digest)
+        if encoded is not None:
+            return encoded
+
+        encoded = self.blobs[digest].encode()
+
+        with self.lock:
+            # Only cache it if the blob wasn't freed in the meantime
+            if digest in self.blobs:
+                self.encoded[digest] = encoded
+
+        return encoded
+
+    def collect(self) -> int:
+        """
+        Free the content of `File`s that are no longer reachable (deleted files still inside of reference cycles)
+
+        Returns:
+            int: The amount of blobs that were freed
+        """
+        before = len(self.blobs)
+        gc.collect()
+        return before - len(self.blobs)
+
+    def total_size(self) -> int:
+        """
+        Get how much content is stored
+
+        Returns:
+            int: The total amount of characters in every stored blob (each only counted once)
+        """
+        return sum(len(x) for x in self.blobs.values())
+
+
+blob_store = BlobStore()
+"""BlobStore: The store used by every `File` (in every `Computer`)"""
@@ -2,6 +2,7 @@
 import pickle
 import sqlite3
 import tempfile
+from copy import copy
 from datetime import datetime
 from hashlib import md5
 from importlib.machinery import SourceFileLoader
@@ -13,31 +14,63 @@
 from typing import Optional, Dict, Union, List, Literal
 from .helpers import make_temp_file
 
-from .fs import Directory, File, StandardFS, FSBaseObject, copy
-from .helpers import Result, ResultMessages, AccessMode, timeval, stat_struct, RebootMode
-from .lib import unistd, stdlib, dirent, fcntl, stdio, pwd, ifaddrs, netdb
+from .database import Database, get_database
+from .events import event_batch
+from .fs import Directory, File, StandardFS, FSBaseObject, Symlink, RenderedFile, refresh_stale_files
+from .helpers import Result, ResultMessages, AccessMode, timeval, stat_struct, statfs_struct, RebootMode, InotifyMask
+from .inotify import Inotify
+from .journal import Journal
+from .modes import ModeChange, mode_to_permissions, parse_mode, permissions_to_mode
+from .lib import unistd, stdlib, dirent, fcntl, stdio, pwd, ifaddrs, netdb, locate
 from .lib.arpa import inet
-from .lib.sys import time, stat, socket
+from .lib.sys import time, stat, socket, statfs, inotify, mount
 from .lib.sys.socket import Socket
 from .services.pingserver import PingServer
 from .services.service import Service
-from .session import Session
+from .session import Credentials, Session
 from .user import User, Group
 
+UID_MIN = 1000
+"""int: The first UID/GID given to regular users and groups (everything below it is reserved for root/the system)"""
+
 
 class Computer:
-    def __init__(self) -> None:
+    def __init__(self, database: Optional[Database] = None) -> None:
         """
         The class object representing a basic linux computer. This class is the base for all nodes on a network
-        """
-        self.connection = sqlite3.connect("blackhat.db")
-        self.database = self.connection.cursor()
+
+        Args:
+            database (Database, optional): The world's identity database (defaults to the shared blackhat.db)
+        """
+        self._db: Optional[Database] = database if database is not None else get_database()
+        self._cursor: Optional[sqlite3.Cursor] = self._db.connection.cursor()
+        self.database_path: str = self._db.path
+        """str: The path of the identity database (a `Computer` loaded from a save connects to it, see `db`)"""
+        self.pending_database: Optional[Database] = None
+        """Database: The database a `Computer` loaded from a save connects to instead of the one at `database_path`
+        (see `load()`)"""
         self.boot_time = datetime.now()
         self.parent: Optional[Computer, Router, ISPRouter] = None  # Router
         self.hostname: Optional[str] = None
         self.users: Dict[int, User] = {}
+        """dict: UID -> `User` (write-through cache of this computer's rows in `blackhat_user`, in creation order)"""
+        self.usernames: Dict[str, int] = {}
+        """dict: Username -> UID"""
         self.groups: Dict[int, Group] = {}
+        """dict: GID -> `Group` (write-through cache of this computer's rows in `blackhat_group`, in creation order)"""
+        self.group_names: Dict[str, int] = {}
+        """dict: Group name -> GID"""
+        self.memberships: Dict[int, Dict[int, str]] = {}
+        """dict: UID -> (GID -> membership type) (write-through cache of `group_membership`)"""
+        self.max_uid: int = -1
+        """int: The highest UID in use (-1 if there are no users), see `allocate_uid()`"""
+        self.max_gid: int = -1
+        """int: The highest GID in use (-1 if there are no groups), see `allocate_gid()`"""
         self.sessions: List[Session] = []
+        self.identity_generation: int = 0
+        """int: Bumped whenever users, groups or group memberships change (invalidates cached permission checks)"""
+        self.inotify_instances: Dict[int, Inotify] = {}
+        """dict: File descriptor -> open inotify instance"""
         self.lan = None
         self.id = token_hex(8)
         self.shell = None
@@ -50,6 +83,49 @@ def __init__(self) -> None:
         self.services: dict[int, Service] = {0: PingServer(self)}
         self.post_fs_init()
 
+    def __getstate__(self) -> dict:
+        # Database handles can't be pickled. The identity tables don't need them anyway: the identity cache (`users`,
+        # `groups` and `memberships`) holds all of it, and it's written back the first time the database is used after
+        # loading (see `db`). The shell belongs to the running game, not to the world
+        state = self.__dict__.copy()
+        # Copies of the containers (and cached identities), so the state doesn't change while another thread pickles it
+        # (see `capture_world()`)
+        for name, value in state.items():
+            if isinstance(value, (dict, list)):
+                state[name] = value.copy()
+        state["users"] = {uid: copy(user) for uid, user in self.users.items()}
+        state["groups"] = {gid: copy(group) for gid, group in self.groups.items()}
+        state["memberships"] = {uid: dict(memberships) for uid, memberships in self.memberships.items()}
+        state["_db"] = state["_cursor"] = state["pending_database"] = None
+        if self._db is None and self.pending_database is not None:
+            # Loaded into another database, which this computer never used
+            state["database_path"] = self.pending_database.path
+        state["shell"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+
+    @property
+    def db(self) -> Database:
+        """Database: The identity database (shared with every other `Computer` in the world). A `Computer` loaded from a
+        save connects to it the first time it's needed (see `reconnect()`), so loading a world never touches it"""
+        if self._db is None:
+            self.reconnect(self.pending_database or get_database(self.database_path))
+        return self._db
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """sqlite3.Connection: The connection of `db`"""
+        return self.db.connection
+
+    @property
+    def database(self) -> sqlite3.Cursor:
+        """sqlite3.Cursor: This computer's cursor on `connection`"""
+        if self._cursor is None:
+            self.reconnect(self.pending_database or get_database(self.database_path))
+        return self._cursor
+
     ##################
     # Init functions #
     ##################
@@ -62,10 +138,8 @@ def init(self) -> None:
             None
         """
         self.boot_time = datetime.now()
-        # Try to set up the user, group, and group membership tables
-        init_tables_file = open("blackhat/database/init_tables.sql")
-        init_tables = init_tables_file.read()
-        self.database.executescript(init_tables)
+        # The user, group, and group membership tables were set up when the database was opened
+        self.load_identities()
 
         # Check if the computer we're initializing already exists in the database (we're loading an existing save)
         result = self.database.execute("SELECT * FROM computer WHERE id=?", (self.id,)).fetchall()
@@ -73,11 +147,212 @@ def init(self) -> None:
         if len(result) == 0:
             # We're starting a new save, lets save a copy of this computer's id in the database, along with create the
             # root user
+            with self.identity_transaction():
+                self.database.execute("INSERT INTO computer VALUES (?)", (self.id,))
+                self.create_root_user()
+
+    def load_identities(self) -> None:
+        """
+        Fill the user, group and group membership caches from the database. After this, lookups never touch the
+        database; every change is written to both (see `add_user`, `add_group`, `add_user_to_group`, etc.)
+
+        Returns:
+            None
+        """
+        self.users = {}
+        self.usernames = {}
+        self.groups = {}
+        self.group_names = {}
+        self.memberships = {}
+        self.max_uid = -1
+        self.max_gid = -1
+
+        for row in self.database.execute("SELECT * FROM blackhat_user WHERE computer_id=? ORDER BY id", (self.id,)):
+            self.cache_user(User(uid=row[1], username=row[2], password=row[3], full_name=row[4], room_number=row[5],
+                                 work_phone=row[6], home_phone=row[7], other=row[8]))
+
+        for row in self.database.execute("SELECT gid, name FROM blackhat_group WHERE computer_id=? ORDER BY id",
+                                         (self.id,)):
+            self.cache_group(Group(gid=row[0], name=row[1]))
+
+        for uid, gid, membership_type in self.database.execute(
+                "SELECT user_uid, group_gid, membership_type FROM group_membership WHERE computer_id=? ORDER BY id",
+                (self.id,)):
+            self.memberships.setdefault(uid, {})[gid] = membership_type
+
+        self.identity_generation += 1
+
+    def identity_transaction(self):
+        """
+        Context manager that groups user/group changes into one database transaction: nothing is committed (and
+        /etc/passwd, etc. aren't synced) until the block exits. If the block raises, every change made inside of it is
+        rolled back (in the database and in the identity cache) and the exception is re-raised.
+        The transaction belongs to the whole `Database` (for the current thread), so changes to other `Computer`s made
+        inside of it are part of it too, while other threads wait for it to end before changing anything.
+        Nested transactions are committed with the outermost one, but a nested one that raises only rolls back its own
+        changes
+        """
+        return self.db.transaction()
+
+    def commit_identities(self) -> None:
+        """
+        Commit user/group changes and mark /etc/passwd, /etc/shadow and /etc/group as out of date.
+        Inside an `identity_transaction()`, this waits until the transaction ends
+
+        Returns:
+            None
+        """
+        self.db.commit(self)
+
+    def reconnect(self, database: Database) -> None:
+        """
+        Use the given identity database (after loading a save) and replace this computer's rows in it with the
+        identity cache, so the database matches the save (it may be a new in-memory one, or have newer rows)
+
+        Args:
+            database (Database): The world's identity database
+
+        Returns:
+            None
+        """
+        self._db = database
+        self._cursor = database.connection.cursor()
+        self.database_path = database.path
+        self.pending_database = None
+
+        with self.identity_transaction():
+            self.db.delete_computers([self.id])
             self.database.execute("INSERT INTO computer VALUES (?)", (self.id,))
-            self.create_root_user()
-            self.connection.commit()
+            self.database.executemany(
+                "INSERT INTO blackhat_user (uid, username, password, full_name, room_number, work_phone, home_phone, "
+                "other, computer_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(user.uid, user.username, user.password, user.full_name, user.room_number, user.work_phone,
+                  user.home_phone, user.other, self.id) for user in self.users.values()])
+            self.database.executemany("INSERT INTO blackhat_group (gid, name, computer_id) VALUES (?, ?, ?)",
+                                      [(group.gid, group.name, self.id) for group in self.groups.values()])
+            self.database.executemany(
+                "INSERT INTO group_membership (computer_id, user_uid, group_gid, membership_type) VALUES (?, ?, ?, ?)",
+                [(self.id, uid, gid, membership_type) for uid, memberships in self.memberships.items()
+                 for gid, membership_type in memberships.items()])
+
+    def unregister(self) -> None:
+        """
+        Delete this computer's rows (users, groups, group memberships and the computer itself) from the database and
+        empty the identity cache. Used when the world is torn down, so the database doesn't collect the rows of every
+        `Computer` that was ever made
+
+        Returns:
+            None
+        """
+        self.db.delete_computers([self.id])
+        self.load_identities()
+
+    def unjournaled_state(self) -> tuple:
+        """
+        Get the state of this computer that a `Journal` doesn't record (the hostname, sessions, quotas, mounts, etc.),
+        so `save()` can tell when it changed since the last snapshot
+
+        Returns:
+            tuple: The state (only meant to be compared)
+        """
+        # Copies, the live ones keep changing
+        sessions = [(session.id, session.real_uid, session.effective_uid, session.saved_uid,
+                     session.current_dir.pwd(), dict(session.env)) for session in self.sessions]
+        return (self.hostname, sessions, dict(self.fs.quotas), dict(self.fs.mounts), self.fs.capacity,
+                list(self.services))
+
+    def identity_state(self) -> tuple:
+        """
+        Get the identity cache, to record in a `Journal` (see `restore_identities()`)
+
+        Returns:
+            tuple: The list of `User`s, the list of `Group`s and the group memberships
+        """
+        return list(self.users.values()), list(self.groups.values()), self.memberships
+
+    def restore_identities(self, users: List[User], groups: List[Group],
+                           memberships: Dict[int, Dict[int, str]]) -> None:
+        """
+        Replace the identity cache with the one recorded in a `Journal` (when a save is loaded). The database isn't
+        touched, the rows are written back when the computer reconnects (see `reconnect()`)
+
+        Args:
+            users (list): The `User`s, in creation order
+            groups (list): The `Group`s, in creation order
+            memberships (dict): UID -> (GID -> membership type)
+
+        Returns:
+            None
+        """
+        self.users = {}
+        self.usernames = {}
+        self.groups = {}
+        self.group_names = {}
+        self.max_uid = -1
+        self.max_gid = -1
+
+        for user in users:
+            self.cache_user(user)
+        for group in groups:
+            self.cache_group(group)
+        self.memberships = memberships
+
+        self.identity_generation += 1
+        self.sync_user_and_group_files()
+
+    def cache_user(self, user: User) -> None:
+        """
+        Add a `User` to the user cache (the database row must already exist)
+
+        Args:
+            user (User): The user
+
+        Returns:
+            None
+        """
+        self.users[user.uid] = user
+        self.max_uid = max(self.max_uid, user.uid)
+        # Like the old `uid=? OR username=?` query, the first user with a given username wins
+        self.usernames.setdefault(user.username, user.uid)
+
+    def cache_group(self, group: Group) -> None:
+        """
+        Add a `Group` to the group cache (the database row must already exist)
+
+        Args:
+            group (Group): The group
+
+        Returns:
+            None
+        """
+        self.groups[group.gid] = group
+        self.max_gid = max(self.max_gid, group.gid)
+        self.group_names.setdefault(group.name, group.gid)
+
+    def allocate_uid(self) -> int:
+        """
+        Get the UID for a new user: 0 for the first user (root), then the UID after the highest one in use (but at
+        least `UID_MIN`). This never has to look at the other users, so creating thousands of them stays fast
+
+        Returns:
+            int: A UID that isn't in use
+        """
+        if not self.users:
+            return 0
+
+        return max(self.max_uid + 1, UID_MIN)
+
+    def allocate_gid(self) -> int:
+        """
+        Get the GID for a new group (the same way `allocate_uid()` gets a UID)
+
+        Returns:
+            int: A GID that isn't in use
+        """
+        if not self.groups:
+            return 0
 
-        init_tables_file.close()
+        return max(self.max_gid + 1, UID_MIN)
 
     def post_fs_init(self) -> None:
         """
@@ -99,7 +374,8 @@ def update_libs(self):
         Returns:
             None
         """
-        libs = [unistd, time, stat, stdlib, dirent, fcntl, inet, stdio, pwd, socket, ifaddrs, netdb]
+        libs = [unistd, time, stat, stdlib, dirent, fcntl, inet, stdio, pwd, socket, ifaddrs, netdb, locate, statfs,
+                inotify, mount]
 
         for lib in libs:
             lib.update(self)
@@ -137,77 +413,99 @@ def sync_user_and_group_files(self) -> Result:
         /etc/shadow matches our internal user map
         /etc/group matches our internal group map
 
+        The files are only marked as stale here, they're rendered (see `render_passwd()`, etc.) the next time they're
+        read, so any amount of user/group changes in a row only cost one render
+
         Returns:
-            None
+            Result: A `Result` with the `success` flag set accordingly
         """
         # The reason we're trying here is that sometimes, this function gets called before the fs is initalized
         try:
             etc_dir: Directory = self.fs.files.find("etc")
+        except AttributeError:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-            if not etc_dir:
-                return Result(success=False, message=ResultMessages.NOT_FOUND)
+        if not etc_dir:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-            passwd_file: File = etc_dir.find("passwd")
-            shadow_file: File = etc_dir.find("shadow")
-            group_file: File = etc_dir.find("group")
-
-            # TODO: Allow modification of home directory from here
-            # passwd format: USERNAME:MD5_PASSWORD OR "x":UID:PRIMARY_GID
-            # shadow format: USERNAME:MD5_PASSWORD
-            # group format: GROUP_NAME:x:GID:GROUP_USERS
-
-            passwd_content = ""
-            shadow_content = ""
-            group_content = ""
-
-            for user in self.get_all_users().data:
-                # Find the "primary" group
-                primary_group = self.get_user_primary_group(user.uid)
-                if primary_group.success:
-                    if len(primary_group.data) > 0:
-                        primary_group = primary_group.data[0]
-                    else:
-                        primary_group = "?"
-                else:
-                    primary_group = "?"
+        if self.fs.journal is not None:
+            self.fs.journal.record(("identities", self.id, None), self.identity_state)
+
+        for name, render in [("passwd", self.render_passwd), ("shadow", self.render_shadow),
+                             ("group", self.render_group)]:
+            file = etc_dir.find(name)
+
+            if not file:
+                file = RenderedFile(name, render, etc_dir, 0, 0)
+                if name == "shadow":
+                    # rw-------
+                    file.permissions = {"read": ["owner"], "write": ["owner"], "execute": []}
+            elif isinstance(file, RenderedFile):
+                file.invalidate()
+            elif file.is_file():
+                # Replaced by a plain file, keep it in sync the old (eager) way
+                file.content = render()
+                file.update_size()
 
-                passwd_content += f"{user.username}:x:{user.uid}:{primary_group}\n"
-                shadow_content += f"{user.username}:{user.password}\n"
+        return Result(success=True)
 
-            for group in self.get_all_groups().data:
-                uids = self.get_users_in_group(group.gid).data
-                usernames = ""
-                for uid in uids:
-                    user_lookup = self.get_user(uid=uid[0])
-                    usernames += ("?" if not user_lookup.success else user_lookup.data.username) + ","
+    def primary_groups(self) -> Dict[int, int]:
+        """
+        Get the primary GID of every user (from the identity cache)
 
-                usernames = usernames[:-1]
+        Returns:
+            dict: UID -> primary GID (users without a primary group are left out)
+        """
+        primary = {}
 
-                group_content += f"{group.name}:x:{group.gid}:{usernames}\n"
-                # print(group_content, end="")
+        for uid, memberships in self.memberships.items():
+            for gid, membership_type in memberships.items():
+                if membership_type == "primary":
+                    primary.setdefault(uid, gid)
 
-            if not passwd_file:
-                # Create the /etc/passwd
-                File("passwd", passwd_content, etc_dir, 0, 0)
-            else:
-                passwd_file.content = passwd_content
+        return primary
 
-            if not shadow_file:
-                # Create the /etc/shadow file and change its perms (rw-------)
-                shadow_file = File("shadow", shadow_content, etc_dir, 0, 0)
-                shadow_file.permissions = {"read": ["owner"], "write": ["owner"], "execute": []}
-            else:
-                shadow_file.content = shadow_content
+    def render_passwd(self) -> str:
+        """
+        Render /etc/passwd from the identity cache
+        Format: USERNAME:x:UID:PRIMARY_GID
 
-            if not group_file:
-                # Create the /etc/group
-                File("group", group_content, etc_dir, 0, 0)
-            else:
-                group_file.content = group_content
-        except Exception as e:
-            return Result(success=False, )
+        Returns:
+            str: The content of the file
+        """
+        # TODO: Allow modification of home directory from here
+        primary = self.primary_groups()
 
-        return Result(success=True)
+        return "".join(f"{user.username}:x:{user.uid}:{primary.get(user.uid, '?')}\n" for user in self.users.values())
+
+    def render_shadow(self) -> str:
+        """
+        Render /etc/shadow from the identity cache
+        Format: USERNAME:MD5_PASSWORD
+
+        Returns:
+            str: The content of the file
+        """
+        return "".join(f"{user.username}:{user.password}\n" for user in self.users.values())
+
+    def render_group(self) -> str:
+        """
+        Render /etc/group from the identity cache
+        Format: GROUP_NAME:x:GID:GROUP_USERS
+
+        Returns:
+            str: The content of the file
+        """
+        members: Dict[int, List[str]] = {gid: [] for gid in self.groups}
+
+        # Walk the users (not the memberships) so members are listed in the order the users were created
+        for uid, user in self.users.items():
+            for gid in self.memberships.get(uid, ()):
+                if gid in members:
+                    members[gid].append(user.username)
+
+        return "".join(f"{group.name}:x:{group.gid}:{','.join(members[group.gid])}\n"
+                       for group in self.groups.values())
 
     def run_command(self, command: str, args: Union[str, List[str], None], pipe: bool) -> Result:
         """
@@ -284,10 +582,13 @@ def run_command(self, command: str, args: Union[str, List[str], None], pipe: boo
                 if command == "debug":
                     print("Debugger enabled")  # SET YOUR BREAKPOINT HERE
 
-            response = module.main(args, pipe)
-        except TypeError:
-            # The code we're running doesn't take a pipe argument
-            response = module.main(args)
+            # Coalesced FS event listeners (/etc/passwd sync, manpage generation, etc) run once the command is done
+            with event_batch():
+                try:
+                    response = module.main(args, pipe)
+                except TypeError:
+                    # The code we're running doesn't take a pipe argument
+                    response = module.main(args)
         except Exception as e:
             if os.getenv("DEBUGMODE") == "true":
                 import traceback
@@ -340,46 +641,34 @@ def add_user(self, username: str, password: str, uid: Optional[int] = None, plai
         Returns:
             Result: A `Result` instance with the `success` flag set accordingly. The `data` flag contains the new users UID if successful.
         """
-        if self.get_user(username=username).success:
-            return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
-
-        # Manually specific UID
-        if uid:
-            # Check if a user with the given UID already exists
-            if self.get_user(uid=uid).success:
+        # One change at a time (see `Database.write()`)
+        with self.db.write():
+            if self.get_user(username=username).success:
                 return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
-            else:
-                next_uid = uid
-        # Auto-generate the UID (depending on the situation)
-        else:
-            # We're creating our root user, there isn't going to be a previous UID
-            users = self.get_all_users().data
-            if len(users) == 0:
-                next_uid = 0
-            else:
-                # Get the UID from the previously created user
-                last_uid = users[-1].uid
-                if last_uid == 0:
-                    next_uid = 1000
-                else:
-                    next_uid = last_uid + 1
-                    user_with_next_uid = self.get_user(uid=next_uid)
 
-                    while user_with_next_uid.success:
-                        next_uid += 1
-                        user_with_next_uid = self.get_user(uid=next_uid)
+            # Manually specific UID
+            if uid:
+                # Check if a user with the given UID already exists
+                if self.get_user(uid=uid).success:
+                    return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
+                else:
+                    next_uid = uid
+            # Auto-generate the UID (0 for our root user)
+            else:
+                next_uid = self.allocate_uid()
 
-        # Hash the password before saving to the database
-        hashed_password = md5(password.encode()).hexdigest() if plaintext else password
+            # Hash the password before saving to the database
+            hashed_password = md5(password.encode()).hexdigest() if plaintext else password
 
-        # Create the new user
-        self.database.execute("INSERT INTO blackhat_user (uid, username, password, computer_id) VALUES (?, ?, ?, ?)",
-                              (next_uid, username, hashed_password, self.id))
-        self.connection.commit()
+            # Create the new user
+            self.database.execute("INSERT INTO blackhat_user (uid, username, password, computer_id) "
+                                  "VALUES (?, ?, ?, ?)", (next_uid, username, hashed_password, self.id))
+            self.cache_user(User(uid=next_uid, username=username, password=hashed_password))
+            self.identity_generation += 1
 
-        self.sync_user_and_group_files()
+            self.commit_identities()
 
-        return Result(success=True, data=next_uid)
+            return Result(success=True, data=next_uid)
 
     def delete_user(self, username: str) -> Result:
         """
@@ -391,14 +680,19 @@ def delete_user(self, username: str) -> Result:
         Returns:
             Result: A `Result` instance with the `success` flag set accordingly.
         """
-        if self.get_user(username=username).success:
-            self.database.execute("DELETE FROM blackhat_user WHERE computer_id=? and username=?", (self.id, username))
-            self.connection.commit()
-            return Result(success=True)
-
-        self.sync_user_and_group_files()
+        with self.db.write():
+            if self.get_user(username=username).success:
+                self.database.execute("DELETE FROM blackhat_user WHERE computer_id=? and username=?",
+                                      (self.id, username))
+                for uid in [uid for uid, user in self.users.items() if user.username == username]:
+                    del self.users[uid]
+                del self.usernames[username]
+                self.max_uid = max(self.users, default=-1)
+                self.identity_generation += 1
+                self.commit_identities()
+                return Result(success=True)
 
-        return Result(success=False, message=ResultMessages.NOT_FOUND)
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
 
     def change_user_password(self, uid: int, new_password: str, plaintext=True) -> Result:
         """
@@ -412,22 +706,23 @@ def change_user_password(self, uid: int, new_password: str, plaintext=True) -> R
         Returns:
             Result: A `Result` with the `success` flag set accordingly.
         """
-        # Double check that the user with the given UID exists
-        lookup_user = self.get_user(uid=uid)
-        if not lookup_user.success:
-            return Result(success=False, message=ResultMessages.NOT_FOUND)
+        with self.db.write():
+            # Double check that the user with the given UID exists
+            lookup_user = self.get_user(uid=uid)
+            if not lookup_user.success:
+                return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        # Hash the plain text password
-        password_hash = md5(new_password.encode()).hexdigest() if plaintext else new_password
+            # Hash the plain text password
+            password_hash = md5(new_password.encode()).hexdigest() if plaintext else new_password
 
-        # Update the password in the database
-        result = self.database.execute("UPDATE blackhat_user SET password=? WHERE uid=? AND computer_id=?",
-                                       (password_hash, uid, self.id))
-        self.connection.commit()
+            # Update the password in the database
+            result = self.database.execute("UPDATE blackhat_user SET password=? WHERE uid=? AND computer_id=?",
+                                           (password_hash, uid, self.id))
+            self.users[uid].password = password_hash
 
-        self.sync_user_and_group_files()
+            self.commit_identities()
 
-        return Result(success=True)
+            return Result(success=True)
 
     def change_user_uid(self, uid: int, new_uid: int) -> Result:
         """
@@ -440,35 +735,46 @@ def change_user_uid(self, uid: int, new_uid: int) -> Result:
         Returns:
             Result: A `Result` with the `success` flag set accordingly.
         """
-        # Double check that the user with the given UID exists
-        lookup_user = self.get_user(uid=uid)
-        if not lookup_user.success:
-            return Result(success=False, message=ResultMessages.NOT_FOUND)
+        with self.db.write():
+            # Double check that the user with the given UID exists
+            lookup_user = self.get_user(uid=uid)
+            if not lookup_user.success:
+                return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        # Make sure that no other user has the given `new_uid`
-        lookup_user = self.get_user(uid=new_uid)
-        if lookup_user.success:
-            return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
+            # Make sure that no other user has the given `new_uid`
+            lookup_user = self.get_user(uid=new_uid)
+            if lookup_user.success:
+                return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
 
-        # Update the uid in the database
-        result = self.database.execute("UPDATE blackhat_user SET uid=? WHERE uid=? AND computer_id=?",
-                                       (new_uid, uid, self.id))
-        self.connection.commit()
+            # Update the uid in the database
+            result = self.database.execute("UPDATE blackhat_user SET uid=? WHERE uid=? AND computer_id=?",
+                                           (new_uid, uid, self.id))
 
-        # We need to update the UID of all sessions that this user has
-        for session in self.sessions:
-            if session.real_uid == uid:
-                session.real_uid = new_uid
+            # We need to update the UID of all sessions that this user has
+            for session in self.sessions:
+                if session.real_uid == uid:
+                    session.real_uid = new_uid
 
-            if session.effective_uid == uid:
-                session.effective_uid = new_uid
+                if session.effective_uid == uid:
+                    session.effective_uid = new_uid
 
-        # We also need to update the UID in the group membership records
-        self.database.execute("UPDATE group_membership SET user_uid=? WHERE user_uid=? AND computer_id=?",
-                              (new_uid, uid, self.id))
-        self.sync_user_and_group_files()
+            # We also need to update the UID in the group membership records
+            self.database.execute("UPDATE group_membership SET user_uid=? WHERE user_uid=? AND computer_id=?",
+                                  (new_uid, uid, self.id))
 
-        return Result(success=True)
+            # Keep the user in the same (creation) order in the cache
+            user = self.users[uid]
+            user.uid = new_uid
+            self.users = {(new_uid if key == uid else key): value for key, value in self.users.items()}
+            self.usernames = {name: (new_uid if value == uid else value) for name, value in self.usernames.items()}
+            if uid in self.memberships:
+                self.memberships[new_uid] = self.memberships.pop(uid)
+            self.max_uid = max(self.users)
+
+            self.identity_generation += 1
+            self.commit_identities()
+
+            return Result(success=True)
 
     def add_group(self, name: str, gid: Optional[int] = None) -> Result:
         """
@@ -482,35 +788,28 @@ def add_group(self, name: str, gid: Optional[int] = None) -> Result:
         Returns:
             Result: A `Result` instance with the `success` flag set accordingly. The `data` flag contains the GID if successful.
         """
-        if self.get_group(name=name).success:
-            return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
-
-        if gid:
-            # Check if a group with the given GID already exists
-            if self.get_group(gid=gid, name=name).success:
+        with self.db.write():
+            if self.get_group(name=name).success:
                 return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
-            else:
-                next_gid = gid
-        else:
-            # Auto-generate the GID (depending on the situation)
-            groups = self.get_all_groups().data
-            if len(groups) == 0:
-                next_gid = 0
-            else:
-                # Get the GID from the previously created group
-                last_gid = groups[-1].gid
-                if last_gid == 0:
-                    next_gid = 1000
+
+            if gid:
+                # Check if a group with the given GID already exists
+                if self.get_group(gid=gid).success:
+                    return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
                 else:
-                    next_gid = last_gid + 1
+                    next_gid = gid
+            else:
+                # Auto-generate the GID (0 for the root group)
+                next_gid = self.allocate_gid()
 
-        # Create the new group and commit
-        self.database.execute("INSERT INTO blackhat_group (gid, name, computer_id) VALUES (?, ?, ?)",
-                              (next_gid, name, self.id))
-        self.connection.commit()
-        self.sync_user_and_group_files()
+            # Create the new group and commit
+            self.database.execute("INSERT INTO blackhat_group (gid, name, computer_id) VALUES (?, ?, ?)",
+                                  (next_gid, name, self.id))
+            self.cache_group(Group(gid=next_gid, name=name))
+            self.identity_generation += 1
+            self.commit_identities()
 
-        return Result(success=True, data=next_gid)
+            return Result(success=True, data=next_gid)
 
     def delete_group(self, name: str) -> Result:
         """
@@ -522,13 +821,18 @@ def delete_group(self, name: str) -> Result:
         Returns:
             Result: A `Result` instance with the `success` flag set accordingly.
         """
-        if self.get_group(name=name).success:
-            self.database.execute("DELETE FROM blackhat_group WHERE computer_id=? and name=?", (self.id, name))
-            self.connection.commit()
-            return Result(success=True)
-        self.sync_user_and_group_files()
+        with self.db.write():
+            if self.get_group(name=name).success:
+                self.database.execute("DELETE FROM blackhat_group WHERE computer_id=? and name=?", (self.id, name))
+                for gid in [gid for gid, group in self.groups.items() if group.name == name]:
+                    del self.groups[gid]
+                del self.group_names[name]
+                self.max_gid = max(self.groups, default=-1)
+                self.identity_generation += 1
+                self.commit_identities()
+                return Result(success=True)
 
-        return Result(success=False, message=ResultMessages.NOT_FOUND)
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
 
     def add_user_to_group(self, uid: int, gid: int,
                           membership_type: Literal["primary", "secondary"] = "secondary") -> Result:
@@ -543,16 +847,26 @@ def add_user_to_group(self, uid: int, gid: int,
         Returns:
             Result: A `Result` object with the `success` flag set accordingly
         """
-        # Confirm that both user and group exists
-        if self.get_user(uid=uid).success and self.get_group(gid=gid).success:
-            self.database.execute(
-                "INSERT INTO group_membership (computer_id, user_uid, group_gid, membership_type) VALUES (?, ?, ?, ?)",
-                (self.id, uid, gid, membership_type))
-            self.connection.commit()
-            self.sync_user_and_group_files()
-            return Result(success=True)
-        else:
-            return Result(success=False, message=ResultMessages.NOT_FOUND)
+        with self.db.write():
+            # Confirm that both user and group exists
+            if self.get_user(uid=uid).success and self.get_group(gid=gid).success:
+                # Already a member (of this type), nothing to do
+                if self.memberships.get(uid, {}).get(gid) == membership_type:
+                    return Result(success=True)
+
+                # A new type replaces the old one, so there's always one row per membership (like the cache)
+                self.database.execute("DELETE FROM group_membership WHERE computer_id=? AND user_uid=? AND group_gid=?",
+                                      (self.id, uid, gid))
+                self.database.execute(
+                    "INSERT INTO group_membership (computer_id, user_uid, group_gid, membership_type) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.id, uid, gid, membership_type))
+                self.memberships.setdefault(uid, {})[gid] = membership_type
+                self.identity_generation += 1
+                self.commit_identities()
+                return Result(success=True)
+            else:
+                return Result(success=False, message=ResultMessages.NOT_FOUND)
 
     def get_user_groups(self, uid: int) -> Result:
         """
@@ -565,13 +879,10 @@ def get_user_groups(self, uid: int) -> Result:
             Result: A `Result` with the `data` flag containing a list of GIDs
         """
         # Double check if the user exists
-        if not self.get_user(uid=uid).success:
+        if uid not in self.users:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
-        else:
-            # Ask the database for the GIDs
-            result = self.database.execute("SELECT group_gid FROM group_membership WHERE computer_id=? and user_uid=?;",
-                                           (self.id, uid)).fetchall()
-            return Result(success=True, data=[x[0] for x in result])
+
+        return Result(success=True, data=list(self.memberships.get(uid, ())))
 
     def get_user_primary_group(self, uid: int) -> Result:
         """
@@ -584,14 +895,14 @@ def get_user_primary_group(self, uid: int) -> Result:
             Result: A `Result` with the `data` flag containing a list of GIDs
         """
         # Double check if the user exists
-        if not self.get_user(uid=uid).success:
+        if uid not in self.users:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
-        else:
-            # Ask the database for the GIDs
-            result = self.database.execute(
-                "SELECT group_gid FROM group_membership WHERE computer_id=? and user_uid=? and membership_type=?;",
-                (self.id, uid, "primary")).fetchone()
-            return Result(success=True, data=[x for x in result])
+
+        for gid, membership_type in self.memberships.get(uid, {}).items():
+            if membership_type == "primary":
+                return Result(success=True, data=[gid])
+
+        return Result(success=True, data=[])
 
     def get_users_in_group(self, gid: int) -> Result:
         """
@@ -604,14 +915,10 @@ def get_users_in_group(self, gid: int) -> Result:
             Result: A `Result` with the `data` flag containing a list of UIDs
         """
         # Double check if the group exists
-        if not self.get_group(gid=gid).success:
+        if gid not in self.groups:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
-        # Ask the database for the UIDs
-        result = self.database.execute(
-            "SELECT uid FROM blackhat_user WHERE computer_id=? AND uid in (SELECT user_uid FROM group_membership WHERE computer_id=? AND group_gid=?)",
-            (self.id, self.id, gid)).fetchall()
 
-        return Result(success=True, data=[x for x in result])
+        return Result(success=True, data=[uid for uid in self.users if gid in self.memberships.get(uid, ())])
 
     def remove_user_from_group(self, uid: int, gid: int) -> Result:
         """
@@ -624,14 +931,17 @@ def remove_user_from_group(self, uid: int, gid: int) -> Result:
         Returns:
             Result: A `Result` object with the `success` flag set accordingly
         """
-        # Confirm that both user and group exists
-        if self.get_user(uid=uid).success and self.get_group(gid=gid).success:
-            self.database.execute("DELETE FROM group_membership WHERE computer_id=? AND user_uid=? AND group_gid=?",
-                                  (self.id, uid, gid))
-            self.connection.commit()
-            return Result(success=True)
-        else:
-            return Result(success=False, message=ResultMessages.NOT_FOUND)
+        with self.db.write():
+            # Confirm that both user and group exists
+            if self.get_user(uid=uid).success and self.get_group(gid=gid).success:
+                self.database.execute("DELETE FROM group_membership WHERE computer_id=? AND user_uid=? AND group_gid=?",
+                                      (self.id, uid, gid))
+                self.memberships.get(uid, {}).pop(gid, None)
+                self.identity_generation += 1
+                self.commit_identities()
+                return Result(success=True)
+            else:
+                return Result(success=False, message=ResultMessages.NOT_FOUND)
 
     def get_user(self, uid: Optional[int] = None, username: Optional[str] = None) -> Result:
         """
@@ -643,18 +953,16 @@ def get_user(self, uid: Optional[int] = None, username: Optional[str] = None) ->
         Returns:
             Result: A `Result` with the `success` flag set accordingly. The `data` flag contains the user dict if found
         """
-        if uid is None and username is None:
+        user = self.users.get(uid)
+
+        if user is None and username is not None:
+            user = self.users.get(self.usernames.get(username))
+
+        if user is None:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
-        else:
-            result = self.database.execute("SELECT * FROM blackhat_user WHERE (uid=? OR username=?) AND computer_id=?",
-                                           (uid, username, self.id)).fetchone()
-            if not result:
-                return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-            return Result(success=True,
-                          data=User(uid=result[1], username=result[2], password=result[3], full_name=result[4],
-                                    room_number=result[5],
-                                    work_phone=result[6], home_phone=result[7], other=result[8]))
+        # Callers get their own copy so they can't change the cache behind our back
+        return Result(success=True, data=copy(user))
 
     def get_group(self, gid: Optional[int] = None, name: Optional[str] = None) -> Result:
         """
@@ -666,20 +974,18 @@ def get_group(self, gid: Optional[int] = None, name: Optional[str] = None) -> Re
         Returns:
             Result: A `Result` with the `success` flag set accordingly. The `data` flag contains the group dict if found
         """
-        if gid is None and name is None:
-            return Result(success=False, message=ResultMessages.NOT_FOUND)
-        # We're looking by name AND gid
-        elif gid is not None and name is not None:
-            result = self.database.execute("SELECT * FROM blackhat_group WHERE (gid=? AND name=?) AND computer_id=?",
-                                           (gid, name, self.id)).fetchone()
+        if gid is not None:
+            group = self.groups.get(gid)
+            # We're looking by name AND gid
+            if group is not None and name is not None and group.name != name:
+                group = None
         else:
-            result = self.database.execute("SELECT * FROM blackhat_group WHERE (gid=? OR name=?) AND computer_id=?",
-                                           (gid, name, self.id)).fetchone()
+            group = self.groups.get(self.group_names.get(name))
 
-        if not result:
+        if group is None:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        return Result(success=True, data=Group(gid=result[1], name=result[2]))
+        return Result(success=True, data=copy(group))
 
     def get_all_users(self) -> Result:
         """
@@ -688,16 +994,7 @@ def get_all_users(self) -> Result:
         Returns:
             Result: A `Result` with the `data` flag containing the array of `User`s
         """
-        all_users = self.database.execute("SELECT * FROM blackhat_user WHERE computer_id=?",
-                                          (self.id,)).fetchall()
-
-        clean_users = []
-
-        for user in all_users:
-            clean_users.append(
-                User(uid=user[1], username=user[2], password=user[3], full_name=user[4], room_number=user[5],
-                     work_phone=user[6], home_phone=user[7], other=user[8]))
-        return Result(success=True, data=clean_users)
+        return Result(success=True, data=[copy(user) for user in self.users.values()])
 
     def get_all_groups(self) -> Result:
         """
@@ -706,14 +1003,7 @@ def get_all_groups(self) -> Result:
         Returns:
             Result: A `Result` with the `data` flag containing the array of `Group`s
         """
-        all_groups = self.database.execute("SELECT * FROM blackhat_group WHERE computer_id=?",
-                                           (self.id,)).fetchall()
-
-        clean_groups = []
-
-        for group in all_groups:
-            clean_groups.append(Group(gid=group[1], name=group[2]))
-        return Result(success=True, data=clean_groups)
+        return Result(success=True, data=[copy(group) for group in self.groups.values()])
 
     def create_root_user(self) -> None:
         """
@@ -796,30 +1086,143 @@ def run_current_user_shellrc(self):
 
     def save(self, output_file: str = "blackhat.save") -> bool:
         """
-        Serialize and dump the current `Computer` (and everything that's connected to it (`StandardFS`, `File`s, etc)) to a file
+        Save the world (every machine connected to this `Computer`, and everything that's connected to them
+        (`StandardFS`, `File`s, etc)) to a file.
+        The first save writes a full snapshot. After that, only the file system and identity changes made since the
+        last save are appended to the save's journal (`<output_file>.journal`, see `Journal`), so saving costs as much
+        as what changed. Once the journal grows past its threshold, a new snapshot is written in the background
+        (compaction). Anything else (ex. machines joining the world, or a new hostname, see `unjournaled_state()`) is
+        only saved by a snapshot, so changing it makes the next save a full one
+
         Args:
             output_file (str, optional): The file to dump the contents to
 
         Returns:
             bool: `True` if the dump/save was successful, otherwise `False`
         """
-        # Temporary: Disable saving because it doesn't work anyway
-        if True == False:
-            # if os.getenv("DEBUGMODE") == "false":
-            try:
-                with open(output_file, "wb") as f:
-                    pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
-                return True
-            except Exception as e:
-                # TODO: Fix save bug (can't pickle `self.connection` and `self.database`)
-                return False
-        else:
+        world = self.get_world()
+        machines = {machine.id: machine.unjournaled_state() for machine in world}
+        journal = self.fs.journal
+
+        if journal is not None and journal.path == output_file and journal.machines == machines and journal.flush():
+            if journal.size > journal.threshold:
+                journal.snapshot(self, machines, self.capture_world())
             return True
 
+        # The first save (or the journal doesn't match the save anymore)
+        if journal is None or journal.path != output_file:
+            journal = Journal(output_file)
+
+        for machine in world:
+            machine.fs.attach_journal(journal)
+
+        # Identity tables are included through the identity cache (see `__getstate__()`)
+        return journal.snapshot(self, machines)
+
+    def capture_world(self) -> Dict[int, tuple]:
+        """
+        Take the state of everything in the world that keeps changing (every `Computer`, its sessions, its file system
+        and the `File`s/`Directory`s in it), so another thread can pickle the world as it is now (see
+        `Journal.snapshot()`)
+
+        Returns:
+            dict: id() -> (the object, its `__getstate__()`)
+        """
+        states = {}
+
+        for machine in self.get_world():
+            states[id(machine)] = (machine, machine.__getstate__())
+            for session in machine.sessions:
+                states[id(session)] = (session, session.__getstate__())
+            machine.fs.capture(states)
+
+        return states
+
+    @staticmethod
+    def load(input_file: str = "blackhat.save", database: Optional[Database] = None) -> Result:
+        """
+        Load a world saved with `save()`: the snapshot, with every change in its journal replayed on top of it.
+        The database isn't touched until a machine needs it (see `db`)
+
+        Args:
+            input_file (str, optional): The file to load
+            database (Database, optional): The identity database to use, instead of the one the world was saved from
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly. The `data` flag contains the saved `Computer`
+        """
+        try:
+            with open(input_file, "rb") as f:
+                computer: Computer = pickle.load(f)
+        except Exception:
+            return Result(success=False, message=ResultMessages.GENERIC)
+
+        world = computer.get_world()
+
+        for machine in world:
+            if database is not None:
+                machine.pending_database = database
+            # /proc and host mounts aren't saved
+            machine.fs.setup_proc()
+            machine.fs.remount_hosts()
+
+        journal = computer.fs.journal
+
+        if journal is not None:
+            # The save could have been renamed
+            journal.path = input_file
+            machines = {machine.id: machine for machine in world}
+            journal.replaying = True
+
+            try:
+                for kind, computer_id, path, state in journal.read():
+                    machine = machines.get(computer_id)
+                    if machine is None:
+                        continue
+
+                    if kind == "identities":
+                        machine.restore_identities(*state)
+                    else:
+                        machine.fs.apply_journal_record(kind, path, state)
+            finally:
+                journal.replaying = False
+
+        return Result(success=True, data=computer)
+
     ##############
     # Networking #
     ##############
 
+    def get_clients(self) -> List["Computer"]:
+        """
+        Get the machines directly connected to this one (a plain `Computer` has none)
+
+        Returns:
+            list: The connected `Computer`s
+        """
+        return []
+
+    def get_world(self) -> List["Computer"]:
+        """
+        Get every machine on the network this `Computer` is part of (from the top `Router` down through every client)
+
+        Returns:
+            list: The `Computer`s (and `Router`s) of the world
+        """
+        top = self
+        while top.parent:
+            top = top.parent
+
+        world = []
+        stack = [top]
+
+        while stack:
+            machine = stack.pop()
+            world.append(machine)
+            stack.extend(machine.get_clients())
+
+        return world
+
     def resolve_dns(self, domain: str, dns_server: Optional[str] = None) -> Result:
         """
         Check all DNS servers in the /etc/resolv.conf unless a `dns_server` is specified
@@ -872,6 +1275,9 @@ def sys_read(self, filepath: str) -> Result:
         find_file = self.fs.find(filepath)
 
         if not find_file.success:
+            # A symlink loop isn't the same as a missing file
+            if find_file.message == ResultMessages.TOO_MANY_LINKS:
+                return find_file
             return Result(success=False, message=ResultMessages.NOT_FOUND)
 
         if find_file.data.is_directory():
@@ -880,10 +1286,47 @@ def sys_read(self, filepath: str) -> Result:
         try_read_file = find_file.data.read(self)
 
         if not try_read_file.success:
+            if try_read_file.message == ResultMessages.TOO_LARGE:
+                return try_read_file
             return Result(success=False, message=ResultMessages.NOT_ALLOWED_READ)
 
         return Result(success=True, data=try_read_file.data)
 
+    def sys_pread(self, filepath: str, count: int, offset: int) -> Result:
+        """
+        Read (at most) `count` bytes of the given file, starting at `offset`. Checks permissions.
+        Lets binaries stream big files (like mounted wordlists) instead of reading them all at once
+
+        Args:
+            filepath (str): The path of the file to read
+            count (int): The max amount of bytes to read
+            offset (int): The byte to start reading at
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing the bytes read
+            (empty at the end of the file)
+        """
+        if count < 0 or offset < 0:
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        find_file = self.fs.find(filepath)
+
+        if not find_file.success:
+            # A symlink loop isn't the same as a missing file
+            if find_file.message == ResultMessages.TOO_MANY_LINKS:
+                return find_file
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        if find_file.data.is_directory():
+            return Result(success=False, message=ResultMessages.IS_DIRECTORY)
+
+        try_read_file = find_file.data.pread(count, offset, self)
+
+        if not try_read_file.success:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED_READ)
+
+        return try_read_file
+
     def sys_write(self, fd: Union[str, Socket], data: Union[str, dict]) -> Result:
         """
         Try to write to a given file descriptor. If `fd` is a file path, this function will try to write to a file
@@ -920,6 +1363,9 @@ def sys_write(self, fd: Union[str, Socket], data: Union[str, dict]) -> Result:
             try_write_file = find_file.data.write(data, self)
 
             if not try_write_file.success:
+                # Out of space (disk full or over quota)
+                if try_write_file.message == ResultMessages.NO_SPACE:
+                    return try_write_file
                 return Result(success=False, message=ResultMessages.NOT_ALLOWED_WRITE)
 
             return Result(success=True)
@@ -953,6 +1399,36 @@ def sys_chown(self, pathname: str, owner: int, group: int) -> Result:
 
         return Result(success=True)
 
+    def sys_chown_tree(self, pathname: str, owner: Optional[int], group: Optional[int]) -> Result:
+        """
+        Change the owner of the given `pathname` and everything inside of it (`chown -R`).
+        The new owner/group are validated once and the tree is walked once; nodes we can't change are skipped (not fatal)
+
+        Args:
+            pathname (str): The file path of the `File`/`Directory` to start at
+            owner (int, optional): The UID of the new owner
+            group (int, optional): The GID of the new owner
+
+        Returns:
+            Result: A `Result` object with the `success` flag set if every node was changed and the `data` flag
+            containing the paths that couldn't be changed
+        """
+        if owner is None and group is None:
+            return Result(success=False, message=ResultMessages.MISSING_ARGUMENT)
+
+        if owner is not None and not self.get_user(uid=owner).success:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        if group is not None and not self.get_group(gid=group).success:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        find_file = self.fs.find(pathname)
+
+        if not find_file.success:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        return self.fs.change_tree(find_file.data, owner=owner, group=group)
+
     def sys_chdir(self, pathname: str) -> Result:
         """
         Change the `current_dir` of the current `Session`
@@ -1063,18 +1539,63 @@ def sys_getgid(self) -> int:
         Returns:
             int: (primary) GID of the `Computers`'s current user (from most recent session)
         """
-        current_uid = self.sys_getuid()
-        result = self.database.execute(
-            "SELECT group_gid FROM group_membership WHERE computer_id=? AND user_uid=? AND membership_type=?",
-            (self.id, current_uid, "primary")).fetchone()
+        return self.get_credentials().gid
+
+    def primary_gid(self, uid: int) -> int:
+        """
+        Get the primary GID of a user (from the identity cache)
+
+        Args:
+            uid (int): The UID of the user
 
-        if result:
-            return result[0]
+        Returns:
+            int: The GID (0 if the user has no primary group)
+        """
+        for gid, membership_type in self.memberships.get(uid, {}).items():
+            if membership_type == "primary":
+                return gid
         else:
             # NOTE: possible exploit, but maybe we leave it here on purpose?
             # TODO: Write proof of concept exploit to exploit this exploit
             return 0
 
+    def get_credentials(self) -> Credentials:
+        """
+        Get the `Credentials` of the current `Session`. They're looked up once and kept in the session until its UIDs
+        (setuid, seteuid, a setuid binary, etc.) or any user/group membership change
+
+        Returns:
+            Credentials: Who the current `Session` is acting as (root if there's no session)
+        """
+        if len(self.sessions) == 0:
+            return self.make_credentials(0, 0)
+
+        session = self.sessions[-1]
+        credentials = session.credentials
+
+        if credentials is None or credentials.euid != session.effective_uid or credentials.uid != session.real_uid \
+                or credentials.generation != self.identity_generation:
+            credentials = session.credentials = self.make_credentials(session.real_uid, session.effective_uid)
+
+        return credentials
+
+    def make_credentials(self, uid: int, euid: int) -> Credentials:
+        """
+        Look up the `Credentials` of a real/effective UID pair
+
+        Args:
+            uid (int): The real UID
+            euid (int): The effective UID
+
+        Returns:
+            Credentials: The credentials
+        """
+        groups = frozenset(self.memberships.get(euid, ()))
+        real_groups = groups if uid == euid else frozenset(self.memberships.get(uid, ()))
+
+        return Credentials(uid=uid, euid=euid, gid=self.primary_gid(uid), egid=self.primary_gid(euid), groups=groups,
+                           real_groups=real_groups, generation=self.identity_generation)
+
     def sys_sethostname(self, hostname: str) -> Result:
         """
         An easy function to update the hostname (also updates /etc/hostname)
@@ -1178,19 +1699,22 @@ def sys_gettimeofday(self) -> Result:
 
         return Result(success=True, data=timeval(seconds, microseconds))
 
-    def sys_stat(self, path: str) -> Result:
+    def sys_stat(self, path: str, follow_symlinks: bool = True) -> Result:
         """
         Get information about a given file
 
         Args:
             path (str): The path of the given `File`/`Directory` to get info about
+            follow_symlinks (bool): If `path` is a `Symlink`, get info about its target (otherwise about the link itself)
 
         Returns:
             Result: A `Result` object with the success flag set accordingly and the data flag containing a `stat_struct` object if successful
         """
-        find_file = self.fs.find(path)
+        find_file = self.fs.find(path, follow_symlinks)
 
         if not find_file.success:
+            if find_file.message == ResultMessages.TOO_MANY_LINKS:
+                return find_file
             return Result(success=False, message=ResultMessages.NOT_FOUND)
 
         # Do we need read permissions to stat this file?
@@ -1237,10 +1761,125 @@ def sys_stat(self, path: str) -> Result:
         ctime = 0
         path = file.pwd()
 
-        stat_result = stat_struct(is_file, mode, nlink, uid, gid, size, atime, mtime, ctime, path)
+        stat_result = stat_struct(is_file, mode, nlink, uid, gid, size, atime, mtime, ctime, path, file.is_symlink())
 
         return Result(success=True, data=stat_result)
 
+    def sys_lstat(self, path: str) -> Result:
+        """
+        Get information about a given file. If the file is a `Symlink`, get info about the link itself
+
+        Args:
+            path (str): The path of the given `File`/`Directory`/`Symlink` to get info about
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing a `stat_struct` object if successful
+        """
+        return self.sys_stat(path, follow_symlinks=False)
+
+    def sys_statfs(self, path: str) -> Result:
+        """
+        Get information about the file system that contains the given path (size, free space)
+
+        Args:
+            path (str): The path of any `File`/`Directory` in the file system
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing a `statfs_struct` object if successful
+        """
+        if not self.fs.find(path).success:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        block_size = 1024
+        total_blocks = self.fs.capacity // block_size
+        # Round up, a partially used block is still used
+        used_blocks = -(-self.fs.files.size // block_size)
+        free_blocks = max(total_blocks - used_blocks, 0)
+
+        return Result(success=True, data=statfs_struct(block_size, total_blocks, free_blocks, free_blocks))
+
+    def sys_mount_host(self, source: str, target: str) -> Result:
+        """
+        Mount a directory of the host machine (read-only) on the given empty `Directory`. Only root can do this, and
+        only for the host directories allowed by `MOUNT_ROOTS_VARIABLE`
+
+        Args:
+            source (str): The path of the directory on the host
+            target (str): The path of the `Directory` to mount it on
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly
+        """
+        if self.sys_geteuid() != 0:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+        find_target = self.fs.find(target)
+
+        if not find_target.success:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        if not find_target.data.is_directory():
+            return Result(success=False, message=ResultMessages.IS_FILE)
+
+        return self.fs.mount_host(source, find_target.data)
+
+    def sys_getmounts(self) -> Result:
+        """
+        Get every host directory that's mounted in the file system
+
+        Returns:
+            Result: A `Result` object with the data flag containing a dict of mount point -> host directory
+        """
+        return Result(success=True, data=dict(self.fs.mounts))
+
+    def sys_getusage(self, path: str) -> Result:
+        """
+        Get how many bytes each user's files use inside of the given `Directory` (or `File`).
+        Like `du`, a `Directory` has to be readable and searchable (on top of every directory on the way to it), and the
+        directories inside of it that aren't are left out of the totals, so the sizes of files we can't list aren't
+        leaked (root gets the cached totals right away, anyone else needs a walk over the directories)
+
+        Args:
+            path (str): The path of the given `File`/`Directory`
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing a dict of UID -> bytes if successful
+        """
+        find_file = self.fs.find(path)
+
+        if not find_file.success:
+            return find_file
+
+        node = find_file.data
+        credentials = self.get_credentials()
+
+        def listable(directory: Directory) -> bool:
+            return directory.has_perm("read", credentials) and directory.can_search(self, credentials)
+
+        if node.is_directory() and not listable(node):
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED_READ)
+
+        # Rendered files pass their change in size up the tree when they're rendered
+        refresh_stale_files(node)
+        usage = node.get_usage()
+
+        if credentials.euid == 0 or not node.is_directory():
+            return Result(success=True, data=usage)
+
+        stack = [node]
+        while stack:
+            for child in list(stack.pop().files.values()):
+                if not child.is_directory():
+                    continue
+
+                if listable(child):
+                    stack.append(child)
+                else:
+                    for uid, used in child.get_usage().items():
+                        usage[uid] = usage.get(uid, 0) - used
+
+        return Result(success=True, data={uid: used for uid, used in usage.items() if used})
+
     def sys_mkdir(self, pathname: str, mode: int) -> Result:
         """
         Make a directory
@@ -1270,7 +1909,7 @@ def sys_mkdir(self, pathname: str, mode: int) -> Result:
         if not find_parent.success:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        if not find_parent.data.check_perm("write", self).success:
+        if not find_parent.data.check_perm("write", self).success or find_parent.data.virtual:
             return Result(success=False, message=ResultMessages.NOT_ALLOWED_WRITE)
 
         new_dir = Directory(pathname.split("/")[-1], find_parent.data, owner=self.sys_getuid(),
@@ -1283,17 +1922,23 @@ def sys_mkdir(self, pathname: str, mode: int) -> Result:
 
         return Result(success=True, data=new_dir)
 
-    def sys_chmod(self, pathname: str, mode: int) -> Result:
+    def sys_chmod(self, pathname: str, mode: Union[int, str, ModeChange]) -> Result:
         """
         Change the permission mode of a `File`/`Directory`
 
         Args:
             pathname (str): File path of the `File`/`Directory` to change mode of
-            mode (int): Octal permissions of the given pathname
+            mode (int, str or ModeChange): Octal permissions of the given pathname, a symbolic mode (ex. "u+x,go-w"),
+            or a mode that's already parsed (see `parse_mode()`)
 
         Returns:
             Result: A `Result` instance with the `success` flag set accordingly.
         """
+        parse_result = parse_mode(mode)
+
+        if not parse_result.success:
+            return parse_result
+
         find_file = self.fs.find(pathname)
 
         if not find_file.success:
@@ -1304,29 +1949,37 @@ def sys_chmod(self, pathname: str, mode: int) -> Result:
         if self.sys_getuid() not in [find_file.data.owner, 0]:
             return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
-        raw_mode = str(bin(mode)).replace("0b", "")
-        raw_mode = "0" * (9 - len(raw_mode)) + raw_mode
+        file = find_file.data
+        file.permissions = mode_to_permissions(parse_result.data.apply(permissions_to_mode(file.permissions),
+                                                                       file.is_directory()))
+        file.handle_event("change_perm")
+        return Result(success=True)
+
+    def sys_chmod_tree(self, pathname: str, mode: Union[int, str, ModeChange]) -> Result:
+        """
+        Change the permission mode of a `File`/`Directory` and everything inside of it (`chmod -R`).
+        The mode is parsed once and the tree is walked once; nodes we don't own are skipped (not fatal)
 
-        chmod_bits = []
-        for x in range(0, len(raw_mode), 3):
-            chmod_bits.append(raw_mode[x: x + 3])
+        Args:
+            pathname (str): File path of the `File`/`Directory` to start at
+            mode (int, str or ModeChange): Octal permissions, a symbolic mode (ex. "u+x,go-w"), or a mode that's already
+            parsed (see `parse_mode()`)
 
-        perms = {"read": [], "write": [], "execute": []}
+        Returns:
+            Result: A `Result` instance with the `success` flag set if every node was changed and the `data` flag
+            containing the paths that couldn't be changed
+        """
+        parse_result = parse_mode(mode)
 
-        for x in range(3):
-            bits = chmod_bits[x]
-            scope = ["owner", "group", "public"][x]
+        if not parse_result.success:
+            return parse_result
 
-            for y in range(3):
-                bit = bits[y]
-                perm_scope = ["read", "write", "execute"][y]
+        find_file = self.fs.find(pathname)
 
-                if bit == "1":
-                    perms[perm_scope].append(scope)
+        if not find_file.success:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        find_file.data.permissions = perms
-        find_file.data.handle_event("change_perm")
-        return Result(success=True)
+        return self.fs.change_tree(find_file.data, mode=parse_result.data)
 
     def sys_creat(self, pathname: str, mode: int) -> Result:
         """
@@ -1358,8 +2011,8 @@ def sys_creat(self, pathname: str, mode: int) -> Result:
         if not find_parent.success:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        # We need write permissions on the parent
-        if not find_parent.data.check_perm("write", self).success:
+        # We need write permissions on the parent (nobody can add to generated directories like /proc)
+        if not find_parent.data.check_perm("write", self).success or find_parent.data.virtual:
             return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
         File(pathname.split("/")[-1], "", find_parent.data, self.sys_getuid(), self.sys_getgid())
@@ -1367,6 +2020,155 @@ def sys_creat(self, pathname: str, mode: int) -> Result:
 
         return Result(success=True)
 
+    def sys_symlink(self, target: str, linkpath: str) -> Result:
+        """
+        Make a symbolic link called `linkpath` that points to `target` (the target doesn't need to exist)
+
+        Args:
+            target (str): The path the new link should point to
+            linkpath (str): The path of the new link
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly
+        """
+        if self.fs.find(linkpath, follow_symlinks=False).success:
+            return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
+
+        if "/" not in linkpath:
+            linkpath = "./" + linkpath
+
+        find_parent = self.fs.find("/".join(linkpath.split("/")[:-1]) or "/")
+
+        if not find_parent.success or find_parent.data.is_file():
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        # We need write permissions on the parent
+        if not find_parent.data.check_perm("write", self).success:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+        Symlink(linkpath.split("/")[-1], target, find_parent.data, self.sys_getuid(), self.sys_getgid())
+
+        return Result(success=True)
+
+    def sys_readlink(self, pathname: str) -> Result:
+        """
+        Get the path a symbolic link points to
+
+        Args:
+            pathname (str): The path of the `Symlink`
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing the target path
+        """
+        find_link = self.fs.find(pathname, follow_symlinks=False)
+
+        if not find_link.success:
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        if not find_link.data.is_symlink():
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        return Result(success=True, data=find_link.data.target)
+
+    def sys_inotify_init(self) -> Result:
+        """
+        Create a new inotify instance
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing the file descriptor of the instance
+        """
+        # 0-2 are stdin/stdout/stderr
+        fd = max(self.inotify_instances, default=2) + 1
+        self.inotify_instances[fd] = Inotify()
+
+        return Result(success=True, data=fd)
+
+    def sys_inotify_add_watch(self, fd: int, pathname: str, mask: int) -> Result:
+        """
+        Start watching a `File`/`Directory` for the events in `mask`. Watching the same item twice replaces its mask
+
+        Args:
+            fd (int): The file descriptor of the inotify instance
+            pathname (str): The path of the `File`/`Directory` to watch
+            mask (int): The `InotifyMask` bits to watch for
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing the watch descriptor
+        """
+        instance = self.inotify_instances.get(fd)
+
+        if instance is None:
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        if not mask & InotifyMask.IN_ALL_EVENTS:
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        find_node = self.fs.find(pathname)
+
+        if not find_node.success:
+            return find_node
+
+        # Same as Linux, we need read permission to watch something
+        if not find_node.data.check_perm("read", self).success:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED_READ)
+
+        return Result(success=True, data=instance.add_watch(find_node.data, mask))
+
+    def sys_inotify_rm_watch(self, fd: int, wd: int) -> Result:
+        """
+        Stop watching the `File`/`Directory` of the given watch descriptor (queues an `IN_IGNORED` event)
+
+        Args:
+            fd (int): The file descriptor of the inotify instance
+            wd (int): The watch descriptor returned by `sys_inotify_add_watch`
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly
+        """
+        instance = self.inotify_instances.get(fd)
+
+        if instance is None or not instance.remove_watch(wd):
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        return Result(success=True)
+
+    def sys_inotify_read(self, fd: int, timeout: Optional[float] = 0) -> Result:
+        """
+        Read every event queued on an inotify instance, waiting up to `timeout` seconds for one if none are queued
+
+        Args:
+            fd (int): The file descriptor of the inotify instance
+            timeout (float, optional): How long to wait in seconds. `0` doesn't wait, `None` waits forever
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly and the data flag containing a list of `inotify_event` objects
+        """
+        instance = self.inotify_instances.get(fd)
+
+        if instance is None:
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        return Result(success=True, data=instance.read(timeout))
+
+    def sys_close(self, fd: int) -> Result:
+        """
+        Close a file descriptor (only inotify instances use file descriptors)
+
+        Args:
+            fd (int): The file descriptor to close
+
+        Returns:
+            Result: A `Result` object with the success flag set accordingly
+        """
+        instance = self.inotify_instances.pop(fd, None)
+
+        if instance is None:
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        instance.close()
+
+        return Result(success=True)
+
     def sys_rename(self, oldpath: str, newpath: str) -> Result:
         """
         Rename or move a file or directory
@@ -1378,7 +2180,8 @@ def sys_rename(self, oldpath: str, newpath: str) -> Result:
         Returns:
             Result: A `Result` object with the success flag set accordingly
         """
-        find_old = self.fs.find(oldpath)
+        # Renaming a link renames the link, not its target
+        find_old = self.fs.find(oldpath, follow_symlinks=False)
 
         if not find_old.success:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
@@ -1386,18 +2189,41 @@ def sys_rename(self, oldpath: str, newpath: str) -> Result:
         if not find_old.data.check_owner(self).success or self.sys_getuid() != 0:
             return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
-        copy_result = copy(self, oldpath, newpath)
+        to_move = find_old.data
 
-        if not copy_result.success:
-            return copy_result
+        # If the path is in the local dir
+        if "/" not in newpath:
+            newpath = "./" + newpath
 
-        # Rename means move, so delete the original
-        delete_result = self.fs.find(oldpath).data.delete(self)
+        find_new = self.fs.find(newpath)
 
-        if not delete_result.success:
-            return delete_result
+        if find_new.success and find_new.data.is_directory():
+            # Moving into an existing directory (keep the name)
+            new_parent = find_new.data
+            new_name = to_move.name
+        else:
+            # Moving to a new name (or over an existing file)
+            find_new_parent = self.fs.find("/".join(newpath.split("/")[:-1]) or "/")
 
-        return Result(success=True)
+            if not find_new_parent.success or find_new_parent.data.is_file():
+                return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+            new_parent = find_new_parent.data
+            new_name = newpath.split("/")[-1]
+
+            if find_new.success:
+                if to_move.is_directory():
+                    return Result(success=False, message=ResultMessages.IS_FILE)
+
+                if find_new.data is not to_move:
+                    # Overwrite the existing file
+                    delete_result = find_new.data.delete(self)
+
+                    if not delete_result.success:
+                        return delete_result
+
+        # Nothing is copied, the `File`/`Directory` (and everything inside of it) is just re-linked
+        return to_move.move(new_parent, new_name)
 
     def sys_exit(self, force=False) -> None:
         """
@@ -1472,12 +2298,12 @@ def sys_rmdir(self, pathname: str) -> Result:
         Returns:
             Result: A `Result` object with the success flag set accordingly
         """
-        find_result = self.fs.find(pathname)
+        find_result = self.fs.find(pathname, follow_symlinks=False)
 
         if not find_result.success:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        if find_result.data.is_file():
+        if not find_result.data.is_directory():
             return Result(success=False, message=ResultMessages.IS_FILE)
 
         if len(find_result.data.files) > 0:
@@ -1535,12 +2361,15 @@ def sys_unlink(self, pathname: str) -> Result:
             Result: A `Result` arguments containing the output from the binary
 
         """
-        find_result = self.fs.find(pathname)
+        # Unlinking a symlink removes the link, not its target
+        find_result = self.fs.find(pathname, follow_symlinks=False)
 
         if not find_result.success:
             return Result(success=False, message=ResultMessages.NOT_FOUND)
 
-        if not find_result.data.check_perm("write", self) or not find_result.data.check_perm("execute", self):
+        # Links are rwxrwxrwx, `delete()` checks their directory instead
+        if not find_result.data.is_symlink() and (not find_result.data.check_perm("write", self) or
+                                                  not find_result.data.check_perm("execute", self)):
             return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
         delete_result = find_result.data.delete(self)
@@ -1552,18 +2381,24 @@ def sys_unlink(self, pathname: str) -> Result:
 
 
 class Router(Computer):
-    def __init__(self) -> None:
+    def __init__(self, database: Optional[Database] = None) -> None:
         """
         This special type of `Computer` is made for handling network traffic between computers in a LAN
         This class represents what a real router would be in real life
+
+        Args:
+            database (Database, optional): The world's identity database (defaults to the shared blackhat.db)
         """
-        super().__init__()
+        super().__init__(database)
         self.clients = {}  # Format of clients: sorted by subnet then ID [1][2] (subnet 1 - ID 2)
         self.ip_pool: dict[int, list[str]] = {}
         self.wan = None
         self.lan = "192.168.1.1"
         self.port_forwarding = {}
 
+    def unjournaled_state(self) -> tuple:
+        return super().unjournaled_state() + (dict(self.port_forwarding),)
+
     def dhcp(self, subnet: int) -> Result:
         """
         Distributes IP addresses to clients on the network
@@ -1629,6 +2464,15 @@ def find_client(self, host: str, port: int) -> Result:
         # We need to get the client from another lan, ask the ISP to handle it
         return self.parent.find_client(host, port)
 
+    def get_clients(self) -> List[Computer]:
+        """
+        Get the machines in this `Router`'s LAN (every subnet)
+
+        Returns:
+            list: The connected `Computer`s
+        """
+        return [client for subnet in self.clients.values() for client in subnet.values()]
+
     def add_new_client(self, client: Computer, subnet: int = 1) -> Result:
         """
         Connect a given `Computer` to the given `Router`'s LAN.
@@ -1671,11 +2515,14 @@ def add_new_client(self, client: Computer, subnet: int = 1) -> Result:
 
 
 class ISPRouter(Router):
-    def __init__(self):
+    def __init__(self, database: Optional[Database] = None):
         """
         An ISP router is just a router of routers
+
+        Args:
+            database (Database, optional): The world's identity database (defaults to the shared blackhat.db)
         """
-        super().__init__()
+        super().__init__(database)
         self.wan = "1.1.1.1"
         self.used_ips = ["1.1.1.1"]
 
@@ -1692,6 +2539,15 @@ def dhcp(self, **kwargs) -> Result:
                 self.used_ips.append(ip)
                 return Result(success=True, data=ip)
 
+    def get_clients(self) -> List[Router]:
+        """
+        Get the `Router`s connected to this `ISPRouter`
+
+        Returns:
+            list: The connected `Router`s
+        """
+        return list(self.clients.values())
+
     def add_new_client(self, client: Router, **kwargs) -> Result:
         """
         Connect a given `Computer` to the given `ISPRouter`
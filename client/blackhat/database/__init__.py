@@ -0,0 +1,231 @@
+import os
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from threading import RLock, local
+from typing import Dict, Iterable, List
+
+CACHED_STATEMENTS = 256
+"""int: How many prepared statements the connection keeps (every query the `Computer`s run fits)"""
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "init_tables.sql")
+"""str: The tables and indexes (found next to this module, so it doesn't matter where the game is started from)"""
+MEMORY = ":memory:"
+"""str: The path of a database that only lives in memory (saves hold the identities anyway, see `Computer.save()`)"""
+IDENTITY_TABLES = ["blackhat_user", "blackhat_group", "group_membership"]
+"""list: The tables with rows that belong to a `Computer` (by `computer_id`)"""
+
+
+class _TransactionState(local):
+    def __init__(self) -> None:
+        # Every thread has its own transactions (the connection itself is only used by one of them at a time)
+        self.participants: List[Dict[int, "Computer"]] = []
+        """list: For every open `transaction()` (outermost first), id() -> the `Computer`s that changed something in
+        it"""
+
+
+class Database:
+    def __init__(self, path: str = "blackhat.db") -> None:
+        """
+        The identity database (users, groups and group memberships) shared by every `Computer` in a world.
+        One connection is opened, put in WAL mode and given the schema once, no matter how many `Computer`s (and
+        `Router`s) use it. The connection keeps its prepared statements, so every `Computer` reuses the same ones.
+        With a path of `MEMORY` (":memory:"), nothing is ever written to disk (saves include the identity cache of every
+        `Computer`, which is written back after loading). Use `get_database()` to share one database between every
+        `Computer` of the process
+
+        Args:
+            path (str): The path of the SQLite database (or ":memory:")
+        """
+        self.path: str = path
+        # Shared by every thread (the same way the file system is)
+        self.connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False,
+                                                              cached_statements=CACHED_STATEMENTS)
+        if path != MEMORY:
+            # Readers never block the writer, and commits don't wait for the disk (a crash can only lose the last
+            # commits)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        with open(SCHEMA_PATH) as init_tables_file:
+            self.connection.executescript(init_tables_file.read())
+
+        self.lock: RLock = RLock()
+        """RLock: Held by the thread with an open transaction, so another thread's changes can't end up in it (or
+        commit it halfway through)"""
+        self._state: _TransactionState = _TransactionState()
+
+    @property
+    def participants(self) -> List[Dict[int, "Computer"]]:
+        """list: For every `transaction()` the current thread has open (outermost first), id() -> the `Computer`s that
+        changed something in it"""
+        return self._state.participants
+
+    @property
+    def transaction_depth(self) -> int:
+        """int: How many `transaction()`s the current thread is inside of (changes are only committed when it's 0)"""
+        return len(self._state.participants)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager that groups identity changes (of any amount of `Computer`s) into one transaction: nothing is
+        committed (and no /etc/passwd, etc. is synced) until the outermost block exits. If a block raises, the changes
+        made inside of it are rolled back (a nested block is a savepoint, so only its own changes are), every
+        `Computer` that changed something in it reloads its identity cache, and the exception is re-raised.
+        Transactions of different threads run one after the other
+        """
+        depth = self.transaction_depth
+
+        if not depth:
+            self.lock.acquire()
+
+        try:
+            if depth:
+                self.connection.execute(f"SAVEPOINT level_{depth}")
+            elif not self.connection.in_transaction:
+                # Savepoints need a transaction around them, or releasing the first one would commit it
+                self.connection.execute("BEGIN")
+
+            self.participants.append({})
+
+            try:
+                yield
+            except BaseException:
+                participants = self.participants.pop()
+
+                if depth:
+                    self.connection.execute(f"ROLLBACK TO level_{depth}")
+                    self.connection.execute(f"RELEASE level_{depth}")
+                    # Whatever they changed before the savepoint is still part of the outer transaction
+                    self.participants[-1].update(participants)
+                else:
+                    self.connection.rollback()
+
+                # Their caches were changed in place, the database has the state from before the block
+                for computer in participants.values():
+                    computer.load_identities()
+                raise
+
+            participants = self.participants.pop()
+
+            if depth:
+                self.connection.execute(f"RELEASE level_{depth}")
+                self.participants[-1].update(participants)
+            else:
+                self.connection.commit()
+                for computer in participants.values():
+                    computer.sync_user_and_group_files()
+        finally:
+            if not depth:
+                self.lock.release()
+
+    def write(self):
+        """
+        Context manager for a single change to the identity tables (ex. adding a user): it's a `transaction()` of its
+        own, or simply part of the current thread's transaction if there's one (without the cost of a savepoint)
+        """
+        if self.transaction_depth:
+            return nullcontext()
+
+        return self.transaction()
+
+    def commit(self, computer: "Computer") -> None:
+        """
+        Commit the identity changes a `Computer` made (and sync its /etc/passwd, etc.).
+        Inside a `transaction()`, this waits until the transaction ends
+
+        Args:
+            computer (Computer): The `Computer` that changed something
+
+        Returns:
+            None
+        """
+        if self.transaction_depth:
+            self.participants[-1][id(computer)] = computer
+            return
+
+        with self.lock:
+            self.connection.commit()
+        computer.sync_user_and_group_files()
+
+    def delete_computers(self, computer_ids: Iterable[str]) -> None:
+        """
+        Delete every row (users, groups, group memberships and the computer itself) of the given `Computer`s, in one
+        transaction. Their identity caches aren't touched (see `Computer.unregister()`)
+
+        Args:
+            computer_ids (iterable): The IDs of the `Computer`s
+
+        Returns:
+            None
+        """
+        rows = [(computer_id,) for computer_id in computer_ids]
+
+        with self.transaction():
+            for table in IDENTITY_TABLES:
+                self.connection.executemany(f"DELETE FROM {table} WHERE computer_id=?", rows)
+            self.connection.executemany("DELETE FROM computer WHERE id=?", rows)
+
+    def collect_garbage(self, keep: Iterable[str]) -> int:
+        """
+        Delete the rows of every `Computer` that isn't in the given list (ex. the ones left behind by worlds that were
+        never saved, or by old test runs)
+
+        Args:
+            keep (iterable): The IDs of the `Computer`s to keep (every machine in the current save)
+
+        Returns:
+            int: How many `Computer`s were deleted
+        """
+        queries = ["SELECT id FROM computer"] + [f"SELECT computer_id FROM {table}" for table in IDENTITY_TABLES]
+        stored = {row[0] for row in self.connection.execute(" UNION ".join(queries))}
+        orphans = stored - set(keep)
+
+        self.delete_computers(orphans)
+
+        return len(orphans)
+
+    def optimize(self) -> bool:
+        """
+        Refresh the query planner's statistics (`ANALYZE`) and rebuild the file without the space left behind by deleted
+        rows (`VACUUM`). This rewrites the whole database, so it's meant for maintenance (see `collect_garbage()`)
+
+        Returns:
+            bool: `True` if the database was optimized, `False` if it failed (or a transaction is still open)
+        """
+        if self.transaction_depth:
+            return False
+
+        try:
+            # Waits for the transactions of other threads
+            with self.lock:
+                self.connection.commit()
+                self.connection.execute("ANALYZE")
+                self.connection.execute("VACUUM")
+                if self.path != MEMORY:
+                    # The rebuilt pages are in the WAL until they're checkpointed, the file only shrinks after that
+                    self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error:
+            return False
+
+        return True
+
+
+_databases: Dict[str, Database] = {}
+"""dict: Path -> the open `Database` (so each database is only opened and set up once per process)"""
+
+
+def get_database(path: str = "blackhat.db") -> Database:
+    """
+    Get the shared `Database` at the given path, opening it the first time. Every call with ":memory:" gets the same
+    in-memory database (make a `Database` directly for a separate one)
+
+    Args:
+        path (str): The path of the SQLite database (or ":memory:")
+
+    Returns:
+        Database: The shared handle
+    """
+    if path not in _databases:
+        _databases[path] = Database(path)
+
+    return _databases[path]
@@ -32,4 +32,19 @@ create TABLE IF NOT EXISTS blackhat_user
     home_phone  text,
     other       text,
     computer_id text
-);
\ No newline at end of file
+);
+
+-- Every lookup is scoped to one computer, so computer_id leads every index
+create INDEX IF NOT EXISTS computer_id_index ON computer (id);
+
+create INDEX IF NOT EXISTS blackhat_user_uid_index ON blackhat_user (computer_id, uid);
+
+create INDEX IF NOT EXISTS blackhat_user_username_index ON blackhat_user (computer_id, username);
+
+create INDEX IF NOT EXISTS blackhat_group_gid_index ON blackhat_group (computer_id, gid);
+
+create INDEX IF NOT EXISTS blackhat_group_name_index ON blackhat_group (computer_id, name);
+
+create INDEX IF NOT EXISTS group_membership_user_index ON group_membership (computer_id, user_uid, group_gid);
+
+create INDEX IF NOT EXISTS group_membership_group_index ON group_membership (computer_id, group_gid);
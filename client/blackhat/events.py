@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+from threading import Lock, local
+from typing import Callable, Dict, List, Literal, Optional, Tuple
+
+from .helpers import Result
+
+event_types = Literal["read", "write", "create", "move", "change_perm", "change_owner", "delete"]
+event_times = Literal["before", "after"]
+
+
+class _BatchState(local):
+    def __init__(self) -> None:
+        # Every thread (session, background job) has its own batch, so one command never delivers another's events
+        self.depth: int = 0
+        """int: How many `event_batch()` blocks we're currently inside (nested commands open nested batches)"""
+        self.pending: Dict[Tuple[int, int], Tuple["EventListener", object]] = {}
+        """dict: Coalesced deliveries waiting for the outermost batch to close, keyed by (listener, node) so repeats
+        are dropped"""
+
+
+_batch = _BatchState()
+# Held while any listener list is changed (binding is rare, so one lock for every `EventBus` is plenty)
+_subscribe_lock = Lock()
+
+
+class EventListener:
+    def __init__(self, function: Callable, when: event_times = "after", coalesce: bool = False,
+                 recursive: bool = False) -> None:
+        """
+        A single function bound to an event of a `FSBaseObject`
+
+        Args:
+            function (Callable): The function/method to call when the event fires (receives the `FSBaseObject`)
+            when (str): If the function should run before or after the action that fired the event
+            coalesce (bool): If `True`, the function only runs once (at the end of the current command) no matter how
+            many times the event fires during the command
+            recursive (bool): If `True` (and bound to a `Directory`), the function also runs when the event fires on
+            anything inside the `Directory` (it receives the `FSBaseObject` that fired the event)
+        """
+        self.function: Callable = function
+        self.when: event_times = when
+        self.coalesce: bool = coalesce
+        self.recursive: bool = recursive
+
+
+class EventBus:
+    def __init__(self) -> None:
+        """
+        The list of `EventListener`s bound to a `FSBaseObject`.
+        Any amount of listeners can be bound to the same event, they run in the order they were added.
+        """
+        self.listeners: Dict[event_types, List[EventListener]] = {}
+        self.recursive: int = 0
+        """int: The amount of recursive listeners bound (lets descendants skip us when there are none)"""
+
+    def subscribe(self, event: event_types, function: Callable, when: event_times = "after",
+                  coalesce: bool = False, recursive: bool = False) -> Result:
+        """
+        Bind a function to the given `event`
+
+        Args:
+            event (str): The event type to bind the function to
+            function (Callable): The function/method to call when the event fires
+            when (str): If the function should run before or after the action that fired the event
+            coalesce (bool): If the function should only run once per command
+            recursive (bool): If the function should also run for events fired by descendants
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly.
+        """
+        with _subscribe_lock:
+            # Replace the list instead of appending to it, so `publish()` never sees a list that's being changed
+            self.listeners[event] = self.listeners.get(event, []) + [EventListener(function, when, coalesce, recursive)]
+            if recursive:
+                self.recursive += 1
+        return Result(success=True)
+
+    def unsubscribe(self, event: event_types, function: Optional[Callable] = None) -> Result:
+        """
+        Unbind a function from the given `event`
+
+        Args:
+            event (str): The event type to unbind from
+            function (Callable, optional): The function to unbind. If not given, every function bound to `event` is removed
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly.
+        """
+        with _subscribe_lock:
+            if function is None:
+                removed = self.listeners.pop(event, [])
+            else:
+                removed = [x for x in self.listeners.get(event, []) if x.function == function]
+                if removed:
+                    self.listeners[event] = [x for x in self.listeners[event] if x.function != function]
+
+            self.recursive -= len([x for x in removed if x.recursive])
+
+        return Result(success=True)
+
+    def publish(self, node, event: event_types, when: event_times = "after", recursive_only: bool = False) -> None:
+        """
+        Run (or queue, if coalesced and a batch is open) every listener bound to the given `event` and `when`
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that fired the event
+            event (str): The event type that fired
+            when (str): If the event fired before or after the action
+            recursive_only (bool): Only run the recursive listeners (used when `node` is a descendant of our owner)
+
+        Returns:
+            None
+        """
+        listeners = self.listeners.get(event)
+
+        if not listeners:
+            return
+
+        # Lists are replaced (never changed) when functions are (un)bound, so this is safe to loop over
+        for listener in listeners:
+            if listener.when != when or (recursive_only and not listener.recursive):
+                continue
+
+            if listener.coalesce and _batch.depth > 0:
+                _batch.pending.setdefault((id(listener), id(node)), (listener, node))
+            else:
+                listener.function(node)
+
+
+def begin_batch() -> None:
+    """
+    Start collecting coalesced events instead of delivering them right away
+
+    Returns:
+        None
+    """
+    _batch.depth += 1
+
+
+def end_batch() -> None:
+    """
+    Close the current batch. If it was the outermost batch, every queued (coalesced) listener runs once
+
+    Returns:
+        None
+    """
+    _batch.depth -= 1
+
+    if _batch.depth == 0:
+        # Listeners can fire new events while we flush, so keep going until nothing is left
+        while _batch.pending:
+            key = next(iter(_batch.pending))
+            listener, node = _batch.pending.pop(key)
+            listener.function(node)
+
+
+@contextmanager
+def event_batch():
+    """
+    Context manager that delivers coalesced events once, when the (outermost) block exits.
+    Used to make heavy listeners run once per command instead of once per change.
+    """
+    begin_batch()
+    try:
+        yield
+    finally:
+        end_batch()
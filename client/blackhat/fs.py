@@ -2,18 +2,108 @@
 import importlib
 import os
 import sys
+from contextlib import nullcontext
+from itertools import count
 from random import choice
 from string import ascii_uppercase, digits
-from typing import Optional, Dict, List, Literal, Union, Callable
+from threading import Lock, RLock
+from typing import Optional, Dict, List, Literal, Union, Callable, Tuple
+from weakref import WeakSet
 
 from colorama import Style
 
+from .blobstore import blob_store
+from .events import EventBus, event_types, event_times
 from .helpers import Result, ResultMessages
+from .indexing import ContentIndex, PathIndex, MAX_CONTENT_ENTRIES
+from .journal import Journal
+from .locking import RWLock, write_both
+from .modes import ModeChange, mode_to_permissions, permissions_to_mode
+from . import procfs
+from .session import Credentials
+
+MAX_SYMLINK_DEPTH = 40
+"""int: The most symbolic links that can be followed while resolving a single path (same as Linux)"""
+HOST_READ_LIMIT = 16 * 1024 ** 2
+"""int: The biggest host file that can be read all at once (bigger ones have to be read in ranges, see `pread`)"""
+MOUNT_ROOTS_VARIABLE = "BLACKHAT_MOUNT_ROOTS"
+"""str: The environment variable with the host directories (separated by `os.pathsep`) that can be mounted, along with
+everything inside of them. Nothing can be mounted if it isn't set"""
+NODE_ATTRIBUTES = ["owner", "group_owner", "permissions", "setuid"]
+"""list: The metadata of a `File`/`Directory` that's recorded in a `Journal` (restored through the property setters)"""
+
+# Hands out the generations of `Directory`s (see `bump_namespace_generation()`). `next()` on a count is atomic, so
+# concurrent bumps never hand out the same generation
+_namespace_generations = count(1)
+# Bumped (before any path is forgotten) whenever a `File`/`Directory` is renamed or moved, see `FSBaseObject.pwd()`
+path_generation: int = 0
+_path_generations = count(1)
+
+usage_lock: RLock = RLock()
+"""RLock: Held while sizes are passed up the tree, so concurrent size changes can't lose updates"""
+rename_lock: RLock = RLock()
+"""RLock: Held while a `File`/`Directory` moves to another `Directory`, so two moves can't make a loop in the tree"""
+render_lock: RLock = RLock()
+"""RLock: Held while a stale `RenderedFile` renders, so two readers don't both render it"""
+content_lock: RLock = RLock()
+"""RLock: Held while the content of a `File` changes, so two appends can't lose each other's data (reads don't need it,
+the content is swapped in one go)"""
+events_lock: Lock = Lock()
+"""Lock: Held while the `EventBus` of a `File`/`Directory` is made, so two threads can't both make one"""
+stale_files: "WeakSet[RenderedFile]" = WeakSet()
+"""WeakSet: The `RenderedFile`s that were invalidated but not rendered yet (their size is out of date). Guarded by
+`render_lock`"""
+
+
+def refresh_stale_files(node: "FSBaseObject") -> None:
+    """
+    Render every stale `RenderedFile` inside of `node`, so its size is up to date.
+    Call it before reading the size of a `Directory` (never while holding `usage_lock`)
+
+    Args:
+        node (FSBaseObject): The `Directory` (or `File`) whose size is needed
+
+    Returns:
+        None
+    """
+    with render_lock:
+        files = list(stale_files)
+
+    for file in files:
+        # Deleted files don't count towards any size
+        current = file
+        while current is not node:
+            parent = current.parent
+            if parent is None or parent.files.get(current.name) is not current:
+                break
+            current = parent
+
+        if current is node:
+            file.refresh()
 
-event_types = Literal["read", "write", "move", "change_perm", "change_owner", "delete"]
+
+def bump_namespace_generation(*nodes: "FSBaseObject") -> None:
+    """
+    Give the given `Directory`s a new generation (after their entries, permissions or owners changed, or they moved).
+    Memoized symlink resolutions remember the generation of every `Directory` they looked a name up in (or went up
+    from), so only the ones that went through a changed `Directory` are invalidated. Anything that isn't a `Directory`
+    is skipped
+
+    Args:
+        nodes (FSBaseObject): The `File`s/`Directory`s that changed
+
+    Returns:
+        None
+    """
+    for node in nodes:
+        if node.is_directory():
+            node.generation = next(_namespace_generations)
 
 
 class FSBaseObject:
+    virtual: bool = False
+    """bool: If the node is generated by the system (/proc) instead of stored: it can't be changed and isn't saved"""
+
     def __init__(self, name: str, parent: Optional["Directory"], owner: int, group_owner: int) -> None:
         """
         The base object that contains info shared between `Directories` and `Files`
@@ -24,7 +114,13 @@ def __init__(self, name: str, parent: Optional["Directory"], owner: int, group_o
             owner (int): The UID of the owner of the `File`/`Directory`
             group_owner (int): The GID of the owner of the `File`/`Directory`
         """
-        self.name: str = name
+        self._path: Optional[str] = None
+        """str: The memoized result of `pwd()` (`None` until it's needed, or after a rename/move)"""
+        self._search_cache: Dict[int, bool] = {}
+        """dict: EUID -> if that user can search (traverse) this `Directory`. Cleared on chmod/chown"""
+        self._search_generation: int = -1
+        """int: The `Computer.identity_generation` the search cache was filled at (group changes invalidate it)"""
+        self._name: str = name
         self.permissions: Dict[str, List[Literal["read", "write", "execute"]]] = {"read": ["owner", "group", "public"],
                                                                                   "write": ["owner"],
                                                                                   "execute": []}
@@ -40,18 +136,107 @@ def __init__(self, name: str, parent: Optional["Directory"], owner: int, group_o
         """
         self.setuid = False
         """Permissions for accessing the file. Default permissions; rw-r--r-- (644)"""
-        self.parent: Optional["Directory"] = parent
-        self.owner: int = owner
-        self.group_owner: int = group_owner
+        self._parent: Optional["Directory"] = parent
+        self._owner: int = owner
+        self._group_owner: int = group_owner
         self.link_count: int
-        self.size: int  # Size in bytes
+        self._size: int = 0  # Size in bytes
         self.atime: int  # Last access time (unix time stamp)
         """int: Access time; when file was last read from/accessed"""
         self.mtime: int  # Last modified time (unix time stamp)
         """int: Modified time; when the file"s content was last modified"""
         self.ctime: int  # Last file status change (unix time stamp)
         """int: Changed time; when the file"s metadata was last changed (ex. perms)"""
-        self.events: Dict[event_types, Callable] = {}
+        self._events: Optional[EventBus] = None
+        """EventBus: The listeners bound to us (`None` until the first one is, most nodes never get any)"""
+
+    def __getstate__(self) -> dict:
+        return self.__dict__.copy()
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+
+    @property
+    def events(self) -> EventBus:
+        """EventBus: The listeners bound to us (made the first time it's needed)"""
+        if self._events is None:
+            with events_lock:
+                if self._events is None:
+                    self._events = EventBus()
+        return self._events
+
+    @property
+    def name(self) -> str:
+        """str: The name of the `File`/`Directory`"""
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self._name = name
+        self.invalidate_path()
+
+    @property
+    def parent(self) -> Optional["Directory"]:
+        """Directory: The `Directory` one level up the tree"""
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional["Directory"]) -> None:
+        self._parent = parent
+        self.invalidate_path()
+
+    @property
+    def permissions(self) -> Dict[str, List[Literal["read", "write", "execute"]]]:
+        """dict: Permission type -> the scopes ("owner", "group", "public") that have it"""
+        return self._permissions
+
+    @permissions.setter
+    def permissions(self, permissions: Dict[str, List[Literal["read", "write", "execute"]]]) -> None:
+        self._permissions = permissions
+        self._search_cache.clear()
+        bump_namespace_generation(self)
+
+    @property
+    def group_owner(self) -> int:
+        """int: The GID of the owner of the `File`/`Directory`"""
+        return self._group_owner
+
+    @group_owner.setter
+    def group_owner(self, gid: int) -> None:
+        self._group_owner = gid
+        self._search_cache.clear()
+        bump_namespace_generation(self)
+
+    @property
+    def owner(self) -> int:
+        """int: The UID of the owner of the `File`/`Directory`"""
+        return self._owner
+
+    @owner.setter
+    def owner(self, uid: int) -> None:
+        # The bytes of a file count towards its owner's usage, so move them to the new owner in every parent directory
+        old_owner = self._owner
+        self._owner = uid
+        self._search_cache.clear()
+        bump_namespace_generation(self)
+
+        if old_owner != uid and self.parent and self.is_file() and self._size:
+            with usage_lock:
+                self.parent.apply_usage({old_owner: -self._size, uid: self._size})
+
+    @property
+    def size(self) -> int:
+        """int: The size of the `File` (or every `File` inside of the `Directory`) in bytes"""
+        return self._size
+
+    def get_usage(self) -> Dict[int, int]:
+        """
+        Get how many bytes each user owns in this `File`/`Directory`
+
+        Returns:
+            dict: UID -> bytes
+        """
+        return {self._owner: self._size} if self._size else {}
 
     def is_directory(self) -> bool:
         """
@@ -60,7 +245,7 @@ def is_directory(self) -> bool:
         Returns:
             bool: `True` if the given item is a `Directory` otherwise `False`
         """
-        return type(self) == Directory
+        return isinstance(self, Directory)
 
     def is_file(self) -> bool:
         """
@@ -69,37 +254,92 @@ def is_file(self) -> bool:
         Returns:
             bool: `True` if the given item is a `File` otherwise `False`
         """
-        return type(self) == File
+        return isinstance(self, File)
 
-    def check_perm(self, perm: Literal["read", "write", "execute"], computer) -> Result:
+    def is_symlink(self) -> bool:
         """
-        Checks if the current user has the given `perm`
+        Determines if a given item is a `Symlink`
+
+        Returns:
+            bool: `True` if the given item is a `Symlink` otherwise `False`
+        """
+        return type(self) == Symlink
+
+    def has_perm(self, perm: Literal["read", "write", "execute"], credentials: Credentials) -> bool:
+        """
+        Checks if the given `Credentials` have the given `perm` (nothing is looked up or allocated, use this when checking
+        a lot of files)
 
         Args:
             perm (str): The permission to check ("read", "write", "execute")
-            computer: The current `Computer` instance
+            credentials (Credentials): Who to check for
 
         Returns:
-            Result: A `Result` object with the `success` flag set accordingly
+            bool: If the permission is granted
         """
         # If we"re root (UID 0), return True because root has all permissions
-        if computer.sys_geteuid() == 0:
-            return Result(success=True)
+        if credentials.euid == 0:
+            return True
+
+        scopes = self.permissions[perm]
+
         # If "public", don"t bother checking anything else
-        if "public" in self.permissions[perm]:
-            return Result(success=True)
+        return "public" in scopes or ("group" in scopes and self.group_owner in credentials.groups) or \
+            ("owner" in scopes and self.owner == credentials.euid)
 
-        if "group" in self.permissions[perm]:
-            if self.group_owner in computer.get_user_groups(computer.sys_geteuid()).data:
-                return Result(success=True)
+    def check_perm(self, perm: Literal["read", "write", "execute"], computer,
+                   credentials: Optional[Credentials] = None) -> Result:
+        """
+        Checks if the current user has the given `perm`
 
-        if "owner" in self.permissions[perm]:
-            if self.owner == computer.sys_geteuid():
-                return Result(success=True)
+        Args:
+            perm (str): The permission to check ("read", "write", "execute")
+            computer: The current `Computer` instance
+            credentials (Credentials, optional): Who to check for (defaults to the current session's credentials)
+
+        Returns:
+            Result: A `Result` object with the `success` flag set accordingly
+        """
+        if self.has_perm(perm, credentials if credentials is not None else computer.get_credentials()):
+            return Result(success=True)
 
         # No permission
         return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
+    def can_search(self, computer, credentials: Optional[Credentials] = None) -> bool:
+        """
+        Check if the current user can search (traverse) this `Directory` (execute permission), to look up names in it.
+        This runs for every directory on every path lookup, so results are cached per EUID until the permissions or
+        owners change (or any user/group membership changes)
+
+        Args:
+            computer: The current `Computer` instance
+            credentials (Credentials, optional): Who to check for (defaults to the current session's credentials)
+
+        Returns:
+            bool: If the current user can search the `Directory`
+        """
+        if credentials is None:
+            credentials = computer.get_credentials()
+
+        euid = credentials.euid
+
+        # Root can always search
+        if euid == 0:
+            return True
+
+        if self._search_generation != computer.identity_generation:
+            self._search_cache.clear()
+            self._search_generation = computer.identity_generation
+
+        allowed = self._search_cache.get(euid)
+
+        if allowed is None:
+            allowed = self.has_perm("execute", credentials)
+            self._search_cache[euid] = allowed
+
+        return allowed
+
     def check_owner(self, computer) -> Result:
         """
         Checks if the given UID or GID is one of the owners (for chmod/chgrp/etc)
@@ -110,10 +350,9 @@ def check_owner(self, computer) -> Result:
         Returns:
             Result: A `Result` object with the `success` flag set accordingly
         """
-        # Get the list of user's groups
-        groups = computer.get_user_groups(computer.sys_getuid()).data
+        credentials = computer.get_credentials()
 
-        if self.owner == computer.sys_getuid() or self.group_owner in groups:
+        if self.owner == credentials.uid or self.group_owner in credentials.real_groups:
             return Result(success=True)
         else:
             return Result(success=False, message=ResultMessages.NOT_ALLOWED)
@@ -131,9 +370,9 @@ def change_owner(self, computer, new_user_owner: Optional[int] = None,
         Returns:
             Result: A `Result` with the `success` flag set accordingly
         """
-        caller_groups = computer.get_user_groups(computer.sys_getuid()).data
+        credentials = computer.get_credentials()
         # Check if the owner or group owner is correct or if we're root
-        if computer.sys_geteuid() == self.owner or self.group_owner in caller_groups or computer.sys_geteuid() == 0:
+        if credentials.euid in [self.owner, 0] or self.group_owner in credentials.real_groups:
             # We need at least one of the two params (uid/gid)
             # Using `if not new_user_owner/not new_group_owner` won't work because `not 0` (root group) == True (???)
             if new_user_owner is None and new_group_owner is None:
@@ -163,28 +402,148 @@ def change_owner(self, computer, new_user_owner: Optional[int] = None,
 
     def pwd(self) -> str:
         """
-        Get the full path of the `File` in the file system
+        Get the full path of the `File` in the file system.
+        The path is memoized (for every directory on the way up too), so this is O(1) unless the `File` or one of its
+        parents was renamed/moved since the last call
 
         Returns:
             str: A complete file path starting at / (root)
         """
-        current_dir = self
-        working_dir = []
-
         while True:
-            # Check if we're at /
-            working_dir.append(current_dir.name)
-            if not current_dir.parent:
-                break
-            current_dir = current_dir.parent
+            path = self._path
+            if path is not None:
+                return path
+
+            generation = path_generation
+
+            # Walk up until we hit a directory that knows its path (or the root)
+            uncached = []
+            current = self
+
+            while current is not None and current._path is None:
+                uncached.append(current)
+                current = current.parent
+
+            # Then build the paths back down
+            path = current._path if current is not None else None
+            for node in reversed(uncached):
+                parent = node.parent
+                if parent is None:
+                    path = node.name
+                elif path == "/":
+                    path = "/" + node.name
+                else:
+                    path = f"{path}/{node.name}"
+                node._path = path
+
+            # Something was moved while we were building, what we cached might be stale
+            if generation == path_generation:
+                return path
+
+            for node in uncached:
+                node._path = None
+
+    def invalidate_path(self) -> None:
+        """
+        Forget the memoized path of self and everything inside of it (after a rename/move)
 
-        working_dir.reverse()
-        working_dir = "/".join(working_dir)
-        # Try to remove double slash
-        if working_dir.startswith("//"):
-            working_dir = working_dir[1:]
+        Returns:
+            None
+        """
+        global path_generation
+        # Bump first, so a `pwd()` building paths at the same time knows not to trust them
+        path_generation = next(_path_generations)
+        stack = [self]
+
+        while stack:
+            node = stack.pop()
+            # A path is only ever cached after its parent's path is, so there's nothing cached below an uncached node
+            if node._path is None:
+                continue
+            node._path = None
+            if node.is_directory():
+                stack.extend(node.files.values())
+
+    def move(self, new_parent: "Directory", new_name: Optional[str] = None) -> Result:
+        """
+        Move (and/or rename) self to `new_parent` without copying anything.
+        Doesn't check any permissions, that's up to the caller (`sys_rename`)
+
+        Args:
+            new_parent (Directory): The `Directory` to move self into
+            new_name (str, optional): The new name of the `File`/`Directory` (keeps the current name if not given)
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly
+        """
+        new_name = new_name or self.name
+
+        # Can't move /
+        if not self.parent:
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        if self.virtual or new_parent.virtual:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+        if new_parent is self.parent and new_name == self.name:
+            return Result(success=True)
+
+        if new_name in new_parent.files:
+            return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
+
+        old_parent = self.parent
+        old_name = self.name
+
+        # Like Linux, moves between directories are serialized (so the loop check below can't race with another move),
+        # while renames inside of a directory only need that directory's lock
+        with (rename_lock if new_parent is not old_parent else nullcontext()):
+            with write_both(old_parent.lock, new_parent.lock):
+                # Everything could have changed while we waited for the locks
+                if self.parent is not old_parent or old_parent.files.get(old_name) is not self:
+                    return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+                if new_name in new_parent.files:
+                    return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
+
+                # A directory can't be moved inside of itself
+                current = new_parent
+                while current:
+                    if current is self:
+                        return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+                    current = current.parent
+
+                # Only once the move is certain to happen, so listeners (ex. the locate database and the save journal)
+                # never act on a move that's rejected
+                self.handle_event("move", when="before")
+                old_parent.handle_event("write", when="before")
+                if new_parent is not old_parent:
+                    new_parent.handle_event("write", when="before")
+
+                # Sizes inside of self can't change while it's half moved
+                with usage_lock:
+                    usage = self.get_usage()
+
+                    del old_parent.files[old_name]
+                    old_parent.apply_usage({uid: -used for uid, used in usage.items()})
+
+                    self.parent = new_parent
+                    self.name = new_name
+
+                    new_parent.files[new_name] = self
+                    new_parent.apply_usage(usage)
+                # A moved directory has a new parent, so ".." from inside of it goes somewhere else
+                bump_namespace_generation(old_parent, new_parent, self)
+
+                # The name is part of a file's size
+                if self.is_file():
+                    self.update_size()
+
+        old_parent.handle_event("write")
+        if new_parent is not old_parent:
+            new_parent.handle_event("write")
+        self.handle_event("move")
 
-        return working_dir
+        return Result(success=True)
 
     def delete(self, computer) -> Result:
         """
@@ -196,69 +555,99 @@ def delete(self, computer) -> Result:
         Returns:
             Result: A `Result` object with the `success` flag set accordingly
         """
+        if self.virtual:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
         if self.parent:
             # In unix, we need read+write permissions to delete
-            if self.check_perm("read", computer).success and self.check_perm("write", computer).success:
+            # Links are always rwxrwxrwx, so for them, only the write permission on their directory matters
+            if self.is_symlink():
+                allowed = self.parent.check_perm("write", computer).success
+            else:
+                credentials = computer.get_credentials()
+                allowed = self.has_perm("read", credentials) and self.has_perm("write", credentials)
+
+            if allowed:
+                parent = self.parent
+                self.handle_event("delete", when="before")
+
+                remove_result = parent.remove_file(self)
+                if not remove_result.success:
+                    return remove_result
+
                 self.handle_event("delete")
-                del self.parent.files[self.name]
                 return Result(success=True)
             else:
                 return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
-    def add_event_listener(self, event: event_types, function: Callable, when: Literal["before", "after"] = "after"):
+    def add_event_listener(self, event: event_types, function: Callable, when: event_times = "after",
+                           coalesce: bool = False, recursive: bool = False) -> Result:
         """
         Bind a function to run whenever a given event fires.
-        A `FSBaseObject` can only have one function per event type.
-        If a function is already bound to the given event type, it will be overwritten.
+        Any amount of functions can be bound to the same event type, they run in the order they were added.
 
         Args:
             event: The given event type to bind the given `function` to.
-            Valid event types include: `read`, `write`, `move`, `perm`, `delete`
+            Valid event types include: `read`, `write`, `move`, `change_perm`, `change_owner`, `delete`
             <ul>
                 <li>read - When a file is read from</li>
-                <li>write - When a file is written to</li>
+                <li>write - When a file is written to (or a `File`/`Directory` is added to a `Directory`)</li>
+                <li>create - When a file is added to its parent `Directory`</li>
                 <li>move - When a file is moved to a different location AKA: When a file's parent folder changes</li>
-                <li>perm - When a file's owner, group owner, or permissions changes</li>
-                <li>delete - Before a file is deleted</li>
+                <li>change_perm - When a file's permissions changes</li>
+                <li>change_owner - When a file's owner or group owner changes</li>
+                <li>delete - When a file is deleted</li>
             </ul>
             function: The function/method to be called when the given `event` is fired
             when (str): When the event is fired (for example, before the read happens, or after)
+            coalesce (bool): If `True`, the function only runs once per command (after the command finishes), no matter
+            how many times the event fires. Use this for expensive listeners
+            recursive (bool): If `True`, the function also runs when the event fires on anything inside this
+            `Directory` (the function receives the `File`/`Directory` that fired the event)
 
         Returns:
              Result: A `Result` with the `success` flag set accordingly.
         """
-        self.events[event] = function
-        return Result(success=True)
+        return self.events.subscribe(event, function, when, coalesce, recursive)
 
-    def remove_event_listener(self, event: event_types):
+    def remove_event_listener(self, event: event_types, function: Optional[Callable] = None) -> Result:
         """
-        Unbinds the current function from the given `event` type
+        Unbinds a function (or all the functions) from the given `event` type
 
         Args:
-            event: The event type to unbind. Valid event types include: `read`, `write`, `move`, `perm`, `delete`
+            event: The event type to unbind. Valid event types include: `read`, `write`, `move`, `change_perm`,
+            `change_owner`, `delete`
+            function: The function to unbind. If not given, all the functions bound to `event` are unbound
 
         Returns:
              Result: A `Result` with the `success` flag set accordingly.
         """
-        try:
-            self.events.pop(event)
-        except Exception:
-            pass
+        if self._events is None:
+            return Result(success=True)
 
-        return Result(success=True)
+        return self._events.unsubscribe(event, function)
 
-    def handle_event(self, event: event_types):
+    def handle_event(self, event: event_types, when: event_times = "after") -> Result:
         """
-        Handles executing the function bound to the given `event`
+        Handles executing the functions bound to the given `event`
 
         Args:
-            event: The event type to run. Valid event types include: `read`, `write`, `move`, `perm`, `delete`
+            event: The event type to run. Valid event types include: `read`, `write`, `create`, `move`,
+            `change_perm`, `change_owner`, `delete`
+            when (str): If the action that fired the event is about to happen ("before") or already happened ("after")
 
         Returns:
              Result: A `Result` with the `success` flag set accordingly.
         """
-        if event in self.events.keys():
-            self.events[event](self)
+        if self._events is not None:
+            self._events.publish(self, event, when)
+
+        # Let the recursive listeners of our parent directories know (used by indexes and watches)
+        parent = self.parent
+        while parent:
+            if parent._events is not None and parent._events.recursive:
+                parent._events.publish(self, event, when, recursive_only=True)
+            parent = parent.parent
 
         return Result(success=True)
 
@@ -276,12 +665,52 @@ def __init__(self, name: str, content: str, parent: "Directory", owner: int, gro
             group_owner (int): The GID of the owner of the `File`/`Directory
         """
         super().__init__(name, parent, owner, group_owner)
+        self._blob: Optional[str] = None
+        """str: The hash of our content in the `blob_store` (`None` for no content)"""
         self.content = content
-        self.size = sys.getsizeof(self.name + self.content)
+        # Not using the `size` setter since we're not in our parent's file map yet (`add_file()` counts our size)
+        self._size = sys.getsizeof(self.name + self.content)
 
         if self.parent:
             self.parent.add_file(self)
 
+    def __del__(self) -> None:
+        # Let the blob store free our content if nothing else uses it
+        blob_store.release(getattr(self, "_blob", None))
+
+    def __getstate__(self) -> dict:
+        # The blob store is per process, so pickles hold the actual content
+        state = super().__getstate__()
+        state["_blob"] = None
+        state["content"] = self.content
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        content = state.pop("content")
+        super().__setstate__(state)
+        self.content = content
+
+    @property
+    def content(self) -> str:
+        """str: The content of the `File` (stored once in the `blob_store` no matter how many `File`s have it)"""
+        return blob_store.get(self._blob)
+
+    @content.setter
+    def content(self, content: str) -> None:
+        old_blob = self._blob
+        self._blob = blob_store.put(content) if content else None
+        blob_store.release(old_blob)
+
+    @FSBaseObject.size.setter
+    def size(self, size: int) -> None:
+        # Only pass the difference up the tree, so the parent directories never need to recalculate their size
+        with usage_lock:
+            delta = size - self._size
+            self._size = size
+
+            if delta and self.parent:
+                self.parent.apply_usage({self._owner: delta})
+
     def read(self, computer) -> Result:
         """
         Check if the current UID has permission to read the content of the file. Afterwards, return the content if allowed
@@ -292,8 +721,10 @@ def read(self, computer) -> Result:
         Returns: Result: A `Result` object with the `success` flag set and the `data` flag set with the  file's content if permitted
         """
         if self.check_perm("read", computer).success:
+            self.handle_event("read", when="before")
+            content = self.content
             self.handle_event("read")
-            return Result(success=True, data=self.content)
+            return Result(success=True, data=content)
         else:
             return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
@@ -309,8 +740,14 @@ def write(self, data: str, computer) -> Result:
             Result: A `Result` object with the `success` flag accordingly
         """
         if self.check_perm("write", computer).success:
-            self.content = data
-            self.update_size()
+            quota_check = computer.fs.check_quota(self.owner, sys.getsizeof(self.name + data) - self.size)
+            if not quota_check.success:
+                return quota_check
+
+            self.handle_event("write", when="before")
+            with content_lock:
+                self.content = data
+                self.update_size()
             self.handle_event("write")
             return Result(success=True)
         else:
@@ -329,29 +766,65 @@ def append(self, data: str, computer) -> Result:
         """
         # NOTE: This may be unnecessary, we"ll find out later
         if self.check_perm("write", computer).success:
-            self.content += data
-            self.update_size()
+            quota_check = computer.fs.check_quota(self.owner, sys.getsizeof(self.name + self.content + data) - self.size)
+            if not quota_check.success:
+                return quota_check
+
+            self.handle_event("write", when="before")
+            with content_lock:
+                self.content += data
+                self.update_size()
             self.handle_event("write")
             return Result(success=True)
         else:
             return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
+    def pread(self, count: int, offset: int, computer) -> Result:
+        """
+        Check if the current UID has permission to read the file, then return (at most) `count` bytes starting at `offset`
+
+        Args:
+            count (int): The max amount of bytes to read
+            offset (int): The byte to start reading at
+            computer: The current `Computer` instance
+
+        Returns:
+            Result: A `Result` object with the `success` flag set and the `data` flag containing the bytes if permitted
+            (empty once `offset` is past the end of the file)
+        """
+        if not self.check_perm("read", computer).success:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+        self.handle_event("read", when="before")
+        data = self.read_bytes(count, offset)
+        self.handle_event("read")
+
+        return Result(success=True, data=data)
+
+    def read_bytes(self, count: int, offset: int) -> bytes:
+        """
+        Get a range of the file's (UTF-8 encoded) content without checking any permissions
+
+        Args:
+            count (int): The max amount of bytes to read
+            offset (int): The byte to start reading at
+
+        Returns:
+            bytes: The requested range
+        """
+        # The blob store keeps the encoded content, so reading a file in chunks doesn't encode all of it every time
+        return blob_store.get_bytes(self._blob)[offset:offset + count]
+
     def update_size(self) -> None:
         """
         Calculates the size of the `File` and set in the object.
-        Also, recursively tells it's parent to update its size.
+        The change in size is passed up to every parent directory.
 
         Returns:
             None
         """
         self.size = sys.getsizeof(self.name + self.content)
 
-        # First, update our own size
-        self.size = sys.getsizeof(self.content + self.name)
-        # Now, recursively update our parent"s size
-        if self.parent:
-            self.parent.update_size()
-
     def get_perm_octal(self):
         result = 0o000
 
@@ -392,6 +865,142 @@ def __str__(self):
         return f"{self.name} - {self.owner}"
 
 
+class RenderedFile(File):
+    def __init__(self, name: str, render: Callable[[], str], parent: "Directory", owner: int,
+                 group_owner: int) -> None:
+        """
+        A `File` whose content is generated from the game's state (ex. /etc/passwd from the user table).
+        `invalidate()` only marks it stale; it's rendered (once) the next time its content or size is needed (or the
+        size of a `Directory`, see `refresh_stale_files()`), so any amount of changes in a row cost one render.
+        It's still a normal file otherwise (it can be written to and saved)
+
+        Args:
+            name (str): The name of the given `File`
+            render (Callable): Returns the up to date content of the file
+            parent (Directory): The `Directory` one level up the tree
+            owner (int): The UID of the owner of the `File`
+            group_owner (int): The GID of the owner of the `File`
+        """
+        self.render: Callable[[], str] = render
+        super().__init__(name, "", parent, owner, group_owner)
+        self.stale: bool = True
+        """bool: If the state changed since the content was last rendered (or written)"""
+
+    @property
+    def content(self) -> str:
+        """str: The content of the `File` (rendered first if it's stale)"""
+        if self.stale:
+            self.refresh()
+        return blob_store.get(self._blob)
+
+    @content.setter
+    def content(self, content: str) -> None:
+        # Written content replaces the rendered content (until the next `invalidate()`)
+        self.stale = False
+        File.content.fset(self, content)
+
+    @property
+    def size(self) -> int:
+        """int: The size of the `File` in bytes (rendered first if it's stale)"""
+        if self.stale:
+            self.refresh()
+        return self._size
+
+    @size.setter
+    def size(self, size: int) -> None:
+        File.size.fset(self, size)
+
+    def read_bytes(self, count: int, offset: int) -> bytes:
+        if self.stale:
+            self.refresh()
+        return super().read_bytes(count, offset)
+
+    def invalidate(self) -> None:
+        """
+        Mark the content as out of date
+
+        Returns:
+            None
+        """
+        with render_lock:
+            self.stale = True
+            stale_files.add(self)
+
+    def refresh(self) -> None:
+        """
+        Render the content now (if it's still stale) and pass the change in size up the tree
+
+        Returns:
+            None
+        """
+        with render_lock:
+            if self.stale:
+                content = self.render()
+                self.content = content
+                self.size = sys.getsizeof(self.name + content)
+            stale_files.discard(self)
+
+
+class HostFile(File):
+    def __init__(self, name: str, host_path: str, parent: "Directory", owner: int, group_owner: int) -> None:
+        """
+        A read-only `File` whose content lives in a file on the host machine (see `StandardFS.mount_host()`).
+        Nothing is loaded up front: ranged reads (`pread`) only read the requested range of the host file, so huge
+        files (wordlists) never have to fit in a string. The file isn't part of the game's state (or save files) either,
+        loading a save mounts the host directory again
+
+        Args:
+            name (str): The name of the given `File`
+            host_path (str): The path of the backing file on the host
+            parent (Directory): The `Directory` one level up the tree
+            owner (int): The UID of the owner of the `File`
+            group_owner (int): The GID of the owner of the `File`
+        """
+        # Skip `File.__init__()`, we don't have (or want) a content string
+        FSBaseObject.__init__(self, name, parent, owner, group_owner)
+        self.host_path: str = host_path
+        self._size = os.path.getsize(host_path)
+        self.permissions = {"read": ["owner", "group", "public"], "write": [], "execute": []}
+
+        if self.parent:
+            self.parent.add_file(self)
+
+    @property
+    def content(self) -> str:
+        """str: The content of the host file (only its first `HOST_READ_LIMIT` bytes, `read_bytes()` reads the rest)"""
+        return self.read_bytes(HOST_READ_LIMIT, 0).decode(errors="replace")
+
+    def get_usage(self) -> Dict[int, int]:
+        # The bytes live on the host, they don't use any space in the virtual file system
+        return {}
+
+    def read(self, computer) -> Result:
+        # Reading it all at once would load the whole host file in memory
+        if self._size > HOST_READ_LIMIT:
+            return Result(success=False, message=ResultMessages.TOO_LARGE)
+
+        return super().read(computer)
+
+    def read_bytes(self, count: int, offset: int) -> bytes:
+        if self._size == 0 or offset >= self._size:
+            return b""
+
+        # Nothing is kept open between reads
+        with open(self.host_path, "rb") as f:
+            f.seek(offset)
+            return f.read(count)
+
+    def write(self, data: str, computer) -> Result:
+        # Host mounts are read-only
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+    def append(self, data: str, computer) -> Result:
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+    def update_size(self) -> None:
+        return None
+
+
 class Directory(FSBaseObject):
     def __init__(self, name: str, parent: Optional["Directory"], owner: int, group_owner: int):
         """
@@ -404,8 +1013,14 @@ def __init__(self, name: str, parent: Optional["Directory"], owner: int, group_o
             group_owner (int): The GID of the owner of the `File`/`Directory`
         """
         super().__init__(name, parent, owner, group_owner)
+        self.lock: RWLock = RWLock()
+        """RWLock: Held (for writing) while entries are added/removed. Lookups don't need it, the map is always whole"""
         self.files = {}
-        self.size = None
+        self.owner_usage: Dict[int, int] = {}
+        """dict: UID -> bytes used by that user's files anywhere inside of the `Directory`"""
+        self.generation: int = 0
+        """int: Changes whenever our entries, permissions or owners change, or we move (see
+        `bump_namespace_generation()`)"""
         # The default perms for directories are different from files
         self.permissions = {
             "read": ["owner", "group", "public"],
@@ -416,7 +1031,21 @@ def __init__(self, name: str, parent: Optional["Directory"], owner: int, group_o
         if parent:
             parent.add_file(self)
 
-        self.update_size()
+    def __getstate__(self) -> dict:
+        # Generated (/proc) entries are rebuilt by `StandardFS.setup_proc()`, saving them would only store stale data
+        # Host mounts are mounted again by `StandardFS.remount_hosts()`, the host's files don't belong in a save
+        state = super().__getstate__()
+        state["files"] = {name: file for name, file in self.files.items()
+                          if not file.virtual and not isinstance(file, (HostFile, HostDirectory))}
+        # Has to match `_size` (see `StandardFS.capture()`)
+        state["owner_usage"] = dict(self.owner_usage)
+        # Locks can't be pickled (and nobody can be holding them in a save file anyway)
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self.lock = RWLock()
 
     def add_file(self, file: Union[File, "Directory"]) -> Result:
         """
@@ -429,19 +1058,56 @@ def add_file(self, file: Union[File, "Directory"]) -> Result:
         Returns:
             Result: A `Result` with the `success` flag set accordingly
         """
+        if self.virtual:
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
         if file.name in self.files.keys():
             return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
 
-        self.files[file.name] = file
-        self.update_size()
+        self.handle_event("write", when="before")
+
+        with self.lock.write():
+            # Another thread could have taken the name while we waited for the lock
+            if file.name in self.files:
+                return Result(success=False, message=ResultMessages.ALREADY_EXISTS)
+
+            with usage_lock:
+                self.files[file.name] = file
+                self.apply_usage(file.get_usage())
+            bump_namespace_generation(self)
 
         self.handle_event("write")
+        file.handle_event("create")
+
+        return Result(success=True)
+
+    def remove_file(self, file: FSBaseObject) -> Result:
+        """
+        Remove a `File`/`Directory` from self's internal file map (and its size from every parent's size).
+        Doesn't check any permissions or fire any events, that's up to the caller (`delete()`)
+
+        Args:
+            file (FSBaseObject): The `File`/`Directory` to remove
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly
+        """
+        with self.lock.write():
+            # Someone else could have moved/deleted it while we waited for the lock
+            if file.parent is not self or self.files.get(file.name) is not file:
+                return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+            with usage_lock:
+                del self.files[file.name]
+                self.apply_usage({uid: -used for uid, used in file.get_usage().items()})
+            bump_namespace_generation(self)
 
         return Result(success=True)
 
     def calculate_size(self) -> int:
         """
         Calculate a total size for the given directory and (recursively) all its children (`File`(s)/`Directory`(ies))
+        without using the cached sizes. Only useful to check that `size` is correct, `size` is always up to date
 
         Returns:
             int: The total size (in bytes) of the given directory
@@ -453,11 +1119,61 @@ def calculate_size(self) -> int:
                 # Recursive
                 total += file.calculate_size()
             else:
-                if file.size:
-                    total += file.size
+                total += sum(file.get_usage().values())
 
         return total
 
+    @property
+    def size(self) -> int:
+        """int: The size of every `File` inside of the `Directory` in bytes (stale rendered files are rendered first)"""
+        if stale_files:
+            refresh_stale_files(self)
+        return self._size
+
+    def get_usage(self) -> Dict[int, int]:
+        """
+        Get how many bytes each user owns anywhere inside of the `Directory` (call `refresh_stale_files()` first if it
+        has to include the latest changes to rendered files)
+
+        Returns:
+            dict: UID -> bytes
+        """
+        return dict(self.owner_usage)
+
+    def apply_usage(self, usage: Dict[int, int]) -> None:
+        """
+        Add the given (per owner) changes in size to self and every parent directory.
+        Every change in size goes through here, so no directory ever has to walk its children to know its size.
+        Stops at a deleted `Directory` (things can still change inside of it, but that isn't part of the tree anymore)
+
+        Args:
+            usage (dict): UID -> the amount of bytes to add (negative to remove)
+
+        Returns:
+            None
+        """
+        if not usage:
+            return
+
+        total = sum(usage.values())
+
+        with usage_lock:
+            current = self
+
+            while current:
+                current._size += total
+                for uid, delta in usage.items():
+                    used = current.owner_usage.get(uid, 0) + delta
+                    if used:
+                        current.owner_usage[uid] = used
+                    else:
+                        del current.owner_usage[uid]
+
+                parent = current.parent
+                if parent is not None and parent.files.get(current.name) is not current:
+                    break
+                current = parent
+
     def find(self, filename: str) -> Optional[Union[File, "Directory"]]:
         """
         Find a `File` or `Directory` in self's internal file map
@@ -468,67 +1184,346 @@ def find(self, filename: str) -> Optional[Union[File, "Directory"]]:
         Returns:
             File or Directory or None: The `File` or `Directory` object if found, otherwise, None
         """
+        # No lock: entries are only added/removed under the write lock, a lookup sees the map before or after
         return self.files.get(filename, None)
 
     def update_size(self) -> None:
         """
-        Update self's size using `calculate_size()` then, triggers self's parent to update their size
+        Re-sync self's size with the (cached) sizes of its children and pass any difference up to the parent directories
 
         Returns:
             None
         """
-        self.size = self.calculate_size()
+        usage = {}
+
+        for file in self.files.values():
+            for uid, used in file.get_usage().items():
+                usage[uid] = usage.get(uid, 0) + used
 
-        # This does the same as the file update size. Updates its own size
-        # Then the parent updates its size, taking into account self's new size
-        # Like a chain until all parent folders have been updated
+        difference = {}
+        for uid in set(usage) | set(self.owner_usage):
+            delta = usage.get(uid, 0) - self.owner_usage.get(uid, 0)
+            if delta:
+                difference[uid] = delta
 
-        if self.parent:
-            self.parent.update_size()
+        self.apply_usage(difference)
 
 
-class StandardFS:
-    def __init__(self, computer) -> None:
+class ProcFile(File):
+    virtual = True
+
+    def __init__(self, name: str, provider: Callable[[], str], parent: Optional["ProcDirectory"], owner: int = 0,
+                 group_owner: int = 0) -> None:
         """
-        The class object representing a file system that belongs to a `Computer`
+        A read-only `File` whose content is generated by `provider` every time it's read (ex. /proc/uptime).
+        Nothing is stored: the content never goes through the blob store, the file uses no space and isn't saved
 
         Args:
-            computer (Computer): The `Computer` that the given file system belongs to
-        """
-        self.computer = computer
+            name (str): The name of the `ProcFile`
+            provider (Callable): Returns the current content of the file
+            parent (ProcDirectory): The `ProcDirectory` that generated this file
+            owner (int): The UID of the owner of the `ProcFile`
+            group_owner (int): The GID of the owner of the `ProcFile`
+        """
+        self.provider: Callable[[], str] = provider
+        # `ProcDirectory`s hand out their own entries, they're never added like a normal file
+        super().__init__(name, "", None, owner, group_owner)
+        self._parent = parent
+        # Like Linux, generated files have no size
+        self._size = 0
+        self.permissions = {"read": ["owner", "group", "public"], "write": [], "execute": []}
+
+    @property
+    def content(self) -> str:
+        """str: The content, generated right now"""
+        return self.provider()
+
+    @content.setter
+    def content(self, content: str) -> None:
+        # Generated on read, there's nothing to store
+        pass
+
+    def get_usage(self) -> Dict[int, int]:
+        return {}
+
+    def read_bytes(self, count: int, offset: int) -> bytes:
+        return self.provider().encode()[offset:offset + count]
 
-        # The filesystem root (/) (owned by root)
-        self.files = Directory("/", None, 0, 0)
-        self.files.permissions = {"read": ["owner", "group", "public"],
-                                  "write": ["owner", "group"],
-                                  "execute": ["owner", "group", "public"]}
+    def write(self, data: str, computer) -> Result:
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
-        self.init()
+    def append(self, data: str, computer) -> Result:
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
-    def init(self) -> None:
-        """
-        All the functions required to setup a new filesystem
+    def update_size(self) -> None:
+        return None
 
-        Returns:
-            None
+
+class ProcDirectory(Directory):
+    virtual = True
+
+    def __init__(self, name: str, parent: Optional[Directory],
+                 entries: Callable[[], Dict[str, Union[Callable[[], str], dict]]]) -> None:
         """
-        # Setup the directory structure in the file system (Unix FHS)
-        for dir in ["bin", "etc", "home", "lib", "root", "run", "proc", "tmp", "usr", "var"]:
-            directory = Directory(dir, self.files, 0, 0)
-            # Special case for /tmp (read and write by everyone)
-            if dir == "tmp":
-                directory.permissions = {"read": ["owner", "group", "public"], "write": ["owner", "group", "public"],
-                                         "execute": ["owner", "group", "public"]}
-            elif dir == "proc":
-                directory.permissions = {"read": ["owner", "group", "public"], "write": [],
-                                         "execute": ["owner", "group", "public"]}
-            else:
-                # TODO: Change this to be more accurate
-                # (rwx rw- r--)
-                directory.permissions = {"read": ["owner", "group", "public"], "write": ["owner", "group"],
-                                         "execute": ["owner", "group", "public"]}
+        A read-only `Directory` whose entries are generated when it's looked in (ex. /proc and the per-session
+        /proc/<id> directories). Entries that stay around keep the same node (so watches and indexes keep working),
+        entries that appear/disappear fire "create"/"delete" like normal files
 
-        # TODO: Replace all these with `mkdir -p` commands
+        Args:
+            name (str): The name of the `ProcDirectory`
+            parent (Directory): The `Directory` one level up the tree
+            entries (Callable): Returns name -> content provider (a `ProcFile`) or a dict of entries (a `ProcDirectory`)
+        """
+        self._nodes: Dict[str, FSBaseObject] = {}
+        self.entries: Callable[[], Dict[str, Union[Callable[[], str], dict]]] = entries
+        super().__init__(name, parent, 0, 0)
+        self.permissions = {"read": ["owner", "group", "public"], "write": [],
+                            "execute": ["owner", "group", "public"]}
+
+    @property
+    def files(self) -> Dict[str, FSBaseObject]:
+        """dict: Name -> the `ProcFile`/`ProcDirectory` entries, regenerated on every access"""
+        old = self._nodes
+        new = {}
+        created = []
+
+        for name, value in self.entries().items():
+            node = old.get(name)
+
+            if callable(value):
+                if isinstance(node, ProcFile):
+                    node.provider = value
+                else:
+                    node = ProcFile(name, value, self)
+                    created.append(node)
+            else:
+                if isinstance(node, ProcDirectory):
+                    node.entries = lambda value=value: value
+                else:
+                    node = ProcDirectory(name, None, lambda value=value: value)
+                    node._parent = self
+                    created.append(node)
+
+            new[name] = node
+
+        # Swapped in one go (no lock needed), readers always see a complete map
+        self._nodes = new
+
+        if len(new) != len(old) or created:
+            for node in old.values():
+                if new.get(node.name) is not node:
+                    node.handle_event("delete")
+            for node in created:
+                node.handle_event("create")
+
+        return new
+
+    @files.setter
+    def files(self, files: Dict[str, FSBaseObject]) -> None:
+        self._nodes = files
+
+    def find(self, filename: str) -> Optional[FSBaseObject]:
+        return self.files.get(filename, None)
+
+
+class HostDirectory(Directory):
+    def __init__(self, name: str, parent: Directory, owner: int, group_owner: int) -> None:
+        """
+        A read-only `Directory` inside of a host mount (see `StandardFS.mount_host()`).
+        Like its `HostFile`s, it isn't saved, loading a save mounts the host directory again
+
+        Args:
+            name (str): The name of the `HostDirectory`
+            parent (Directory): The `Directory` one level up the tree
+            owner (int): The UID of the owner of the `HostDirectory`
+            group_owner (int): The GID of the owner of the `HostDirectory`
+        """
+        super().__init__(name, parent, owner, group_owner)
+        self.permissions = {"read": ["owner", "group", "public"], "write": [],
+                            "execute": ["owner", "group", "public"]}
+
+
+class Symlink(FSBaseObject):
+    def __init__(self, name: str, target: str, parent: Optional[Directory], owner: int, group_owner: int) -> None:
+        """
+        The class object representing a symbolic link. The link only stores the path it points to; the target doesn't
+        need to exist
+
+        Args:
+            name (str): The name of the `Symlink`
+            target (str): The (absolute or relative to the link's `Directory`) path the link points to
+            parent (Directory): The `Directory` one level up the tree
+            owner (int): The UID of the owner of the `Symlink`
+            group_owner (int): The GID of the owner of the `Symlink`
+        """
+        super().__init__(name, parent, owner, group_owner)
+        self.target: str = target
+        # The size of a link is the length of its target
+        self._size = len(target)
+        # Links are always rwxrwxrwx, the target's permissions are the ones that matter
+        self.permissions = {"read": ["owner", "group", "public"], "write": ["owner", "group", "public"],
+                            "execute": ["owner", "group", "public"]}
+        self._resolved: Optional[FSBaseObject] = None
+        """FSBaseObject: The memoized result of `resolve()`"""
+        self._resolved_key: Optional[tuple] = None
+        """tuple: (identity generation, EUID, parent `Directory`) that `_resolved` is valid for"""
+        self._resolved_dependencies: List[Tuple["Directory", int]] = []
+        """list: (`Directory`, generation) of every directory the memoized resolution went through"""
+
+        if self.parent:
+            self.parent.add_file(self)
+
+    def __getstate__(self) -> dict:
+        # Generations are handed out per process, the memoized resolution could look valid after loading
+        state = super().__getstate__()
+        state["_resolved"] = None
+        state["_resolved_key"] = None
+        state["_resolved_dependencies"] = []
+        return state
+
+    def resolve(self, fs: "StandardFS", depth: int = 0, dependencies: Optional[list] = None) -> Result:
+        """
+        Find the `File`/`Directory` this link (eventually) points to.
+        The result is memoized until one of the directories on the way to the target changes (its entries, permissions
+        or owners, or it moves), so frequently used links don't re-walk their target path on every access
+
+        Args:
+            fs (StandardFS): The file system the link is in
+            depth (int): How many links were already followed to get here
+            dependencies (list, optional): Gets the (`Directory`, generation) pairs the resolution depends on (so a
+            resolution that goes through this link can be memoized too)
+
+        Returns:
+            Result: A `Result` with the `data` flag containing the target (`TOO_MANY_LINKS` if we followed too many)
+        """
+        key = (fs.computer.identity_generation, fs.computer.sys_geteuid(), self.parent)
+        # Read together, another thread could be memoizing a new resolution
+        resolved, resolved_key, resolved_dependencies = self._resolved, self._resolved_key, self._resolved_dependencies
+
+        if resolved_key == key and all(x.generation == generation for x, generation in resolved_dependencies):
+            if dependencies is not None:
+                dependencies.extend(resolved_dependencies)
+            return Result(success=True, data=resolved)
+
+        if depth >= MAX_SYMLINK_DEPTH:
+            return Result(success=False, message=ResultMessages.TOO_MANY_LINKS)
+
+        walked = []
+        start = fs.files if self.target.startswith("/") else self.parent
+        resolve_result = fs.walk(start, self.target, True, depth + 1, walked)
+
+        if resolve_result.success:
+            self._resolved_key = None
+            self._resolved, self._resolved_dependencies = resolve_result.data, walked
+            self._resolved_key = key
+
+            if dependencies is not None:
+                dependencies.extend(walked)
+
+        return resolve_result
+
+
+JOURNALED_TYPES: Dict[str, type] = {"File": File, "Directory": Directory, "Symlink": Symlink}
+"""dict: Type name -> type, of the nodes recorded in a `Journal` (generated, rendered and host files are rebuilt
+instead)"""
+
+
+def is_journaled(node: FSBaseObject) -> bool:
+    """
+    Check if a `File`/`Directory` is recorded in a `Journal` (subclasses like `RenderedFile` aren't)
+
+    Args:
+        node (FSBaseObject): The `File`/`Directory`
+
+    Returns:
+        bool: If the node is recorded
+    """
+    return not node.virtual and JOURNALED_TYPES.get(type(node).__name__) is type(node)
+
+
+def is_mountable(host_dir: str) -> bool:
+    """
+    Check if a directory of the host machine can be mounted (see `MOUNT_ROOTS_VARIABLE`)
+
+    Args:
+        host_dir (str): The path of the directory on the host
+
+    Returns:
+        bool: If it's one of the allowed directories, or inside of one
+    """
+    host_dir = os.path.realpath(host_dir)
+
+    for root in os.getenv(MOUNT_ROOTS_VARIABLE, "").split(os.pathsep):
+        if not root:
+            continue
+
+        root = os.path.realpath(root)
+        if os.path.commonpath([host_dir, root]) == root:
+            return True
+
+    return False
+
+
+class StandardFS:
+    def __init__(self, computer) -> None:
+        """
+        The class object representing a file system that belongs to a `Computer`
+
+        Args:
+            computer (Computer): The `Computer` that the given file system belongs to
+        """
+        self.computer = computer
+
+        # The filesystem root (/) (owned by root)
+        self.files = Directory("/", None, 0, 0)
+        self.files.permissions = {"read": ["owner", "group", "public"],
+                                  "write": ["owner", "group"],
+                                  "execute": ["owner", "group", "public"]}
+
+        self.path_index: Optional[PathIndex] = None
+        """PathIndex: The `locate` database. Doesn't exist until `updatedb` is run"""
+        self.content_index: Optional[ContentIndex] = None
+        """ContentIndex: Trigram index of file contents (`grep -r`, `search`). Built by `updatedb --content`"""
+        self.capacity: int = 10 * 1024 ** 3
+        """int: The size of the (virtual) disk in bytes"""
+        self.quotas: Dict[int, int] = {}
+        """dict: UID -> the max amount of bytes that user's files can use (users without a quota are unlimited)"""
+        self.mounts: Dict[str, str] = {}
+        """dict: Mount point -> the host directory mounted there (see `mount_host()`)"""
+        self.journal: Optional[Journal] = None
+        """Journal: Where changes are recorded between saves (see `Computer.save()`). Attached by the first save"""
+
+        self.init()
+
+    def __getstate__(self) -> dict:
+        # Copies of the containers, so the state doesn't change while it's pickled (see `capture()`)
+        state = self.__dict__.copy()
+        state["quotas"] = dict(self.quotas)
+        state["mounts"] = dict(self.mounts)
+        return state
+
+    def init(self) -> None:
+        """
+        All the functions required to setup a new filesystem
+
+        Returns:
+            None
+        """
+        # Setup the directory structure in the file system (Unix FHS)
+        # /proc is generated, `setup_proc()` makes it
+        for dir in ["bin", "etc", "home", "lib", "root", "run", "tmp", "usr", "var"]:
+            directory = Directory(dir, self.files, 0, 0)
+            # Special case for /tmp (read and write by everyone)
+            if dir == "tmp":
+                directory.permissions = {"read": ["owner", "group", "public"], "write": ["owner", "group", "public"],
+                                         "execute": ["owner", "group", "public"]}
+            else:
+                # TODO: Change this to be more accurate
+                # (rwx rw- r--)
+                directory.permissions = {"read": ["owner", "group", "public"], "write": ["owner", "group"],
+                                         "execute": ["owner", "group", "public"]}
+
+        # TODO: Replace all these with `mkdir -p` commands
         # NOTE: FS doesn't exist at this point so running commands might not be possible (since some commands need fs)
         # Individually setup each directory in the root
         self.setup_bin()
@@ -584,132 +1579,22 @@ def setup_etc(self) -> None:
             None
         """
 
-        # EventHandler functions for /etc/passwd, /etc/shadow, and /etc/group
-        def update_passwd(file):
-            content = file.content.split("\n")
-
-            for item in content:
-                subitems = item.split(":")
-                # An item in the list with a length of 1 or less are usually blank lines
-                if len(subitems) > 1:
-                    username, password, uid, primary_gid = subitems
-
-                    try:
-                        uid = int(uid)
-                        primary_gid = int(primary_gid)
-                    except Exception:
-                        return
-
-                    # Now we want to get the user by username
-                    user_lookup = self.computer.get_user(username=username)
-
-                    # If we don't find the user, that means we added a new user
-                    if not user_lookup.success:
-                        # Make sure no user has the uid
-                        if not self.computer.get_user(uid=uid).success:
-                            # Add the user
-                            self.computer.add_user(username, password, uid, plaintext=False)
-                            self.computer.add_group(name=username, gid=primary_gid)
-                            self.computer.add_user_to_group(uid, primary_gid, "primary")
-                    else:
-                        # We have a user, now lets check if any of the data has changed
-                        user = user_lookup.data
-
-                        # If the password is 'x', that password is in the /etc/shadow file and should be ignored here
-                        if user.password != password and password != "x":
-                            result = self.computer.change_user_password(user.uid, password, plaintext=False)
-                            if result.success:
-                                user.password = password
-
-                        if user.uid != uid:
-                            result = self.computer.change_user_uid(user.uid, uid)
-                            if result.success:
-                                user.uid = uid
-
-                        # If the GID changed, we want to:
-                        # 1. Make sure the new GID exists
-                        # 2. Remove the user's old primary gid membership
-                        # 3. Add a the user to the new gid as primary
-                        user_primary_gid = self.computer.get_user_primary_group(user.uid).data[0]
-
-                        if user_primary_gid != primary_gid:
-                            if self.computer.get_group(gid=primary_gid).success:
-                                self.computer.remove_user_from_group(uid=user.uid, gid=user_primary_gid)
-                                self.computer.add_user_to_group(user.uid, primary_gid, "primary")
-
-                    # Will automatically remove incorrect changes
-                    self.computer.sync_user_and_group_files()
-
-        def update_shadow(file):
-            content = file.content.split("\n")
-
-            for item in content:
-                subitems = item.split(":")
-                # An item in the list with a length of 1 or less are usually blank lines
-                if len(subitems) > 1:
-                    username, password = subitems
-
-                    # Now we want to get the user by username
-                    user_lookup = self.computer.get_user(username=username)
-
-                    # We have a user, now lets check if any of the data has changed
-                    user = user_lookup.data
-
-                    # If the password is 'x', that password is in the /etc/shadow file and should be ignored here
-                    if user.password != password and password != "x":
-                        result = self.computer.change_user_password(user.uid, password, plaintext=False)
-                        if result.success:
-                            user.password = password
-
-                # Will automatically remove incorrect changes
-                self.computer.sync_user_and_group_files()
-
-        def update_group(file):
-            content = file.content.split("\n")
-
-            for item in content:
-                subitems = item.split(":")
-                # An item in the list with a length of 1 or less are usually blank lines
-                if len(subitems) > 1:
-                    group_name, password, gid, group_users = subitems
-
-                    try:
-                        uid = int(gid)
-                    except Exception:
-                        return
-
-                    # Now we want to get the group by group name
-                    group_lookup = self.computer.get_group(name=group_name)
-
-                    # If we don't find the user, that means we added a new user
-                    if not group_lookup.success:
-                        # Make sure no group has the gid
-                        if not self.computer.get_group(gid=gid).success:
-                            # Add the group
-                            self.computer.add_group(group_name, gid)
-                            # TODO: Add users to the group by last param
-                    else:
-                        # We have a group, now lets check if any of the data has changed
-                        group = group_lookup.data
-                        # TODO: Add changes here
-
-                    # Will automatically remove incorrect changes
-                    self.computer.sync_user_and_group_files()
-
         etc_dir: Directory = self.files.find("etc")
-        # Create the /etc/passwd file
-        passwd_file: File = File("passwd", f"", etc_dir, 0, 0)
+        # Create the /etc/passwd file (rendered from the user table whenever it's read after a change)
+        passwd_file: File = RenderedFile("passwd", self.computer.render_passwd, etc_dir, 0, 0)
 
-        passwd_file.add_event_listener("write", update_passwd)
+        # The identity listeners re-parse the whole file, so only run them once per command. They're methods (not local
+        # functions), so they can be pickled with the rest of the file system
+        passwd_file.add_event_listener("write", self.update_passwd, coalesce=True)
 
         # Create the /etc/shadow file and change its perms (rw-------)
-        shadow_file: File = File("shadow", f"", etc_dir, 0, 0)
+        shadow_file: File = RenderedFile("shadow", self.computer.render_shadow, etc_dir, 0, 0)
         shadow_file.permissions = {"read": ["owner"], "write": ["owner"], "execute": []}
-        shadow_file.add_event_listener("write", update_shadow)
+        shadow_file.add_event_listener("write", self.update_shadow, coalesce=True)
 
         # Create the /etc/groups file
-        group_file: File = File("group", f"root:x:0", etc_dir, 0, 0)
-        group_file.add_event_listener("write", update_group)
+        group_file: File = RenderedFile("group", self.computer.render_group, etc_dir, 0, 0)
+        group_file.add_event_listener("write", self.update_group, coalesce=True)
 
         # /etc/skel (home dir template)
         skel_dir: Directory = Directory("skel", etc_dir, 0, 0)
@@ -744,27 +1629,195 @@ def update_group(file):
         # /etc/resolv.conf
         File("resolv.conf", "nameserver 1.1.1.1", etc_dir, 0, 0)
 
+    def parse_identity_file(self, file: File, field_count: int) -> List[List[str]]:
+        """
+        Split /etc/passwd, /etc/shadow or /etc/group into lines of fields (blank lines are skipped)
+
+        Args:
+            file (File): The file
+            field_count (int): How many fields a line has
+
+        Returns:
+            list: The fields of every line, up to the first malformed one
+        """
+        entries = []
+
+        for item in file.content.split("\n"):
+            subitems = item.split(":")
+            # An item in the list with a length of 1 or less are usually blank lines
+            if len(subitems) <= 1:
+                continue
+
+            # Stop at the first malformed line (everything before it is still applied)
+            if len(subitems) != field_count:
+                break
+
+            entries.append(subitems)
+
+        return entries
+
+    def update_passwd(self, file: File) -> None:
+        """
+        Apply changes written to /etc/passwd (new users, UIDs, primary groups and passwords). The whole file is parsed
+        once and compared with the identity cache, and only the lines that changed something are applied (in one
+        transaction), so saving a big file with one edit in it stays cheap
+
+        Args:
+            file (File): /etc/passwd
+
+        Returns:
+            None
+        """
+        computer = self.computer
+        primary = computer.primary_groups()
+        changed = []
+
+        for username, password, uid, primary_gid in self.parse_identity_file(file, 4):
+            try:
+                uid = int(uid)
+                primary_gid = int(primary_gid)
+            except ValueError:
+                break
+
+            current_uid = computer.usernames.get(username)
+
+            # If the password is 'x', that password is in the /etc/shadow file and should be ignored here
+            if current_uid == uid and primary.get(uid) == primary_gid and \
+                    password in ["x", computer.users[uid].password]:
+                continue
+
+            changed.append((username, password, uid, primary_gid))
+
+        if changed:
+            with computer.identity_transaction():
+                for username, password, uid, primary_gid in changed:
+                    # Now we want to get the user by username
+                    user_lookup = computer.get_user(username=username)
+
+                    # If we don't find the user, that means we added a new user
+                    if not user_lookup.success:
+                        # Make sure no user has the uid
+                        if not computer.get_user(uid=uid).success:
+                            # Add the user
+                            computer.add_user(username, password, uid, plaintext=False)
+                            computer.add_group(name=username, gid=primary_gid)
+                            computer.add_user_to_group(uid, primary_gid, "primary")
+                        continue
+
+                    # We have a user, now lets check if any of the data has changed
+                    user = user_lookup.data
+
+                    if user.password != password and password != "x":
+                        computer.change_user_password(user.uid, password, plaintext=False)
+
+                    if user.uid != uid and computer.change_user_uid(user.uid, uid).success:
+                        user.uid = uid
+
+                    # If the GID changed, we want to:
+                    # 1. Make sure the new GID exists
+                    # 2. Remove the user's old primary gid membership
+                    # 3. Add a the user to the new gid as primary
+                    user_primary_gids = computer.get_user_primary_group(user.uid).data
+
+                    if user_primary_gids != [primary_gid] and computer.get_group(gid=primary_gid).success:
+                        for user_primary_gid in user_primary_gids:
+                            computer.remove_user_from_group(uid=user.uid, gid=user_primary_gid)
+                        computer.add_user_to_group(user.uid, primary_gid, "primary")
+
+        # Will automatically remove incorrect changes
+        computer.sync_user_and_group_files()
+
+    def update_shadow(self, file: File) -> None:
+        """
+        Apply password changes written to /etc/shadow (see `update_passwd()`)
+
+        Args:
+            file (File): /etc/shadow
+
+        Returns:
+            None
+        """
+        computer = self.computer
+        changed = []
+
+        for username, password in self.parse_identity_file(file, 2):
+            uid = computer.usernames.get(username)
+
+            # If the password is 'x', that password is in the /etc/shadow file and should be ignored here
+            if uid is not None and password not in ["x", computer.users[uid].password]:
+                changed.append((uid, password))
+
+        if changed:
+            with computer.identity_transaction():
+                for uid, password in changed:
+                    computer.change_user_password(uid, password, plaintext=False)
+
+        # Will automatically remove incorrect changes
+        computer.sync_user_and_group_files()
+
+    def update_group(self, file: File) -> None:
+        """
+        Apply new groups written to /etc/group (see `update_passwd()`)
+
+        Args:
+            file (File): /etc/group
+
+        Returns:
+            None
+        """
+        computer = self.computer
+        changed = []
+
+        for group_name, password, gid, group_users in self.parse_identity_file(file, 4):
+            try:
+                gid = int(gid)
+            except ValueError:
+                break
+
+            # If we don't find the group, that means we added a new group (as long as no group has the gid)
+            if group_name not in computer.group_names and gid not in computer.groups:
+                changed.append((group_name, gid))
+                # TODO: Add users to the group by last param
+            # TODO: Apply changes to existing groups
+
+        if changed:
+            with computer.identity_transaction():
+                for group_name, gid in changed:
+                    computer.add_group(group_name, gid)
+
+        # Will automatically remove incorrect changes
+        computer.sync_user_and_group_files()
+
     def setup_proc(self) -> None:
         """
-        Sets up:
+        Sets up /proc. Everything in it is generated when it's read (see `procfs`), nothing is stored or saved:
         <ul>
             <li>/proc/uptime - Contains the amount of seconds since the system was booted</li>
+            <li>/proc/meminfo - Memory used by the simulator</li>
+            <li>/proc/loadavg - Load averages, running threads/sessions</li>
+            <li>/proc/net/route - The routing table</li>
+            <li>/proc/&lt;session id&gt;/status - Who a session is running as</li>
         </ul>
 
         Returns:
             None
         """
+        # Already set up (ex. called again after loading a save)
+        if isinstance(self.files.find("proc"), ProcDirectory):
+            return
 
-        # EventHandler functions for /proc/uptime
-        def update_uptime(file):
-            file.content = str((datetime.datetime.now() - self.computer.boot_time).total_seconds())
-
-        proc_dir: Directory = self.files.find("proc")
-        # Create the /proc/uptime file
-        uptime_file: File = File("uptime", f"", proc_dir, 0, 0)
-        uptime_file.permissions = {"read": ["owner", "group", "public"], "write": [], "execute": []}
+        proc_dir = ProcDirectory("proc", self.files, lambda: procfs.entries(self.computer))
 
-        uptime_file.add_event_listener("read", update_uptime, when="before")
+        # After loading a save, the content index is missing the new entries (they're always scanned)
+        if self.content_index is not None:
+            stack = [proc_dir]
+            while stack:
+                current = stack.pop()
+                for child in current.files.values():
+                    if child.is_directory():
+                        stack.append(child)
+                    else:
+                        self.index_file_content(child)
 
     def setup_root(self) -> None:
         """
@@ -819,13 +1872,11 @@ def setup_usr(self) -> None:
 
         self.generate_manpages()
 
-        def generate_manpages(file):
-            self.generate_manpages()
-
         bin_dir: Directory = Directory("bin", usr_dir, 0, 0)
         bin_dir.permissions = {"read": ["owner", "group", "public"], "write": ["owner"],
                                "execute": ["owner", "group", "public"]}
-        bin_dir.add_event_listener("write", generate_manpages)
+        # Installing a package adds several files to /usr/bin, only regenerate the manpages once it's done
+        bin_dir.add_event_listener("write", self.generate_manpages, coalesce=True)
 
     def setup_var(self) -> None:
         """
@@ -862,12 +1913,14 @@ def setup_var(self) -> None:
 
         Directory("html", www_dir, 0, 0)
 
-    def find(self, pathname: str) -> Result:
+    def find(self, pathname: str, follow_symlinks: bool = True) -> Result:
         """
         Try to find a given file anywhere in the file system based on a given `pathname`
 
         Args:
             pathname (str): The full (absolute or relative) path of the file
+            follow_symlinks (bool): If the last part of the path is a `Symlink`, return its target instead of the link
+            (links in the middle of the path are always followed)
 
         Returns:
             Result: A `Result` with the `success` flag set accordingly and the `data` flag with the found `File` or `Directory` if the file was found
@@ -912,27 +1965,54 @@ def find(self, pathname: str) -> Result:
                     return Result(success=True, data=self.computer.fs.files)
 
         # Regular (non-special cases)
-        pathname = pathname.split("/")
         # Check if `pathname` is absolute or relative
-        # Check if the first arg is empty (because we split by /) which means the first arg is empty if it was a "/"
-        if pathname[0] == "":
+        if pathname.startswith("/"):
             # Absolute (start at root dir)
             current_dir = self.files
         else:
             # Relative (based on current dir)
             current_dir = self.computer.sys_getcwd()
 
+        return self.walk(current_dir, pathname, follow_symlinks)
+
+    def walk(self, current_dir: FSBaseObject, pathname: str, follow_symlinks: bool = True, depth: int = 0,
+             dependencies: Optional[list] = None) -> Result:
+        """
+        Walk the given `pathname` one part at a time starting at `current_dir`, checking search permissions and
+        following symbolic links on the way
+
+        Args:
+            current_dir (FSBaseObject): The `Directory` to start at (ignored if `pathname` is absolute)
+            pathname (str): The path to walk
+            follow_symlinks (bool): If the last part of the path is a `Symlink`, return its target instead of the link
+            depth (int): How many links were already followed to get here (to detect loops)
+            dependencies (list, optional): Gets a (`Directory`, generation) pair for every directory a name was looked
+            up in (or that we went up from), see `Symlink.resolve()`
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly and the `data` flag with the found `File` or `Directory` if the file was found
+        """
+        if pathname.startswith("/"):
+            current_dir = self.files
+
+        pathname = pathname.split("/")
+
         # Filter out garbage
         while "" in pathname:
             pathname.remove("")
 
-        for subdir in pathname:
+        # Looked up once for the whole path
+        credentials = self.computer.get_credentials()
+
+        for index, subdir in enumerate(pathname):
             # Special case for current directory (.) (ignore it)
             if subdir == ".":
                 continue
 
             # Special case for (..) (go to parent)
             elif subdir == "..":
+                if dependencies is not None and current_dir.is_directory():
+                    dependencies.append((current_dir, current_dir.generation))
                 # Check if we're at the root
                 if not current_dir.parent:
                     current_dir = self.files
@@ -942,18 +2022,727 @@ def find(self, pathname: str) -> Result:
             else:
                 if current_dir.is_file():
                     return Result(success=True, data=current_dir)
+                # We need search (execute) permission on every directory we look up a name in
+                if dependencies is not None:
+                    dependencies.append((current_dir, current_dir.generation))
+                if not current_dir.can_search(self.computer, credentials):
+                    return Result(success=False, message=ResultMessages.NOT_ALLOWED)
                 current_dir = current_dir.find(subdir)
                 if not current_dir:
                     return Result(success=False, message=ResultMessages.NOT_FOUND)
 
+                if current_dir.is_symlink() and (follow_symlinks or index < len(pathname) - 1):
+                    resolve_result = current_dir.resolve(self, depth, dependencies)
+                    if not resolve_result.success:
+                        return resolve_result
+                    current_dir = resolve_result.data
+
         # This only runs when we successfully found
         return Result(success=True, data=current_dir)
 
-    def generate_manpages(self):
+    def mount_host(self, host_dir: str, target: Directory) -> Result:
+        """
+        Expose a directory of the host machine (read-only) at the given (empty) `Directory`.
+        Only the tree is copied in: every host file becomes a `HostFile` that reads its content from the host when
+        needed. The host directory has to be inside of one of the directories in `MOUNT_ROOTS_VARIABLE`, and links on
+        the host are skipped (so nothing outside of it can be reached)
+
+        Args:
+            host_dir (str): The path of the directory on the host
+            target (Directory): The (empty) `Directory` to mount it on
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly
+        """
+        if not os.path.isdir(host_dir):
+            return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+        host_dir = os.path.realpath(host_dir)
+
+        if not is_mountable(host_dir):
+            return Result(success=False, message=ResultMessages.NOT_ALLOWED_READ)
+
+        if target.files:
+            return Result(success=False, message=ResultMessages.NOT_EMPTY)
+
+        # Host path -> the `Directory` it became
+        directories = {host_dir: target}
+
+        for current, dir_names, file_names in os.walk(host_dir):
+            parent = directories[current]
+
+            for dir_name in sorted(dir_names):
+                host_path = os.path.join(current, dir_name)
+                # `os.walk()` doesn't go into linked directories, they'd only be empty
+                if not os.path.islink(host_path):
+                    directories[host_path] = HostDirectory(dir_name, parent, target.owner, target.group_owner)
+
+            for file_name in sorted(file_names):
+                host_path = os.path.join(current, file_name)
+                # Skip links (they could point outside of the mount), sockets, etc
+                if os.path.isfile(host_path) and not os.path.islink(host_path):
+                    HostFile(file_name, host_path, parent, target.owner, target.group_owner)
+
+        self.mounts[target.pwd()] = host_dir
+
+        return Result(success=True)
+
+    def remount_hosts(self) -> None:
+        """
+        Mount every host directory in `mounts` again (host files aren't saved, see `HostFile`).
+        Mounts that can't be mounted anymore (the host directory or the mount point is gone, or it isn't allowed) are
+        dropped
+
+        Returns:
+            None
+        """
+        for mount_point, host_dir in list(self.mounts.items()):
+            del self.mounts[mount_point]
+            find_target = self.find(mount_point)
+
+            if find_target.success and find_target.data.is_directory():
+                self.mount_host(host_dir, find_target.data)
+
+    def change_tree(self, root: FSBaseObject, mode: Optional[ModeChange] = None, owner: Optional[int] = None,
+                    group: Optional[int] = None) -> Result:
+        """
+        Change the mode and/or owner of `root` and everything inside of it in a single walk (`chmod -R`/`chown -R`).
+        Permission is checked once per node with the caller's identity looked up once, symbolic links aren't followed,
+        and sizes are moved to the new owner with one pass up the tree instead of one per file.
+        Listeners bound to a changed node hear about it once, while the recursive listeners of the parent directories
+        get a single event for the whole subtree (fired on `root`)
+
+        Args:
+            root (FSBaseObject): The `File`/`Directory` to start at
+            mode (ModeChange, optional): The mode change to apply
+            owner (int, optional): The UID of the new owner (the caller must make sure the user exists)
+            group (int, optional): The GID of the new group owner (the caller must make sure the group exists)
+
+        Returns:
+            Result: A `Result` with the `success` flag set if every node was changed, and the `data` flag containing
+            the paths of the nodes we weren't allowed to change (or descend into)
+        """
+        credentials = self.computer.get_credentials()
+        uid = credentials.uid
+        euid = credentials.euid
+        caller_groups = credentials.real_groups
+        events = (["change_perm"] if mode else []) + (["change_owner"] if owner is not None or group is not None else [])
+
+        failed = []
+        # Nodes with their own listeners for one of our events (they're told after the walk)
+        listened = []
+
+        def change(node: FSBaseObject) -> Tuple[Dict[int, int], bool]:
+            """Change `node` itself, returning how the owners' usage moved and if we can descend into it"""
+            usage = {}
+            allowed = True
+
+            if mode and uid not in [node.owner, 0]:
+                allowed = False
+            if (owner is not None or group is not None) and not (euid in [node.owner, 0] or
+                                                                    node.group_owner in caller_groups):
+                allowed = False
+
+            # We can descend if we could search the directory before or after the change (ex. `chmod -R a-x` still
+            # reaches the children and `chmod -R u+x` gets them back)
+            can_search = node.is_directory() and node.can_search(self.computer, credentials)
+
+            if not allowed:
+                failed.append(node.pwd())
+            else:
+                if mode:
+                    node.permissions = mode_to_permissions(mode.apply(permissions_to_mode(node.permissions),
+                                                                      node.is_directory()))
+
+                if owner is not None and owner != node.owner:
+                    if node.is_file():
+                        for used_uid, used in node.get_usage().items():
+                            usage[used_uid] = usage.get(used_uid, 0) - used
+                            usage[owner] = usage.get(owner, 0) + used
+                    # Skip the setter, the sizes are moved once for the whole tree
+                    node._owner = owner
+                    node._search_cache.clear()
+                    bump_namespace_generation(node)
+
+                if group is not None:
+                    node.group_owner = group
+
+                if node._events is not None and any(node._events.listeners.get(x) for x in events):
+                    listened.append(node)
+
+            if node.is_directory() and not can_search:
+                can_search = node.can_search(self.computer, credentials)
+
+            if not can_search and node.is_directory() and allowed:
+                failed.append(node.pwd())
+
+            return usage, can_search
+
+        def add_usage(total: Dict[int, int], usage: Dict[int, int]) -> None:
+            for used_uid, delta in usage.items():
+                total[used_uid] = total.get(used_uid, 0) + delta
+
+        # The usage of the directories is changed in place while we walk, so no other size change can run in between
+        with usage_lock:
+            usage = {}
+            # (directory we descended into, how the usage moved in it, how it moved in its children, parent's entry)
+            # Parents always come before their children. An explicit stack, so deep trees can't hit the recursion limit
+            descended = []
+            stack = [(root, None)]
+
+            while stack:
+                node, parent = stack.pop()
+                node_usage, can_search = change(node)
+
+                if can_search:
+                    entry = (node, node_usage, {}, parent)
+                    descended.append(entry)
+                    # Reversed, so the children are changed in order
+                    for child in reversed(list(node.files.values())):
+                        if not child.is_symlink():
+                            stack.append((child, entry))
+                else:
+                    add_usage(parent[2] if parent else usage, node_usage)
+
+            # The children's usage only has to be added to their directory, its parent gets it through the directory's
+            # own total (deepest directories first)
+            for node, node_usage, child_usage, parent in reversed(descended):
+                for used_uid, delta in child_usage.items():
+                    used = node.owner_usage.get(used_uid, 0) + delta
+                    if used:
+                        node.owner_usage[used_uid] = used
+                    else:
+                        node.owner_usage.pop(used_uid, None)
+                add_usage(node_usage, child_usage)
+                add_usage(parent[2] if parent else usage, node_usage)
+
+            if root.parent:
+                root.parent.apply_usage({x: y for x, y in usage.items() if y})
+
+        for event in events:
+            for node in listened:
+                node.events.publish(node, event)
+
+            # One event for the whole subtree (for indexes and recursive watches above it)
+            parent = root.parent
+            while parent:
+                if parent._events is not None and parent._events.recursive:
+                    parent._events.publish(root, event, recursive_only=True)
+                parent = parent.parent
+
+        return Result(success=not failed, message=None if not failed else ResultMessages.NOT_ALLOWED, data=failed)
+
+    def get_usage(self, uid: int) -> int:
+        """
+        Get the amount of bytes used by the files of the given user, anywhere in the file system
+
+        Args:
+            uid (int): The UID of the user
+
+        Returns:
+            int: The amount of bytes used
+        """
+        refresh_stale_files(self.files)
+        return self.files.owner_usage.get(uid, 0)
+
+    def check_quota(self, uid: int, additional: int) -> Result:
+        """
+        Check if the given user's files can grow by `additional` bytes without going over their quota or filling the disk
+
+        Args:
+            uid (int): The UID of the owner of the growing file
+            additional (int): The amount of bytes being added (can be negative)
+
+        Returns:
+            Result: A `Result` with the `success` flag set accordingly (`NO_SPACE` if there's no space left)
+        """
+        if additional <= 0:
+            return Result(success=True)
+
+        if self.files.size + additional > self.capacity:
+            return Result(success=False, message=ResultMessages.NO_SPACE)
+
+        quota = self.quotas.get(uid)
+        if quota is not None and self.get_usage(uid) + additional > quota:
+            return Result(success=False, message=ResultMessages.NO_SPACE)
+
+        return Result(success=True)
+
+    def update_path_index(self, use_trigrams: bool = False) -> PathIndex:
+        """
+        (Re)build the path index (the `locate` database) from the whole file system.
+        Once built, the index is kept up to date through recursive event listeners on /, so it only needs to be rebuilt
+        to switch trigrams on or off
+
+        Args:
+            use_trigrams (bool): If the index should also keep a trigram map (faster substring searches, more memory)
+
+        Returns:
+            PathIndex: The newly built index
+        """
+        if self.path_index is None:
+            self.files.add_event_listener("create", self.index_node, recursive=True)
+            self.files.add_event_listener("move", self.index_node, recursive=True)
+            self.files.add_event_listener("delete", self.unindex_node, when="before", recursive=True)
+            self.files.add_event_listener("move", self.unindex_node, when="before", recursive=True)
+
+        self.path_index = PathIndex(use_trigrams)
+        self.index_node(self.files)
+
+        return self.path_index
+
+    def index_node(self, node: FSBaseObject) -> None:
+        """
+        Add a `File`/`Directory` (and everything inside of it) to the path index
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` to add
+
+        Returns:
+            None
+        """
+        stack = [(node, node.pwd())]
+        paths = []
+
+        while stack:
+            current, path = stack.pop()
+            paths.append(path)
+
+            # /proc is generated at runtime, there's no point in indexing it (same as `PRUNEPATHS` in updatedb.conf)
+            if current.is_directory() and not current.virtual:
+                base = "" if path == "/" else path
+                stack.extend((child, f"{base}/{name}") for name, child in current.files.items())
+
+        # Sorted once (a single file is simply inserted)
+        if len(paths) == 1:
+            self.path_index.add(paths[0])
+        else:
+            self.path_index.add_many(paths)
+
+    def unindex_node(self, node: FSBaseObject) -> None:
+        """
+        Remove a `File`/`Directory` (and everything inside of it) from the path index
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` to remove
+
+        Returns:
+            None
+        """
+        self.path_index.remove(node.pwd())
+
+    def update_content_index(self, max_entries: int = MAX_CONTENT_ENTRIES) -> ContentIndex:
+        """
+        (Re)build the trigram index of every file's content.
+        Once built, the index is kept up to date through recursive event listeners on / (a file is reindexed once per
+        command, no matter how many times it was written to). If the index ever grows past `max_entries`, it's dropped
+        and searches read every file until it's built again
+
+        Args:
+            max_entries (int): The memory cap of the index (see `ContentIndex`)
+
+        Returns:
+            ContentIndex: The newly built index
+        """
+        if self.content_index is None:
+            self.files.add_event_listener("create", self.index_content, coalesce=True, recursive=True)
+            self.files.add_event_listener("write", self.index_content, coalesce=True, recursive=True)
+            self.files.add_event_listener("delete", self.unindex_content, when="before", recursive=True)
+
+        self.content_index = ContentIndex(max_entries)
+        self.index_content(self.files)
+
+        return self.content_index
+
+    def disable_content_index(self) -> None:
+        """
+        Drop the content index (searches go back to reading every file)
+
+        Returns:
+            None
+        """
+        if self.content_index is None:
+            return
+
+        self.files.events.unsubscribe("create", self.index_content)
+        self.files.events.unsubscribe("write", self.index_content)
+        self.files.events.unsubscribe("delete", self.unindex_content)
+        self.content_index = None
+
+    def index_content(self, node: FSBaseObject) -> None:
+        """
+        (Re)index the content of a `File` (or every `File` inside of a `Directory`).
+        Moves don't need to do anything since the index is keyed by node, not path
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that was created or written to
+
+        Returns:
+            None
+        """
+        if node is not self.files:
+            # A "write" on a directory is an entry being added/removed, and new directories are always empty (their
+            # entries fire their own events), so only files need anything done
+            # Events are coalesced until the command is done, by then the file could have been deleted
+            if node.is_file() and self.is_attached(node):
+                self.index_file_content(node)
+            return
+
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for child in current.files.values():
+                if child.is_directory():
+                    stack.append(child)
+                else:
+                    self.index_file_content(child)
+
+    def is_attached(self, node: FSBaseObject) -> bool:
+        """
+        Check if a `File`/`Directory` is still part of the file system (it, or one of its parents, wasn't deleted)
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory`
+
+        Returns:
+            bool: If it can be reached from /
+        """
+        current = node
+        while current.parent is not None:
+            if current.parent.files.get(current.name) is not current:
+                return False
+            current = current.parent
+
+        return current is self.files
+
+    def index_file_content(self, file: FSBaseObject) -> None:
+        """
+        (Re)index the content of a single `File`
+
+        Args:
+            file (FSBaseObject): The `File` (links are skipped)
+
+        Returns:
+            None
+        """
+        if file.is_file():
+            # Host files can be huge and /proc is generated when it's read, so they're always scanned instead
+            # Rendered files change without any events, so they're scanned too
+            if isinstance(file, (HostFile, RenderedFile)) or file.virtual:
+                self.content_index.add(file, None)
+            else:
+                self.content_index.add(file, file.content)
+
+    def unindex_content(self, node: FSBaseObject) -> None:
+        """
+        Remove a `File` (or every `File` inside of a `Directory`) from the content index
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` about to be deleted
+
+        Returns:
+            None
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.is_directory():
+                stack.extend(current.files.values())
+            else:
+                self.content_index.remove(current)
+
+    def capture(self, states: Dict[int, tuple]) -> None:
+        """
+        Add the state of the file system, its indexes and every saved `File`/`Directory` in it to `states` (see
+        `Computer.capture_world()`). Every node is captured at once, so sizes always match the content
+
+        Args:
+            states (dict): id() -> (the object, its `__getstate__()`)
+
+        Returns:
+            None
+        """
+        states[id(self)] = (self, self.__getstate__())
+
+        for index in [self.path_index, self.content_index]:
+            if index is not None:
+                states[id(index)] = (index, index.__getstate__())
+
+        stack = [self.files]
+        while stack:
+            node = stack.pop()
+            state = node.__getstate__()
+            states[id(node)] = (node, state)
+
+            if node.is_directory():
+                # Only what's saved (generated and host nodes aren't)
+                stack.extend(state["files"].values())
+
+    def attach_journal(self, journal: Journal) -> None:
+        """
+        Record every change to the file system in the given journal, through recursive event listeners on /
+        (replaces the journal that was attached before)
+
+        Args:
+            journal (Journal): The journal of the save
+
+        Returns:
+            None
+        """
+        if self.journal is None:
+            self.files.add_event_listener("create", self.journal_node, recursive=True)
+            self.files.add_event_listener("write", self.journal_content, recursive=True)
+            self.files.add_event_listener("move", self.journal_tree, recursive=True)
+            self.files.add_event_listener("change_perm", self.journal_attributes, recursive=True)
+            self.files.add_event_listener("change_owner", self.journal_attributes, recursive=True)
+            self.files.add_event_listener("delete", self.journal_removal, when="before", recursive=True)
+            self.files.add_event_listener("move", self.journal_removal, when="before", recursive=True)
+
+        self.journal = journal
+
+    def detach_journal(self) -> None:
+        """
+        Stop recording changes (the next save writes a full snapshot)
+
+        Returns:
+            None
+        """
+        if self.journal is None:
+            return
+
+        self.files.events.unsubscribe("create", self.journal_node)
+        self.files.events.unsubscribe("write", self.journal_content)
+        self.files.events.unsubscribe("move", self.journal_tree)
+        self.files.events.unsubscribe("move", self.journal_removal)
+        self.files.events.unsubscribe("change_perm", self.journal_attributes)
+        self.files.events.unsubscribe("change_owner", self.journal_attributes)
+        self.files.events.unsubscribe("delete", self.journal_removal)
+        self.journal = None
+
+    def journal_node(self, node: FSBaseObject, tree: bool = False) -> None:
+        """
+        Record the state of a `File`/`Directory` that was created (or written to). The state is read when the journal is
+        written, so any amount of changes between two saves are recorded once
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that changed
+            tree (bool): If everything inside of a `Directory` should be recorded too (after a move)
+
+        Returns:
+            None
+        """
+        if not is_journaled(node):
+            return
+
+        path = node.pwd()
+        # It's recorded again under its new path if it's moved, and it's removed if its path is reused
+        self.journal.record(("put", self.computer.id, path),
+                            lambda: self.node_state(node, tree) if node.pwd() == path else None)
+
+    def journal_content(self, node: FSBaseObject) -> None:
+        """
+        Record the content of a `File` that was written to
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that was written to
+
+        Returns:
+            None
+        """
+        # A "write" on a directory is an entry being added/removed, the entries fire their own events
+        if node.is_file():
+            self.journal_node(node)
+
+    def journal_tree(self, node: FSBaseObject) -> None:
+        """
+        Record a `File`/`Directory` (and everything inside of it) under its new path, after a move
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that was moved
+
+        Returns:
+            None
+        """
+        self.journal_node(node, tree=True)
+
+    def journal_attributes(self, node: FSBaseObject) -> None:
+        """
+        Record the metadata (`NODE_ATTRIBUTES`) of a `File`/`Directory` and everything inside of it (recursive changes
+        only fire one event for the whole tree)
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that changed
+
+        Returns:
+            None
+        """
+        if node.virtual:
+            return
+
+        path = node.pwd()
+        self.journal.record(("attributes", self.computer.id, path),
+                            lambda: self.node_state(node, True, False) if node.pwd() == path else None)
+
+    def journal_removal(self, node: FSBaseObject) -> None:
+        """
+        Record that a path is about to be removed (the `File`/`Directory` is deleted or moved away)
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that's removed
+
+        Returns:
+            None
+        """
+        if node.virtual:
+            return
+
+        path = node.pwd()
+        # Moves fire this before they check if they can happen, so it's dropped if the node is still there
+        self.journal.record(("delete", self.computer.id, path),
+                            lambda: None if self.find(path, follow_symlinks=False).data is node else True)
+
+    def node_state(self, node: FSBaseObject, tree: bool = False, content: bool = True) -> dict:
+        """
+        Get the state of a `File`/`Directory` to record in a journal (see `apply_journal_record()`)
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory`
+            tree (bool): If the state of everything inside of a `Directory` should be included
+            content (bool): If the content of `File`s (and the targets of links) should be included, or only their
+            metadata
+
+        Returns:
+            dict: The metadata of the node, and its type, content and entries (when asked for)
+        """
+        state = {"attributes": {name: getattr(node, name) for name in NODE_ATTRIBUTES}}
+
+        if content:
+            state["type"] = type(node).__name__
+            if node.is_file():
+                state["content"] = node.content
+            elif node.is_symlink():
+                state["target"] = node.target
+
+        if tree and node.is_directory():
+            children = list(node.files.values())
+            # Metadata changes apply to every (non generated) node, only the recorded types are created on replay
+            state["files"] = {child.name: self.node_state(child, tree, content) for child in children
+                              if (is_journaled(child) if content else not child.virtual)}
+
+        return state
+
+    def apply_journal_record(self, kind: str, path: str, state: Optional[dict]) -> None:
+        """
+        Replay a record of a `Journal` (when a save is loaded). Records that don't apply anymore (ex. their
+        `Directory` is gone) are skipped
+
+        Args:
+            kind (str): "put" (create/replace the node), "attributes" (change the metadata) or "delete"
+            path (str): The path of the `File`/`Directory`
+            state (dict): The state recorded by `node_state()`
+
+        Returns:
+            None
+        """
+        find_result = self.find(path, follow_symlinks=False)
+        node = find_result.data if find_result.success else None
+
+        if kind == "delete":
+            if node is not None and node.parent and not node.virtual:
+                self.remove_journaled_node(node)
+        elif kind == "attributes":
+            if node is not None and not node.virtual:
+                self.restore_attributes(node, state)
+        elif kind == "put":
+            parent_path, name = path.rsplit("/", 1)
+            find_parent = self.find(parent_path or "/", follow_symlinks=False)
+
+            if name and find_parent.success and find_parent.data.is_directory() and not find_parent.data.virtual:
+                self.restore_node(find_parent.data, name, state)
+            elif path == "/":
+                self.restore_attributes(self.files, state)
+
+    def restore_node(self, parent: Directory, name: str, state: dict) -> None:
+        """
+        Create (or replace) a `File`/`Directory` from its recorded state (see `node_state()`)
+
+        Args:
+            parent (Directory): The `Directory` to put it in
+            name (str): The name of the `File`/`Directory`
+            state (dict): The recorded state
+
+        Returns:
+            None
+        """
+        node = parent.files.get(name)
+        node_type = JOURNALED_TYPES[state["type"]]
+        attributes = state["attributes"]
+
+        # Links are always replaced, their target can't change
+        if node is not None and (type(node) is not node_type or node.is_symlink()):
+            self.remove_journaled_node(node)
+            node = None
+
+        if node is None:
+            if node_type is File:
+                node = File(name, state["content"], parent, attributes["owner"], attributes["group_owner"])
+            elif node_type is Symlink:
+                node = Symlink(name, state["target"], parent, attributes["owner"], attributes["group_owner"])
+            else:
+                node = Directory(name, parent, attributes["owner"], attributes["group_owner"])
+        elif node.is_file() and node.content != state["content"]:
+            node.content = state["content"]
+            node.update_size()
+            node.handle_event("write")
+
+        for attribute in NODE_ATTRIBUTES:
+            setattr(node, attribute, attributes[attribute])
+
+        for child_name, child_state in state.get("files", {}).items():
+            self.restore_node(node, child_name, child_state)
+
+    def restore_attributes(self, node: FSBaseObject, state: dict) -> None:
+        """
+        Restore the metadata of a `File`/`Directory` (and the entries in `state` inside of it)
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory`
+            state (dict): The state recorded by `node_state()`
+
+        Returns:
+            None
+        """
+        for attribute in NODE_ATTRIBUTES:
+            setattr(node, attribute, state["attributes"][attribute])
+
+        for child_name, child_state in state.get("files", {}).items():
+            child = node.files.get(child_name)
+            if child is not None and not child.virtual:
+                self.restore_attributes(child, child_state)
+
+    def remove_journaled_node(self, node: FSBaseObject) -> None:
+        """
+        Remove a `File`/`Directory` while a journal is replayed (no permissions are checked, the change was already
+        allowed when it was recorded)
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` to remove
+
+        Returns:
+            None
+        """
+        node.handle_event("delete", when="before")
+        if node.parent.remove_file(node).success:
+            node.handle_event("delete")
+
+    def generate_manpages(self, file: Optional[File] = None):
         """
         Loop through all available modules and import them. After, use the module.parse_args(doc=True) to generate
         a manpage from the available help information.
 
+        Args:
+            file (File, optional): The file that fired the event, when called as a listener (unused)
+
         Returns:
             None
         """
@@ -1060,7 +2849,6 @@ def copy(computer, src_path: str, dst_path: str) -> Result:
                 else:
                     new_filename = new_file_name
                     new_file = File(new_filename, src.content, to_write, computer.sys_getuid(), computer.sys_getgid())
-                    new_file.events = src.events
                     # We have to do this so the permissions work no matter if we're overwriting or not
                     to_write = new_file
 
@@ -1098,7 +2886,6 @@ def copy(computer, src_path: str, dst_path: str) -> Result:
                     return Result(success=False, message=ResultMessages.NOT_ALLOWED_WRITE)
                 else:
                     new_dir = Directory(new_file_name, to_write, computer.sys_getuid(), computer.sys_getgid())
-                    new_dir.events = to_write.events
                     # Set a temporary write permission no matter what the new dir's permissions were so we can add its children
                     new_dir.permissions["write"] = ["owner"]
                     # Go through all the source's files and copy them into the new dir
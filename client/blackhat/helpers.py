@@ -42,6 +42,12 @@ class ResultMessages(Enum):
     """The argument given to the command was invalid for one reason or another"""
     NOT_CONNECTED = 16
     """The socket we're trying to write to isn't connected to anything"""
+    TOO_MANY_LINKS = 17
+    """Too many symbolic links were followed while resolving a path (probably a loop)"""
+    NO_SPACE = 18
+    """There's no space left on the disk, or the user's quota is used up (`ENOSPC`/`EDQUOT`)"""
+    TOO_LARGE = 19
+    """The file is too big to be read all at once, it has to be read in ranges (`EFBIG`)"""
 
 
 class Result:
@@ -88,6 +94,28 @@ class RebootMode(IntFlag):
     LINUX_REBOOT_CMD_RESTART = 1 << 1  # Reboot the computer
 
 
+class InotifyMask(IntFlag):
+    """
+    Event types for the `sys_inotify_add_watch` system call (and the `mask` of an `inotify_event`)
+    """
+    IN_ACCESS = 1 << 0  # File was read from
+    IN_MODIFY = 1 << 1  # File was written to
+    IN_ATTRIB = 1 << 2  # Permissions or owner changed
+    IN_MOVED_FROM = 1 << 6  # File was moved out of a watched directory
+    IN_MOVED_TO = 1 << 7  # File was moved into a watched directory
+    IN_CREATE = 1 << 8  # File/directory created in a watched directory
+    IN_DELETE = 1 << 9  # File/directory deleted from a watched directory
+    IN_DELETE_SELF = 1 << 10  # The watched file/directory itself was deleted
+    IN_MOVE_SELF = 1 << 11  # The watched file/directory itself was moved
+    IN_Q_OVERFLOW = 1 << 14  # The watch's queue filled up and events were dropped
+    IN_IGNORED = 1 << 15  # The watch was removed (explicitly or because its file was deleted)
+    IN_RECURSIVE = 1 << 28  # Watch everything inside of the directory, not just its direct children (not in Linux)
+    IN_ISDIR = 1 << 30  # The subject of the event is a directory
+
+    IN_MOVE = IN_MOVED_FROM | IN_MOVED_TO
+    IN_ALL_EVENTS = IN_ACCESS | IN_MODIFY | IN_ATTRIB | IN_MOVE | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+
 class timeval:
     def __init__(self, tv_sec, tv_usec):
         """
@@ -103,7 +131,7 @@ def __init__(self, tv_sec, tv_usec):
 
 class stat_struct:
     def __init__(self, st_isfile: bool, st_mode: int, st_nlink: int, st_uid: int, st_gid: int, st_size: float,
-                 st_atime: int, st_mtime: int, st_ctime: int, st_path: str):
+                 st_atime: int, st_mtime: int, st_ctime: int, st_path: str, st_islink: bool = False):
         """
         A 'struct' object containing info about a `File`/`Directory`
 
@@ -118,6 +146,7 @@ def __init__(self, st_isfile: bool, st_mode: int, st_nlink: int, st_uid: int, st
             st_mtime (int): The unix timestamp of the last time the item's content was modified
             st_ctime (int): The unix timestamp of the last time the item was modified in any way (content, metadata, perms, etc)
             st_path (str): The full path of the item in the file system
+            st_islink (bool): If the item is a symbolic link (only possible with `lstat`)
         """
         self.st_isfile: bool = st_isfile  # Bool telling if file or is dir
         self.st_mode: int = st_mode  # chmod mode
@@ -129,6 +158,7 @@ def __init__(self, st_isfile: bool, st_mode: int, st_nlink: int, st_uid: int, st
         self.st_mtime: int = st_mtime  # Last modified time (unix time stamp)
         self.st_ctime: int = st_ctime  # Last file status change time (unix time stamp)
         self.st_path: str = st_path  # Path in the filesystem
+        self.st_islink: bool = st_islink  # Bool telling if symbolic link
         # Access: Read
         # Modified: Write (content)
         # Change: Change metadata (perms)
@@ -145,6 +175,51 @@ def __str__(self):
         output += f"    st_mtime: {self.st_mtime}\n"
         output += f"    st_ctime: {self.st_ctime}\n"
         output += f"    st_path: {self.st_path}\n"
+        output += f"    st_islink: {self.st_islink}\n"
+        output += "}"
+        return output
+
+
+class inotify_event:
+    def __init__(self, wd: int, mask: int, name: str = ""):
+        """
+        A 'struct' object describing a single change to a watched `File`/`Directory`
+
+        Args:
+            wd (int): The watch descriptor the event was queued on
+            mask (int): The `InotifyMask` bits describing what happened
+            name (str): The path of the changed item relative to the watched `Directory` (empty if the watched item itself changed)
+        """
+        self.wd: int = wd
+        self.mask: int = mask
+        self.name: str = name
+
+    def __str__(self):
+        return f"inotify_event(wd={self.wd}, mask={InotifyMask(self.mask)!r}, name={self.name!r})"
+
+
+class statfs_struct:
+    def __init__(self, f_bsize: int, f_blocks: int, f_bfree: int, f_bavail: int):
+        """
+        A 'struct' object containing info about a mounted file system
+
+        Args:
+            f_bsize (int): The size of a block in bytes
+            f_blocks (int): The total amount of blocks in the file system
+            f_bfree (int): The amount of free blocks
+            f_bavail (int): The amount of free blocks available to unprivileged users
+        """
+        self.f_bsize: int = f_bsize
+        self.f_blocks: int = f_blocks
+        self.f_bfree: int = f_bfree
+        self.f_bavail: int = f_bavail
+
+    def __str__(self):
+        output = "{\n"
+        output += f"    f_bsize: {self.f_bsize}\n"
+        output += f"    f_blocks: {self.f_blocks}\n"
+        output += f"    f_bfree: {self.f_bfree}\n"
+        output += f"    f_bavail: {self.f_bavail}\n"
         output += "}"
         return output
 
@@ -203,4 +278,29 @@ def make_temp_file(filename=None, mode="w") -> Optional[Tuple[TextIO, str]]:
 
     # Create the file
     f = open(temp_file, mode)
-    return f, temp_file
\ No newline at end of file
+    return f, temp_file
+
+def human_readable_size(size: int) -> str:
+    """
+    Format a size in bytes the way `du -h`/`df -h` do (powers of 1024, one decimal under 10)
+
+    Args:
+        size (int): The size in bytes
+
+    Returns:
+        str: The formatted size (ex. 4.0K, 12M)
+    """
+    if size < 1024:
+        return str(size)
+
+    for unit in "KMGTP":
+        size /= 1024
+        if size < 1024 or unit == "P":
+            break
+
+    # Always round up (like coreutils), so 1.01K is 1.1K
+    rounded = -(-size * 10 // 1) / 10
+    if rounded < 10:
+        return f"{rounded:.1f}{unit}"
+
+    return f"{-(-size // 1):.0f}{unit}"
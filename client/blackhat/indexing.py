@@ -0,0 +1,452 @@
+import re
+from bisect import bisect_left, insort
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, List, Optional, Set
+
+GLOB_CHARACTERS = re.compile(r"[*?\[]")
+# Splits a glob into its literal runs (drops `*`, `?` and `[...]` character classes)
+GLOB_SPLIT = re.compile(r"\[[^\]]*\]|[*?\[]")
+
+MAX_CONTENT_ENTRIES = 4_000_000
+"""int: The default cap on (trigram, file) pairs in a `ContentIndex` (roughly 100-200 MB of sets)"""
+MAX_INDEXED_FILE_SIZE = 1 << 20
+"""int: Files with more characters than this aren't indexed (they're always scanned)"""
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Get every 3 character substring of the given `text`
+
+    Args:
+        text (str): The text to split
+
+    Returns:
+        set: A set of all the (unique) trigrams in `text`
+    """
+    return {text[x:x + 3] for x in range(len(text) - 2)}
+
+
+def required_trigrams(literals: Iterable[str]) -> Set[str]:
+    """
+    Get the trigrams that any text matching all the given `literals` must contain
+
+    Args:
+        literals (list): Strings that are known to be part of the match
+
+    Returns:
+        set: The trigrams of all the literals
+    """
+    required = set()
+
+    for literal in literals:
+        required |= trigrams(literal)
+
+    return required
+
+
+def required_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Find the literal strings that every match of a (Python) regular expression must contain.
+    Only handles the common cases (plain text, `.`, classes, quantifiers); anything harder is skipped, not guessed
+
+    Args:
+        pattern (str): The regular expression
+
+    Returns:
+        list: The required literals, or `None` if a match doesn't need any (ex. top level alternation `a|b`)
+    """
+    literals = []
+    current = ""
+    # How many groups we're in. Groups can be optional or contain alternations, so nothing inside of them is required
+    depth = 0
+    index = 0
+
+    def flush():
+        nonlocal current
+        if current:
+            literals.append(current)
+        current = ""
+
+    while index < len(pattern):
+        char = pattern[index]
+        literal = None
+
+        if char == "\\":
+            escaped = pattern[index + 1:index + 2]
+            index += 2
+            # \d, \w, \b, back references, etc aren't literal
+            if escaped and not escaped.isalnum():
+                literal = escaped
+            else:
+                flush()
+        elif char == "[":
+            flush()
+            # Skip the whole class (a `]` right after `[` or `[^` is part of the class)
+            index += 1
+            if pattern[index:index + 1] == "^":
+                index += 1
+            if pattern[index:index + 1] == "]":
+                index += 1
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+            index += 1
+        elif char == "(":
+            flush()
+            depth += 1
+            index += 1
+        elif char == ")":
+            flush()
+            depth = max(depth - 1, 0)
+            index += 1
+        elif char == "|":
+            if depth == 0:
+                return None
+            index += 1
+        elif char in "*?{":
+            # The previous character is optional (or repeated some amount of times we don't check)
+            current = current[:-1]
+            flush()
+            if char == "{":
+                end = pattern.find("}", index)
+                index = end + 1 if end != -1 else index + 1
+            else:
+                index += 1
+        elif char in ".^$+":
+            flush()
+            index += 1
+        else:
+            literal = char
+            index += 1
+
+        if literal is not None and depth == 0:
+            current += literal
+
+    flush()
+
+    return literals
+
+
+class ContentIndex:
+    def __init__(self, max_entries: int = MAX_CONTENT_ENTRIES) -> None:
+        """
+        A trigram index over the content of files, used to find which files could contain some text without reading
+        every file. Files are keyed by their node, so moving/renaming them doesn't touch the index.
+        If the index would grow past `max_entries`, it's dropped and marked as overflowed (searches fall back to
+        scanning every file). It stays that way until it's built again (`updatedb --content`, with a bigger limit)
+
+        Args:
+            max_entries (int): The most (trigram, file) pairs to keep
+        """
+        self.max_entries: int = max_entries
+        self.postings: Dict[str, Set[object]] = {}
+        """dict: Lowercase trigram -> the files containing it"""
+        self.file_trigrams: Dict[object, Set[str]] = {}
+        """dict: File -> its trigrams (needed to remove it again)"""
+        self.unindexed: Set[object] = set()
+        """set: Files that are too big to index, they're always candidates"""
+        self.entries: int = 0
+        """int: The amount of (trigram, file) pairs in the index"""
+        self.overflowed: bool = False
+        """bool: If the index went over `max_entries` (it's empty and unusable from then on)"""
+
+    def __getstate__(self) -> dict:
+        # Generated (/proc) files aren't part of saves (see `Directory.__getstate__()`), so they're left out here too
+        state = self.__dict__.copy()
+        state["unindexed"] = {file for file in self.unindexed if not file.virtual}
+        # Copies of the containers, so the state doesn't change while it's pickled (see `StandardFS.capture()`)
+        state["postings"] = {trigram: set(files) for trigram, files in self.postings.items()}
+        state["file_trigrams"] = dict(self.file_trigrams)
+        return state
+
+    def __len__(self) -> int:
+        return len(self.file_trigrams) + len(self.unindexed)
+
+    def add(self, file, content: Optional[str]) -> None:
+        """
+        (Re)index a file
+
+        Args:
+            file (File): The file to index
+            content (str, optional): Its content (`None` if it shouldn't be read, ex. a huge host file)
+
+        Returns:
+            None
+        """
+        self.remove(file)
+
+        if self.overflowed:
+            return
+
+        if content is None or len(content) > MAX_INDEXED_FILE_SIZE:
+            self.unindexed.add(file)
+            return
+
+        file_trigrams = trigrams(content.lower())
+
+        if self.entries + len(file_trigrams) > self.max_entries:
+            self.overflow()
+            return
+
+        self.file_trigrams[file] = file_trigrams
+        self.entries += len(file_trigrams)
+
+        for trigram in file_trigrams:
+            self.postings.setdefault(trigram, set()).add(file)
+
+    def remove(self, file) -> None:
+        """
+        Remove a file from the index (does nothing if it isn't indexed)
+
+        Args:
+            file (File): The file to remove
+
+        Returns:
+            None
+        """
+        self.unindexed.discard(file)
+        file_trigrams = self.file_trigrams.pop(file, None)
+
+        if not file_trigrams:
+            return
+
+        self.entries -= len(file_trigrams)
+
+        for trigram in file_trigrams:
+            postings = self.postings[trigram]
+            postings.discard(file)
+            if not postings:
+                del self.postings[trigram]
+
+    def overflow(self) -> None:
+        """
+        Drop everything and stop indexing (the memory cap was hit)
+
+        Returns:
+            None
+        """
+        self.postings = {}
+        self.file_trigrams = {}
+        self.unindexed = set()
+        self.entries = 0
+        self.overflowed = True
+
+    def candidates(self, literals: List[str]) -> Optional[Set[object]]:
+        """
+        Get the files that could contain all of the given `literals` (case insensitive)
+
+        Args:
+            literals (list): Strings that must be in a matching file
+
+        Returns:
+            set: The candidate files, or `None` if the index can't narrow anything down (every file is a candidate)
+        """
+        if self.overflowed:
+            return None
+
+        required = required_trigrams([x.lower() for x in literals])
+
+        if not required:
+            return None
+
+        # Intersect the smallest sets first to keep the intermediate sets small
+        postings = sorted((self.postings.get(x, set()) for x in required), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+
+        return result | self.unindexed
+
+
+class PathIndex:
+    def __init__(self, use_trigrams: bool = False) -> None:
+        """
+        A sorted list of all the paths in a file system (the `locate` database).
+        Optionally keeps a trigram -> paths map so substring searches don't need to look at every path.
+
+        Args:
+            use_trigrams (bool): If the trigram map should be built and maintained
+        """
+        self.paths: List[str] = []
+        """list: Every indexed path, sorted"""
+        self.trigrams: Optional[Dict[str, Set[str]]] = {} if use_trigrams else None
+        """dict: Lowercase trigram -> the paths containing it (`None` if trigrams are disabled)"""
+
+    def __getstate__(self) -> dict:
+        # Copies of the containers, so the state doesn't change while it's pickled (see `StandardFS.capture()`)
+        state = self.__dict__.copy()
+        state["paths"] = list(self.paths)
+        if self.trigrams is not None:
+            state["trigrams"] = {trigram: set(paths) for trigram, paths in self.trigrams.items()}
+        return state
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, path: str) -> bool:
+        index = bisect_left(self.paths, path)
+        return index < len(self.paths) and self.paths[index] == path
+
+    def add(self, path: str) -> None:
+        """
+        Add a path to the index (does nothing if it's already indexed)
+
+        Args:
+            path (str): The full path to add
+
+        Returns:
+            None
+        """
+        if path in self:
+            return
+
+        insort(self.paths, path)
+        self.add_trigrams([path])
+
+    def add_many(self, paths: Iterable[str]) -> None:
+        """
+        Add a batch of paths to the index (ex. a whole tree) with one sort, instead of one insert per path
+
+        Args:
+            paths (list): The full paths to add (ones that are already indexed are skipped)
+
+        Returns:
+            None
+        """
+        new_paths = sorted(path for path in set(paths) if path not in self)
+
+        if not new_paths:
+            return
+
+        # Two sorted runs, which the sort merges in linear time
+        self.paths.extend(new_paths)
+        self.paths.sort()
+        self.add_trigrams(new_paths)
+
+    def add_trigrams(self, paths: List[str]) -> None:
+        """
+        Add paths to the trigram map (if trigrams are enabled)
+
+        Args:
+            paths (list): The newly indexed paths
+
+        Returns:
+            None
+        """
+        if self.trigrams is None:
+            return
+
+        for path in paths:
+            for trigram in trigrams(path.lower()):
+                self.trigrams.setdefault(trigram, set()).add(path)
+
+    def remove(self, path: str) -> None:
+        """
+        Remove a path and everything under it from the index
+
+        Args:
+            path (str): The full path to remove
+
+        Returns:
+            None
+        """
+        removed = []
+
+        index = bisect_left(self.paths, path)
+        if index < len(self.paths) and self.paths[index] == path:
+            removed.append(self.paths.pop(index))
+
+        # Everything inside of `path` is one slice starting at `<path>/`, but it doesn't have to come right after `path`
+        # (ex. "/etc-old" sorts between "/etc" and "/etc/passwd")
+        prefix = path.rstrip("/") + "/"
+        start = bisect_left(self.paths, prefix)
+        end = start
+        while end < len(self.paths) and self.paths[end].startswith(prefix):
+            end += 1
+
+        removed.extend(self.paths[start:end])
+        del self.paths[start:end]
+
+        if self.trigrams is not None:
+            for removed_path in removed:
+                for trigram in trigrams(removed_path.lower()):
+                    postings = self.trigrams.get(trigram)
+                    if postings is not None:
+                        postings.discard(removed_path)
+                        if not postings:
+                            del self.trigrams[trigram]
+
+    def search(self, pattern: str, ignore_case: bool = False, basename: bool = False,
+               limit: Optional[int] = None) -> List[str]:
+        """
+        Find every indexed path matching the given `pattern`.
+        Like `locate`, a pattern without glob characters matches any path containing it, while a glob must match the
+        whole path (or the whole basename if `basename` is set).
+
+        Args:
+            pattern (str): The substring or glob to match
+            ignore_case (bool): Match without case sensitivity
+            basename (bool): Only match against the last part of the path
+            limit (int, optional): Stop after finding this many matches
+
+        Returns:
+            list: The sorted list of matching paths
+        """
+        is_glob = GLOB_CHARACTERS.search(pattern) is not None
+        literals = [x for x in GLOB_SPLIT.split(pattern) if x] if is_glob else [pattern]
+
+        if ignore_case:
+            pattern = pattern.lower()
+
+        # The paths are sorted case sensitively, so a lowercased prefix can't narrow them down
+        candidates = self.candidates(literals, pattern if is_glob and not basename and not ignore_case else None)
+
+        matches = []
+
+        for path in candidates:
+            subject = path.rsplit("/", 1)[-1] if basename else path
+            if ignore_case:
+                subject = subject.lower()
+
+            if (fnmatchcase(subject, pattern) if is_glob else pattern in subject):
+                matches.append(path)
+                if limit is not None and len(matches) >= limit:
+                    break
+
+        return matches
+
+    def candidates(self, literals: List[str], anchored_glob: Optional[str] = None) -> Iterable[str]:
+        """
+        Narrow down the paths that could match a pattern without looking at every path (when possible)
+
+        Args:
+            literals (list): Strings that must be in a matching path
+            anchored_glob (str, optional): The glob if it must match the whole path (lets us use its prefix)
+
+        Returns:
+            Iterable: The (sorted) paths that might match
+        """
+        if self.trigrams is not None:
+            required = required_trigrams([x.lower() for x in literals])
+            if required:
+                # Intersect the smallest sets first to keep the intermediate sets small
+                postings = sorted((self.trigrams.get(x, set()) for x in required), key=len)
+                result = set(postings[0])
+                for posting in postings[1:]:
+                    if not result:
+                        break
+                    result &= posting
+                return sorted(result)
+
+        if anchored_glob:
+            # A glob like "/etc/*.conf" can only match paths starting with "/etc/"
+            prefix = GLOB_SPLIT.split(anchored_glob, 1)[0]
+            if prefix:
+                start = bisect_left(self.paths, prefix)
+                end = start
+                while end < len(self.paths) and self.paths[end].startswith(prefix):
+                    end += 1
+                return self.paths[start:end]
+
+        return self.paths
@@ -0,0 +1,325 @@
+from collections import deque
+from itertools import count
+from threading import Condition
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .helpers import InotifyMask, inotify_event
+
+MAX_QUEUED_EVENTS = 16384
+"""int: The most events a single watch holds before it starts dropping them (same default as Linux)"""
+
+
+class Watch:
+    def __init__(self, instance: "Inotify", wd: int, node, mask: int) -> None:
+        """
+        A single watched `File`/`Directory` in an `Inotify` instance.
+        Binds listeners to the node's `EventBus`, so a change only reaches the watches on the changed path.
+
+        Args:
+            instance (Inotify): The instance this watch belongs to
+            wd (int): The watch descriptor
+            node (FSBaseObject): The `File`/`Directory` to watch
+            mask (int): The `InotifyMask` bits to report
+        """
+        self.instance: "Inotify" = instance
+        self.wd: int = wd
+        self.node = node
+        self.mask: int = mask
+        self.queue: Deque[Tuple[int, inotify_event]] = deque()
+        """deque: (sequence number, event) pairs waiting to be read"""
+        self.overflow: Optional[int] = None
+        """int: The sequence number of the first dropped event (`None` if nothing was dropped since the last read)"""
+        self.listeners: List[Tuple[str, Callable, str]] = []
+
+    @property
+    def recursive(self) -> bool:
+        """bool: If events of every descendant are reported (otherwise only direct children)"""
+        return bool(self.mask & InotifyMask.IN_RECURSIVE)
+
+    def bind(self) -> None:
+        """
+        Bind our listeners to the watched node for every event in our mask
+
+        Returns:
+            None
+        """
+        wanted = [("read", self.on_read, "after", InotifyMask.IN_ACCESS),
+                  ("write", self.on_write, "after", InotifyMask.IN_MODIFY),
+                  ("create", self.on_create, "after", InotifyMask.IN_CREATE),
+                  ("change_perm", self.on_attrib, "after", InotifyMask.IN_ATTRIB),
+                  ("change_owner", self.on_attrib, "after", InotifyMask.IN_ATTRIB),
+                  ("move", self.on_move_from, "before", InotifyMask.IN_MOVED_FROM),
+                  ("move", self.on_move_to, "after", InotifyMask.IN_MOVED_TO | InotifyMask.IN_MOVE_SELF),
+                  # Always listen for deletes, the watch has to go away with its node
+                  ("delete", self.on_delete, "after", ~0)]
+
+        # Directories listen recursively so they hear about their children. Non recursive watches filter out the rest
+        recursive = self.node.is_directory()
+
+        for event, function, when, bits in wanted:
+            if self.mask & bits:
+                self.node.events.subscribe(event, function, when, recursive=recursive)
+                self.listeners.append((event, function, when))
+
+    def unbind(self) -> None:
+        """
+        Remove all of our listeners from the watched node
+
+        Returns:
+            None
+        """
+        for event, function, _ in self.listeners:
+            self.node.events.unsubscribe(event, function)
+        self.listeners = []
+
+    def relative_name(self, node) -> Optional[str]:
+        """
+        Get the path of `node` relative to the watched `Directory`
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that fired an event
+
+        Returns:
+            str: The relative path ("" for the watched node itself) or `None` if we shouldn't report this node
+        """
+        if node is self.node:
+            return ""
+
+        if not self.recursive:
+            return node.name if node.parent is self.node else None
+
+        names = []
+        current = node
+        while current is not None and current is not self.node:
+            names.append(current.name)
+            current = current.parent
+
+        return "/".join(reversed(names)) if current is self.node else None
+
+    def queue_event(self, node, mask: int, name: str) -> None:
+        """
+        Add an event to our queue (and wake up anyone waiting on the instance)
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that fired the event
+            mask (int): The `InotifyMask` bits for the event
+            name (str): The path of `node` relative to the watched `Directory`
+
+        Returns:
+            None
+        """
+        if node.is_directory() and node is not self.node:
+            mask |= InotifyMask.IN_ISDIR
+
+        self.instance.push(self, mask, name)
+
+    def report(self, node, mask: InotifyMask, child_only: bool = False) -> None:
+        """
+        Queue `mask` for `node` if it's something we were asked to watch
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` that fired the event
+            mask (InotifyMask): The event type
+            child_only (bool): Ignore the event if it fired on the watched node itself
+
+        Returns:
+            None
+        """
+        if not self.mask & mask:
+            return
+
+        name = self.relative_name(node)
+        if name is None or (child_only and name == ""):
+            return
+
+        self.queue_event(node, mask, name)
+
+    def on_read(self, node) -> None:
+        self.report(node, InotifyMask.IN_ACCESS)
+
+    def on_write(self, node) -> None:
+        # A directory "write" is an entry being added/removed, which is already reported as create/delete/move
+        if not node.is_directory():
+            self.report(node, InotifyMask.IN_MODIFY)
+
+    def on_create(self, node) -> None:
+        self.report(node, InotifyMask.IN_CREATE, child_only=True)
+
+    def on_attrib(self, node) -> None:
+        self.report(node, InotifyMask.IN_ATTRIB)
+
+    def on_move_from(self, node) -> None:
+        self.report(node, InotifyMask.IN_MOVED_FROM, child_only=True)
+
+    def on_move_to(self, node) -> None:
+        if node is self.node:
+            self.report(node, InotifyMask.IN_MOVE_SELF)
+        else:
+            self.report(node, InotifyMask.IN_MOVED_TO, child_only=True)
+
+    def on_delete(self, node) -> None:
+        if node is not self.node:
+            self.report(node, InotifyMask.IN_DELETE, child_only=True)
+            return
+
+        if self.mask & InotifyMask.IN_DELETE_SELF:
+            self.queue_event(node, InotifyMask.IN_DELETE_SELF, "")
+        self.instance.remove_watch(self.wd)
+
+
+class Inotify:
+    def __init__(self, max_queued_events: int = MAX_QUEUED_EVENTS) -> None:
+        """
+        An inotify instance (what an inotify file descriptor points to): a set of watches and their queued events
+
+        Args:
+            max_queued_events (int): The most events each watch holds before reporting `IN_Q_OVERFLOW`
+        """
+        self.max_queued_events: int = max_queued_events
+        self.watches: Dict[int, Watch] = {}
+        """dict: Watch descriptor -> `Watch`"""
+        self.watched_nodes: Dict[int, int] = {}
+        """dict: id() of a watched `File`/`Directory` -> its watch descriptor (so a node is only watched once)"""
+        self.ready: Dict[int, Watch] = {}
+        """dict: Watch descriptor -> `Watch`, only for watches with events waiting (reads don't look at idle watches)"""
+        self.ignored: List[Tuple[int, inotify_event]] = []
+        """list: `IN_IGNORED` events of removed watches that haven't been read yet"""
+        self.condition: Condition = Condition()
+        self.sequence = count()
+        self.next_wd = count(1)
+
+    def __getstate__(self) -> dict:
+        # Conditions can't be pickled (nobody can be waiting on one in a save file anyway), and counters are saved as
+        # the next number they'd give
+        state = self.__dict__.copy()
+        del state["condition"]
+        state["sequence"] = next(self.sequence)
+        state["next_wd"] = next(self.next_wd)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.condition = Condition()
+        self.sequence = count(state["sequence"])
+        self.next_wd = count(state["next_wd"])
+
+    def add_watch(self, node, mask: int) -> int:
+        """
+        Start watching a `File`/`Directory`. Watching a node that's already watched replaces its mask
+
+        Args:
+            node (FSBaseObject): The `File`/`Directory` to watch
+            mask (int): The `InotifyMask` bits to report
+
+        Returns:
+            int: The watch descriptor
+        """
+        with self.condition:
+            wd = self.watched_nodes.get(id(node))
+
+            if wd is not None:
+                watch = self.watches[wd]
+                watch.unbind()
+                watch.mask = mask
+            else:
+                wd = next(self.next_wd)
+                watch = Watch(self, wd, node, mask)
+                self.watches[wd] = watch
+                self.watched_nodes[id(node)] = wd
+
+            watch.bind()
+
+        return wd
+
+    def remove_watch(self, wd: int) -> bool:
+        """
+        Stop watching and queue an `IN_IGNORED` event for the watch
+
+        Args:
+            wd (int): The watch descriptor
+
+        Returns:
+            bool: If the watch existed
+        """
+        with self.condition:
+            watch = self.watches.pop(wd, None)
+
+            if watch is None:
+                return False
+
+            watch.unbind()
+            del self.watched_nodes[id(watch.node)]
+            self.ignored.append((next(self.sequence), inotify_event(wd, InotifyMask.IN_IGNORED)))
+            # Events that were already queued can still be read
+            self.condition.notify_all()
+
+        return True
+
+    def close(self) -> None:
+        """
+        Remove every watch without queueing anything
+
+        Returns:
+            None
+        """
+        with self.condition:
+            for watch in self.watches.values():
+                watch.unbind()
+            self.watches = {}
+            self.watched_nodes = {}
+            self.ready = {}
+            self.ignored = []
+            self.condition.notify_all()
+
+    def push(self, watch: Watch, mask: int, name: str) -> None:
+        """
+        Queue an event on `watch`, or mark it as overflowed if its queue is full
+
+        Args:
+            watch (Watch): The watch the event belongs to
+            mask (int): The `InotifyMask` bits for the event
+            name (str): The relative path of the changed item
+
+        Returns:
+            None
+        """
+        with self.condition:
+            if len(watch.queue) >= self.max_queued_events:
+                if watch.overflow is None:
+                    watch.overflow = next(self.sequence)
+            else:
+                watch.queue.append((next(self.sequence), inotify_event(watch.wd, mask, name)))
+
+            self.ready[watch.wd] = watch
+            self.condition.notify_all()
+
+    def read(self, timeout: Optional[float] = 0) -> List[inotify_event]:
+        """
+        Take every queued event (oldest first), waiting for at least one if there are none
+
+        Args:
+            timeout (float, optional): How long to wait in seconds. `0` doesn't wait, `None` waits forever
+
+        Returns:
+            list: The queued `inotify_event`s (empty if the timeout passed without any event)
+        """
+        with self.condition:
+            if timeout != 0:
+                self.condition.wait_for(lambda: self.ready or self.ignored, timeout)
+
+            events = self.ignored
+            self.ignored = []
+
+            for watch in self.ready.values():
+                events.extend(watch.queue)
+                watch.queue.clear()
+
+                if watch.overflow is not None:
+                    events.append((watch.overflow, inotify_event(watch.wd, InotifyMask.IN_Q_OVERFLOW)))
+                    watch.overflow = None
+
+            self.ready = {}
+
+        events.sort(key=lambda x: x[0])
+
+        return [event for _, event in events]
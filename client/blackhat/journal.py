@@ -0,0 +1,291 @@
+import copyreg
+import io
+import os
+import pickle
+from threading import Lock, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+JOURNAL_SUFFIX = ".journal"
+"""str: Added to the path of a save to get the path of its journal"""
+COMPACT_THRESHOLD = 1 << 20
+"""int: The default journal size (in bytes) after which the next save writes a new snapshot instead"""
+
+record_key = Tuple[str, str, Optional[str]]
+"""tuple: (kind ("put", "attributes", "delete" or "identities"), computer ID, path (`None` for identities))"""
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file next to `path` and rename it over `path` once it's on disk, so a crash never leaves half a file
+
+    Args:
+        path (str): The file to (re)place
+        data (bytes): The content of the file
+
+    Returns:
+        None
+    """
+    temp_path = f"{path}.tmp"
+
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, states: Dict[int, tuple]) -> None:
+        """
+        Pickles a world the way it was when `states` was taken (see `Computer.capture_world()`): the objects in it are
+        pickled with their captured state instead of their current one, so the world can keep changing in the meantime
+
+        Args:
+            file: The (binary) file to write the pickle to
+            states (dict): id() -> (the object, its `__getstate__()`)
+        """
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.states: Dict[int, tuple] = states
+
+    def reducer_override(self, obj):
+        captured = self.states.get(id(obj))
+        if captured is None:
+            return NotImplemented
+
+        # The same as the default reduction (`object.__reduce_ex__()`), with the captured state
+        return copyreg.__newobj__, (type(obj),), captured[1]
+
+
+class Journal:
+    def __init__(self, path: str, threshold: int = COMPACT_THRESHOLD) -> None:
+        """
+        The write-ahead journal of a save: every change to the file systems and identities of a world is recorded as
+        a small record, and saving only appends the records made since the last save to `<path>.journal`.
+        Loading replays the journal on top of the last full snapshot (see `Computer.save()` and `Computer.load()`).
+
+        Records are state based (the current state of a path, or its removal), so a path changed any amount of times
+        between two saves is only written once, and replaying a record twice changes nothing.
+        Once the journal grows past `threshold`, the next save writes a new snapshot in the background and starts an
+        empty journal (compaction)
+
+        Args:
+            path (str): The path of the snapshot (the save file)
+            threshold (int): The journal size (in bytes) that triggers compaction
+        """
+        self.path: str = path
+        self.threshold: int = threshold
+        self.generation: int = 0
+        """int: The snapshot the journal belongs to (a journal with another generation in its header is stale)"""
+        self.machines: Dict[str, tuple] = {}
+        """dict: ID -> `Computer.unjournaled_state()` of every `Computer` in the snapshot (machines added to the world
+        later, or changes to what isn't journaled, need a new snapshot)"""
+        self.size: int = 0
+        """int: The size of the journal file in bytes"""
+        self.valid: bool = False
+        """bool: If the files on disk match the journal (`False` until the first snapshot, or after a failed one)"""
+        self.replaying: bool = False
+        """bool: If records are being replayed (replayed changes aren't recorded again)"""
+        self.pending: Dict[record_key, Callable[[], object]] = {}
+        """dict: Key -> function that makes the record's payload, for every change since the last save, in the order
+        of each key's last change (the payload is made when the journal is written, so it's always the latest state)"""
+        self.lock: Lock = Lock()
+        """Lock: Guards `pending` (changes are recorded from any thread)"""
+        self.compaction: Optional[Thread] = None
+        """Thread: The background thread writing the latest snapshot (`None` when there isn't one)"""
+
+    def __getstate__(self) -> dict:
+        # Only what's needed to find (and check) the journal of the snapshot, the rest belongs to the running game
+        return {"path": self.path, "threshold": self.threshold, "generation": self.generation,
+                "machines": self.machines}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path"], state["threshold"])
+        self.generation = state["generation"]
+        self.machines = state["machines"]
+
+    @property
+    def journal_path(self) -> str:
+        """str: The path of the journal file"""
+        return self.path + JOURNAL_SUFFIX
+
+    def record(self, key: record_key, payload: Callable[[], object]) -> None:
+        """
+        Record a change. A change to a key that already has a pending record replaces it (and moves it to the end)
+
+        Args:
+            key (tuple): What changed (see `record_key`)
+            payload (Callable): Makes the state to record (called when the journal is written, can return `None` to
+            drop the record)
+
+        Returns:
+            None
+        """
+        if self.replaying:
+            return
+
+        with self.lock:
+            self.pending.pop(key, None)
+            self.pending[key] = payload
+
+    def wait(self) -> None:
+        """
+        Wait for the background compaction (if there's one) to finish
+
+        Returns:
+            None
+        """
+        compaction = self.compaction
+        if compaction is not None:
+            compaction.join()
+            self.compaction = None
+
+    def flush(self) -> bool:
+        """
+        Append every pending record to the journal file as one batch (so a crash never leaves half a save)
+
+        Returns:
+            bool: `True` if the records were written, `False` if it failed or the files on disk don't match the journal
+            (the caller has to write a full snapshot instead)
+        """
+        self.wait()
+
+        # Records only make sense on top of the snapshot they follow
+        if not self.valid:
+            return False
+
+        with self.lock:
+            pending, self.pending = self.pending, {}
+
+        records = []
+        for key, payload in pending.items():
+            state = payload()
+            if state is not None:
+                records.append(key + (state,))
+
+        if not records:
+            return True
+
+        data = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+
+        try:
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            self.valid = False
+            return False
+
+        self.size += len(data)
+        return True
+
+    def snapshot(self, world, machines: Dict[str, tuple], states: Optional[Dict[int, tuple]] = None) -> bool:
+        """
+        Write a full snapshot of the world and start an empty journal.
+        Given the `states` of the world (see `Computer.capture_world()`), a background thread pickles and writes it, as
+        it was when they were taken. Changes made in the meantime are recorded for the new journal
+
+        Args:
+            world: The object to pickle (the `Computer` that's saved)
+            machines (dict): ID -> `Computer.unjournaled_state()` of every `Computer` in the world
+            states (dict, optional): id() -> (an object of the world, its `__getstate__()`)
+
+        Returns:
+            bool: `True` if the snapshot was written (or the background thread was started), otherwise `False`
+        """
+        self.wait()
+
+        # Everything pending is part of the snapshot
+        with self.lock:
+            self.pending = {}
+
+        self.generation += 1
+        self.machines = machines
+
+        if states is not None:
+            self.compaction = Thread(target=self.write_snapshot, args=(world, states))
+            self.compaction.start()
+            return True
+
+        return self.write_snapshot(world)
+
+    def write_snapshot(self, world, states: Optional[Dict[int, tuple]] = None) -> bool:
+        """
+        Pickle the world and replace the snapshot with it, then start an empty journal for it.
+        Until the journal is replaced, it still has the old generation, so a crash in between never replays it on top of
+        the new snapshot
+
+        Args:
+            world: The object to pickle
+            states (dict, optional): The captured state of the world to pickle instead (see `SnapshotPickler`)
+
+        Returns:
+            bool: `True` if both files were written, otherwise `False`
+        """
+        try:
+            if states is None:
+                data = pickle.dumps(world, pickle.HIGHEST_PROTOCOL)
+            else:
+                buffer = io.BytesIO()
+                SnapshotPickler(buffer, states).dump(world)
+                data = buffer.getvalue()
+        except Exception:
+            self.valid = False
+            return False
+
+        header = pickle.dumps(self.generation, pickle.HIGHEST_PROTOCOL)
+
+        try:
+            write_atomic(self.path, data)
+            write_atomic(self.journal_path, header)
+        except OSError:
+            self.valid = False
+            return False
+
+        self.size = len(header)
+        self.valid = True
+        return True
+
+    def read(self) -> List[tuple]:
+        """
+        Read every record of the journal that belongs to the snapshot (a stale or missing journal has none).
+        A batch that was only partly written (the game crashed while saving) is cut off, along with everything after it
+
+        Returns:
+            list: The records, in the order they have to be replayed in
+        """
+        records = []
+        self.valid = False
+
+        try:
+            with open(self.journal_path, "rb") as f:
+                if pickle.load(f) != self.generation:
+                    return records
+
+                end = f.tell()
+                while True:
+                    try:
+                        batch = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception:
+                        # Torn write, the batch (and anything after it) never finished saving
+                        break
+                    records.extend(batch)
+                    end = f.tell()
+        except Exception:
+            # No journal, or not even the header made it to disk
+            return records
+
+        # Cut off anything left after the last whole batch, so later batches are appended right after it
+        if os.path.getsize(self.journal_path) != end:
+            os.truncate(self.journal_path, end)
+
+        self.size = end
+        self.valid = True
+        return records
@@ -1 +1 @@
-from . import output, input, unistd, sys, stdlib, dirent, fcntl, arpa, stdio, ifaddrs, netdb
+from . import output, input, unistd, sys, stdlib, dirent, fcntl, arpa, stdio, ifaddrs, netdb, locate
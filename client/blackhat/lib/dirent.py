@@ -38,9 +38,8 @@ def readdir(pathname: str) -> Result:
     if find_dir.data.is_file():
         return Result(success=False, message=ResultMessages.IS_FILE)
 
-    # We need execute permissions to list a directory (???)
-    if 0:
-        if not find_dir.data.check_perm("execute", computer).success:
-            return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+    # We need read permissions to list a directory (execute is only needed to look up names in it, see `fs.find`)
+    if not find_dir.data.check_perm("read", computer).success:
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
 
     return Result(success=True, data=[x.name for x in find_dir.data.files.values()])
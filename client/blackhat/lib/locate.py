@@ -0,0 +1,146 @@
+from typing import Optional
+
+from ..helpers import Result, ResultMessages
+from ..indexing import MAX_CONTENT_ENTRIES, required_literals
+
+computer: Optional["Computer"] = None
+
+
+def update(comp: "Computer"):
+    """
+    Store a reference to the games current `Computer` object as a global variable so methods can reference it without
+    requiring it as an argument
+    
+    Args:
+        comp (:obj:`Computer`): The games current `Computer` object
+
+    Returns:
+        None
+    """
+    global computer
+    computer = comp
+
+
+def updatedb(trigrams: bool = False) -> Result:
+    """
+    (Re)build the `locate` database of the current `Computer`. Only root can do this
+
+    Args:
+        trigrams (bool): If the database should keep a trigram map to speed up substring searches
+
+    Returns:
+        Result: A `Result` with the `data` flag containing the amount of indexed paths
+    """
+    if computer.sys_geteuid() != 0:
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+    index = computer.fs.update_path_index(trigrams)
+
+    return Result(success=True, data=len(index))
+
+
+def locate(pattern: str, ignore_case: bool = False, basename: bool = False, limit: Optional[int] = None,
+           existing: bool = False) -> Result:
+    """
+    Search the `locate` database for paths matching the given `pattern`.
+    Like mlocate, paths inside of directories the current user can't read are hidden
+
+    Args:
+        pattern (str): The substring (or glob if it contains `*`, `?` or `[`) to search for
+        ignore_case (bool): Match without case sensitivity
+        basename (bool): Only match against the name of the file, not the full path
+        limit (int, optional): The max amount of paths to return
+        existing (bool): Only return paths that still exist
+
+    Returns:
+        Result: A `Result` with the `data` flag containing the list of matching paths
+    """
+    index = computer.fs.path_index
+
+    if index is None:
+        return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+    matches = []
+    # Many matches usually share a parent directory, so only check each directory once
+    allowed_dirs = {}
+
+    for path in index.search(pattern, ignore_case, basename):
+        parent_path = path.rsplit("/", 1)[0] or "/"
+
+        if parent_path not in allowed_dirs:
+            find_parent = computer.fs.find(parent_path)
+            allowed_dirs[parent_path] = find_parent.success and find_parent.data.check_perm("read", computer).success
+
+        if not allowed_dirs[parent_path]:
+            continue
+
+        if existing and not computer.fs.find(path).success:
+            continue
+
+        matches.append(path)
+
+        if limit is not None and len(matches) >= limit:
+            break
+
+    return Result(success=True, data=matches)
+
+
+def update_content_index(max_entries: int = MAX_CONTENT_ENTRIES) -> Result:
+    """
+    (Re)build the trigram index of every file's content (used by `grep -r` and `search`). Only root can do this
+
+    Args:
+        max_entries (int): The most (trigram, file) pairs the index can hold before it gives up (memory cap)
+
+    Returns:
+        Result: A `Result` with the `data` flag containing the amount of indexed files (`0` if the cap was hit)
+    """
+    if computer.sys_geteuid() != 0:
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+    index = computer.fs.update_content_index(max_entries)
+
+    return Result(success=True, data=len(index))
+
+
+def disable_content_index() -> Result:
+    """
+    Drop the content index. Only root can do this
+
+    Returns:
+        Result: A `Result` with the `success` flag set accordingly
+    """
+    if computer.sys_geteuid() != 0:
+        return Result(success=False, message=ResultMessages.NOT_ALLOWED)
+
+    computer.fs.disable_content_index()
+
+    return Result(success=True)
+
+
+def content_candidates(pattern: str) -> Result:
+    """
+    Use the content index to find the (readable) files that could match the given regular expression.
+    Readable files that aren't returned are guaranteed not to match, so they don't need to be read
+
+    Args:
+        pattern (str): The (Python) regular expression that will be searched for (case doesn't matter)
+
+    Returns:
+        Result: A `Result` with the `data` flag containing the set of candidate paths, or `None` if every file is a
+        candidate (no index, the index hit its memory cap, or the pattern has no literal text to look for)
+    """
+    index = computer.fs.content_index
+
+    if index is None:
+        return Result(success=True, data=None)
+
+    literals = required_literals(pattern)
+    candidates = index.candidates(literals) if literals else None
+
+    if candidates is None:
+        return Result(success=True, data=None)
+
+    # Don't give away anything about files the user can't read (callers treat those as candidates anyways)
+    credentials = computer.get_credentials()
+    return Result(success=True, data={x.pwd() for x in candidates if x.has_perm("read", credentials)})
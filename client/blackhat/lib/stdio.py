@@ -1,6 +1,6 @@
 from typing import Optional
 
-from ..helpers import Result
+from ..helpers import Result, ResultMessages
 
 computer: Optional["Computer"] = None
 
@@ -33,3 +33,30 @@ def rename(oldpath: str, newpath: str) -> Result:
     """
     return computer.sys_rename(oldpath, newpath)
 
+
+
+def read_stdin() -> Result:
+    """
+    Read the (unsplit) output of the previous command when the current command is being piped into
+
+    Returns:
+        Result: A `Result` object with the data flag containing the piped text (`NOT_FOUND` if nothing was piped in)
+    """
+    stdin = computer.sessions[-1].stdin
+
+    if stdin is None:
+        return Result(success=False, message=ResultMessages.NOT_FOUND)
+
+    return Result(success=True, data=stdin)
+
+
+def read_stdin_args() -> int:
+    """
+    Get how many of the current command's args (at the end) are the split up output of the previous command
+
+    Returns:
+        int: The amount of piped args (0 if nothing was piped in)
+    """
+    session = computer.sessions[-1]
+
+    return session.stdin_args if session.stdin is not None else 0
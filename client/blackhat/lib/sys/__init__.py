@@ -1 +1 @@
-from . import time, stat, socket
+from . import time, stat, socket, statfs, inotify, mount
@@ -0,0 +1,96 @@
+from typing import Optional
+
+from ...helpers import Result
+from ...helpers import InotifyMask
+from ...helpers import inotify_event as inotify_event_internal
+
+computer: Optional["Computer"] = None
+
+
+def update(comp: "Computer"):
+    """
+    Store a reference to the games current `Computer` object as a global variable so methods can reference it without
+    requiring it as an argument
+    
+    Args:
+        comp (:obj:`Computer`): The games current `Computer` object
+
+    Returns:
+        None
+    """
+    global computer
+    computer = comp
+
+
+inotify_event = inotify_event_internal
+
+IN_ACCESS = InotifyMask.IN_ACCESS
+IN_MODIFY = InotifyMask.IN_MODIFY
+IN_ATTRIB = InotifyMask.IN_ATTRIB
+IN_MOVED_FROM = InotifyMask.IN_MOVED_FROM
+IN_MOVED_TO = InotifyMask.IN_MOVED_TO
+IN_MOVE = InotifyMask.IN_MOVE
+IN_CREATE = InotifyMask.IN_CREATE
+IN_DELETE = InotifyMask.IN_DELETE
+IN_DELETE_SELF = InotifyMask.IN_DELETE_SELF
+IN_MOVE_SELF = InotifyMask.IN_MOVE_SELF
+IN_Q_OVERFLOW = InotifyMask.IN_Q_OVERFLOW
+IN_IGNORED = InotifyMask.IN_IGNORED
+IN_RECURSIVE = InotifyMask.IN_RECURSIVE
+IN_ISDIR = InotifyMask.IN_ISDIR
+IN_ALL_EVENTS = InotifyMask.IN_ALL_EVENTS
+
+
+def inotify_init() -> Result:
+    """
+    Create a new inotify instance
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing the file descriptor of the instance (close it with `unistd.close()`)
+    """
+    return computer.sys_inotify_init()
+
+
+def inotify_add_watch(fd: int, pathname: str, mask: int) -> Result:
+    """
+    Start watching a `File`/`Directory`. Watching a `Directory` reports events of its direct children, unless `mask`
+    contains `IN_RECURSIVE` (then everything inside of it is reported)
+
+    Args:
+        fd (int): The file descriptor of the inotify instance
+        pathname (str): The path of the `File`/`Directory` to watch
+        mask (int): The events to watch for (`IN_MODIFY | IN_CREATE`, etc)
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing the watch descriptor
+    """
+    return computer.sys_inotify_add_watch(fd, pathname, mask)
+
+
+def inotify_rm_watch(fd: int, wd: int) -> Result:
+    """
+    Stop watching the `File`/`Directory` of the given watch descriptor
+
+    Args:
+        fd (int): The file descriptor of the inotify instance
+        wd (int): The watch descriptor
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly
+    """
+    return computer.sys_inotify_rm_watch(fd, wd)
+
+
+def inotify_read(fd: int, timeout: Optional[float] = 0) -> Result:
+    """
+    Read the queued events of an inotify instance (oldest first).
+    If a watch's queue fills up, newer events are dropped and a single `IN_Q_OVERFLOW` event is reported
+
+    Args:
+        fd (int): The file descriptor of the inotify instance
+        timeout (float, optional): How long to wait for an event in seconds. `0` doesn't wait, `None` waits forever
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing a list of `inotify_event` objects
+    """
+    return computer.sys_inotify_read(fd, timeout)
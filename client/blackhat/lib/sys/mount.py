@@ -0,0 +1,45 @@
+from typing import Optional
+
+from ...helpers import Result
+
+computer: Optional["Computer"] = None
+
+
+def update(comp: "Computer"):
+    """
+    Store a reference to the games current `Computer` object as a global variable so methods can reference it without
+    requiring it as an argument
+    
+    Args:
+        comp (:obj:`Computer`): The games current `Computer` object
+
+    Returns:
+        None
+    """
+    global computer
+    computer = comp
+
+
+def mount_host(source: str, target: str) -> Result:
+    """
+    Mount a directory of the host machine (read-only) on the given empty directory. Only root can do this.
+    The host files are read when needed, they're never copied into the game
+
+    Args:
+        source (str): The path of the directory on the host
+        target (str): The path of the directory to mount it on
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly
+    """
+    return computer.sys_mount_host(source, target)
+
+
+def getmounts() -> Result:
+    """
+    Get every host directory that's mounted in the file system
+
+    Returns:
+        Result: A `Result` object with the data flag containing a dict of mount point -> host directory
+    """
+    return computer.sys_getmounts()
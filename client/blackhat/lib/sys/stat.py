@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Optional, Union
 
 from ...helpers import Result
 from ...helpers import stat_struct as stat_struct_internal
+from ...modes import ModeChange
 
 computer: Optional["Computer"] = None
 
@@ -37,6 +38,32 @@ def stat(path: str) -> Result:
     return computer.sys_stat(path)
 
 
+def lstat(path: str) -> Result:
+    """
+    Get information about a given file. If the file is a symbolic link, get information about the link itself
+
+    Args:
+        path (str): The path of the given `File`/`Directory`/`Symlink` to get info about
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing a `stat_struct` object if successful
+    """
+    return computer.sys_lstat(path)
+
+
+def usage(path: str) -> Result:
+    """
+    Get how many bytes each user's files use inside of a given `Directory` (or `File`)
+
+    Args:
+        path (str): The path of the given `File`/`Directory`
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing a dict of UID -> bytes if successful
+    """
+    return computer.sys_getusage(path)
+
+
 def mkdir(pathname: str, mode=0o755) -> Result:
     """
     Make a directory
@@ -51,15 +78,31 @@ def mkdir(pathname: str, mode=0o755) -> Result:
     return computer.sys_mkdir(pathname, mode)
 
 
-def chmod(pathname: str, mode: int) -> Result:
+def chmod(pathname: str, mode: Union[int, str, ModeChange]) -> Result:
     """
     Change the permission mode of a `File`/`Directory`
 
     Args:
         pathname (str): File path of the `File`/`Directory` to change mode of
-        mode (int): Octal permissions of the given pathname
+        mode (int, str or ModeChange): Octal permissions of the given pathname, a symbolic mode (ex. "u+x,go-w"), or
+        a mode that's already parsed (see `parse_mode()`)
 
     Returns:
         Result: A `Result` instance with the `success` flag set accordingly.
     """
     return computer.sys_chmod(pathname, mode)
+
+
+def chmod_tree(pathname: str, mode: Union[int, str, ModeChange]) -> Result:
+    """
+    Change the permission mode of a `File`/`Directory` and everything inside of it
+
+    Args:
+        pathname (str): File path of the `File`/`Directory` to start at
+        mode (int, str or ModeChange): Octal permissions, a symbolic mode (ex. "u+x,go-w"), or a mode that's already
+        parsed (see `parse_mode()`)
+
+    Returns:
+        Result: A `Result` instance with the `success` flag set if every node was changed and the `data` flag containing the paths that couldn't be changed
+    """
+    return computer.sys_chmod_tree(pathname, mode)
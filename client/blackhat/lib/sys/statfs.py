@@ -0,0 +1,37 @@
+from typing import Optional
+
+from ...helpers import Result
+from ...helpers import statfs_struct as statfs_struct_internal
+
+computer: Optional["Computer"] = None
+
+
+def update(comp: "Computer"):
+    """
+    Store a reference to the games current `Computer` object as a global variable so methods can reference it without
+    requiring it as an argument
+    
+    Args:
+        comp (:obj:`Computer`): The games current `Computer` object
+
+    Returns:
+        None
+    """
+    global computer
+    computer = comp
+
+
+statfs_struct = statfs_struct_internal
+
+
+def statfs(path: str) -> Result:
+    """
+    Get information about the file system that contains the given path (size, free space)
+
+    Args:
+        path (str): The path of any `File`/`Directory` in the file system
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing a `statfs_struct` object if successful
+    """
+    return computer.sys_statfs(path)
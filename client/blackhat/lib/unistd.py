@@ -179,6 +179,21 @@ def chown(pathname: str, owner: int, group: int) -> Result:
     return computer.sys_chown(pathname, owner, group)
 
 
+def chown_tree(pathname: str, owner: Optional[int], group: Optional[int]) -> Result:
+    """
+    Change the owner of the given `pathname` and everything inside of it
+
+    Args:
+        pathname (str): The file path of the `File`/`Directory` to start at
+        owner (int, optional): The UID of the new owner
+        group (int, optional): The GID of the new owner
+
+    Returns:
+        Result: A `Result` object with the success flag set if every node was changed and the data flag containing the paths that couldn't be changed
+    """
+    return computer.sys_chown_tree(pathname, owner, group)
+
+
 def chdir(pathname: str) -> Result:
     """
     Change the `current_dir` of the current `Session`
@@ -213,6 +228,16 @@ def add_user(username: str, password: str, uid: Optional[int] = None, plaintext:
     return computer.add_user(username, password, uid, plaintext)
 
 
+def allocate_uid() -> int:
+    """
+    Get the UID the next new user would be given (without looking at every user)
+
+    Returns:
+        int: A UID that isn't in use
+    """
+    return computer.allocate_uid()
+
+
 def get_user(uid: Optional[int] = None, username: Optional[str] = None) -> Result:
     """
     Find a user in the database by UID or username
@@ -284,6 +309,17 @@ def add_user_to_group(uid: int, gid: int,
     return computer.add_user_to_group(uid, gid, membership_type)
 
 
+def identity_transaction():
+    """
+    Context manager that groups user/group changes (`add_user()`, `add_group()`, etc.) into one transaction.
+    Nothing is committed until the block exits, and everything is rolled back if the block raises
+
+    Returns:
+        A context manager
+    """
+    return computer.identity_transaction()
+
+
 def get_user_primary_group(uid: int) -> Result:
     """
     Get the `Group` GID's that is the `User`s primary `Group` (by UID)
@@ -422,3 +458,58 @@ def unlink(pathname: str) -> Result:
 
     """
     return computer.sys_unlink(pathname)
+
+
+def symlink(target: str, linkpath: str) -> Result:
+    """
+    Make a symbolic link called `linkpath` that points to `target` (the target doesn't need to exist)
+
+    Args:
+        target (str): The path the new link should point to
+        linkpath (str): The path of the new link
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly
+    """
+    return computer.sys_symlink(target, linkpath)
+
+
+def readlink(pathname: str) -> Result:
+    """
+    Get the path a symbolic link points to
+
+    Args:
+        pathname (str): The path of the symbolic link
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing the target path
+    """
+    return computer.sys_readlink(pathname)
+
+
+def close(fd: int) -> Result:
+    """
+    Close a file descriptor (ex. one returned by `inotify_init()`)
+
+    Args:
+        fd (int): The file descriptor to close
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly
+    """
+    return computer.sys_close(fd)
+
+
+def pread(filepath: str, count: int, offset: int) -> Result:
+    """
+    Read (at most) `count` bytes of a file, starting at `offset`
+
+    Args:
+        filepath (str): The path of the file to read
+        count (int): The max amount of bytes to read
+        offset (int): The byte to start reading at
+
+    Returns:
+        Result: A `Result` object with the success flag set accordingly and the data flag containing the bytes read (empty at the end of the file)
+    """
+    return computer.sys_pread(filepath, count, offset)
@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+from threading import Condition, Lock, get_ident
+from typing import Dict, Optional
+
+
+class RWLock:
+    def __init__(self) -> None:
+        """
+        A reader/writer lock: any amount of threads can hold it for reading, or one thread can hold it for writing.
+        Waiting writers block new readers (so a busy directory can't starve a rename), except for threads that already
+        hold the lock, which can always take it again (reads inside of reads, reads or writes inside of writes).
+        A thread holding only a read lock can't upgrade it to a write lock (that would deadlock with another upgrader)
+        """
+        self.condition: Condition = Condition(Lock())
+        self.readers: Dict[int, int] = {}
+        """dict: Thread ID -> how many times that thread holds the lock for reading"""
+        self.writer: Optional[int] = None
+        """int: The thread ID holding the lock for writing (`None` if nobody is)"""
+        self.writer_depth: int = 0
+        """int: How many times the writer holds the lock"""
+        self.waiting_writers: int = 0
+
+    def acquire_read(self) -> None:
+        """
+        Hold the lock for reading, waiting for the writer (and any waiting writers) first
+
+        Returns:
+            None
+        """
+        thread = get_ident()
+
+        with self.condition:
+            if self.writer != thread and thread not in self.readers:
+                self.condition.wait_for(lambda: self.writer is None and not self.waiting_writers)
+
+            self.readers[thread] = self.readers.get(thread, 0) + 1
+
+    def release_read(self) -> None:
+        """
+        Release one hold of the lock for reading
+
+        Returns:
+            None
+        """
+        thread = get_ident()
+
+        with self.condition:
+            if self.readers[thread] > 1:
+                self.readers[thread] -= 1
+            else:
+                del self.readers[thread]
+                if not self.readers:
+                    self.condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Hold the lock for writing, waiting for every reader and the current writer first
+
+        Returns:
+            None
+        """
+        thread = get_ident()
+
+        with self.condition:
+            if self.writer == thread:
+                self.writer_depth += 1
+                return
+
+            if thread in self.readers:
+                raise RuntimeError("can't upgrade a read lock to a write lock")
+
+            self.waiting_writers += 1
+            try:
+                self.condition.wait_for(lambda: self.writer is None and not self.readers)
+            finally:
+                self.waiting_writers -= 1
+
+            self.writer = thread
+            self.writer_depth = 1
+
+    def release_write(self) -> None:
+        """
+        Release one hold of the lock for writing
+
+        Returns:
+            None
+        """
+        with self.condition:
+            self.writer_depth -= 1
+            if not self.writer_depth:
+                self.writer = None
+                self.condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        """
+        Context manager holding the lock for reading
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """
+        Context manager holding the lock for writing
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+@contextmanager
+def write_both(first: RWLock, second: RWLock):
+    """
+    Hold two locks for writing, always taking them in the same (address) order so two threads locking the same pair
+    the other way around can't deadlock. Taking the same lock twice is fine
+
+    Args:
+        first (RWLock): One of the locks
+        second (RWLock): The other lock
+    """
+    if id(second) < id(first):
+        first, second = second, first
+
+    with first.write():
+        with second.write():
+            yield
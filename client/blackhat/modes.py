@@ -0,0 +1,134 @@
+import re
+from typing import Dict, List, Literal, Tuple, Union
+
+from .helpers import Result, ResultMessages
+
+SCOPES = ("owner", "group", "public")
+PERMS = ("read", "write", "execute")
+
+# who: "u"/"g"/"o"/"a" -> the bits of the 9 bit mode they cover
+WHO_BITS = {"u": 0o700, "g": 0o070, "o": 0o007, "a": 0o777}
+# perm: "r"/"w"/"x" -> the bit for each who (only the covered part is kept)
+PERM_BITS = {"r": 0o444, "w": 0o222, "x": 0o111}
+# A clause like "ug+rw", "o=" or "a-x+r" (a who list followed by one or more operations)
+CLAUSE = re.compile(r"^([ugoa]*)((?:[-+=][rwxX]*)+)$")
+OPERATION = re.compile(r"([-+=])([rwxX]*)")
+
+
+def permissions_to_mode(permissions: Dict[str, List[str]]) -> int:
+    """
+    Convert a `FSBaseObject.permissions` dict to an octal mode
+
+    Args:
+        permissions (dict): Permission type -> the scopes that have it
+
+    Returns:
+        int: The mode (ex. 0o644)
+    """
+    mode = 0
+
+    for scope_index, scope in enumerate(SCOPES):
+        for perm_index, perm in enumerate(PERMS):
+            if scope in permissions[perm]:
+                mode |= 0o400 >> (scope_index * 3 + perm_index)
+
+    return mode
+
+
+def mode_to_permissions(mode: int) -> Dict[str, List[Literal["owner", "group", "public"]]]:
+    """
+    Convert an octal mode to a `FSBaseObject.permissions` dict
+
+    Args:
+        mode (int): The mode (ex. 0o755). Anything above 0o777 is ignored
+
+    Returns:
+        dict: Permission type -> the scopes that have it
+    """
+    permissions = {"read": [], "write": [], "execute": []}
+
+    for scope_index, scope in enumerate(SCOPES):
+        for perm_index, perm in enumerate(PERMS):
+            if mode & (0o400 >> (scope_index * 3 + perm_index)):
+                permissions[perm].append(scope)
+
+    return permissions
+
+
+class ModeChange:
+    def __init__(self, operations: List[Tuple[str, int, int, bool]]) -> None:
+        """
+        A parsed (octal or symbolic) `chmod` mode, ready to be applied to any amount of files.
+        Use `parse_mode()` to make one; the string is only parsed once, applying it is a few bit operations
+
+        Args:
+            operations (list): (operator, who bits, permission bits, conditional execute) tuples, applied in order
+        """
+        self.operations: List[Tuple[str, int, int, bool]] = operations
+
+    def apply(self, mode: int, is_directory: bool = False) -> int:
+        """
+        Get the mode a file would have after this change
+
+        Args:
+            mode (int): The current mode of the file
+            is_directory (bool): If the file is a `Directory` (for `X`)
+
+        Returns:
+            int: The new mode
+        """
+        for operator, who, bits, conditional_execute in self.operations:
+            # X: execute only for directories and files that are already executable by someone
+            if conditional_execute and (is_directory or mode & 0o111):
+                bits |= PERM_BITS["x"]
+            bits &= who
+
+            if operator == "+":
+                mode |= bits
+            elif operator == "-":
+                mode &= ~bits
+            else:
+                mode = (mode & ~who) | bits
+
+        return mode
+
+
+def parse_mode(mode: Union[int, str, ModeChange]) -> Result:
+    """
+    Parse a `chmod` mode: an octal number ("755" or 0o755) or a comma separated list of symbolic clauses ("u+x,go-w").
+    A `ModeChange` is already parsed, it's returned as is
+
+    Args:
+        mode (int, str or ModeChange): The mode to parse
+
+    Returns:
+        Result: A `Result` with the `success` flag set accordingly and the `data` flag containing a `ModeChange`
+    """
+    if isinstance(mode, ModeChange):
+        return Result(success=True, data=mode)
+
+    if isinstance(mode, int):
+        return Result(success=True, data=ModeChange([("=", 0o777, mode & 0o777, False)]))
+
+    if re.fullmatch(r"[0-7]{1,4}", mode):
+        return Result(success=True, data=ModeChange([("=", 0o777, int(mode, 8) & 0o777, False)]))
+
+    operations = []
+
+    for clause in mode.split(","):
+        match = CLAUSE.match(clause)
+        if not match:
+            return Result(success=False, message=ResultMessages.INVALID_ARGUMENT)
+
+        # No who is the same as "a" (we don't have a umask to respect)
+        who = 0
+        for char in match.group(1) or "a":
+            who |= WHO_BITS[char]
+
+        for operator, perms in OPERATION.findall(match.group(2)):
+            bits = 0
+            for char in perms.replace("X", ""):
+                bits |= PERM_BITS[char]
+            operations.append((operator, who, bits, "X" in perms))
+
+    return Result(success=True, data=ModeChange(operations))
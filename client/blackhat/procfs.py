@@ -0,0 +1,147 @@
+import os
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Union
+
+from .blobstore import blob_store
+
+# Linux's route flags (RTF_UP, RTF_GATEWAY)
+RTF_UP = 0x0001
+RTF_GATEWAY = 0x0002
+
+
+def uptime(computer) -> str:
+    """
+    /proc/uptime: seconds since the `Computer` booted
+
+    Args:
+        computer: The `Computer` the file belongs to
+
+    Returns:
+        str: The content of the file
+    """
+    return str((datetime.now() - computer.boot_time).total_seconds())
+
+
+def meminfo(computer) -> str:
+    """
+    /proc/meminfo: memory used by the simulator itself. The traced numbers come from `tracemalloc` (they're 0 unless
+    tracing was turned on, ex. with `PYTHONTRACEMALLOC=1`, since tracing slows everything down)
+
+    Args:
+        computer: The `Computer` the file belongs to
+
+    Returns:
+        str: The content of the file
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    fs = computer.fs
+
+    lines = [("MemTotal", fs.capacity // 1024, " kB"),
+             ("MemFree", max(fs.capacity - fs.files.size, 0) // 1024, " kB"),
+             ("Traced", current // 1024, " kB"),
+             ("TracedPeak", peak // 1024, " kB"),
+             ("Tracing", int(tracemalloc.is_tracing()), ""),
+             ("BlobStore", blob_store.total_size() // 1024, " kB"),
+             ("Blobs", len(blob_store), "")]
+
+    return "".join(f"{name + ':':<16}{value:>8}{unit}\n" for name, value, unit in lines)
+
+
+def loadavg(computer) -> str:
+    """
+    /proc/loadavg: the host's load averages, then running threads/open sessions and the newest session ID
+
+    Args:
+        computer: The `Computer` the file belongs to
+
+    Returns:
+        str: The content of the file
+    """
+    try:
+        averages = os.getloadavg()
+    except (AttributeError, OSError):
+        # Not available on every host (ex. Windows)
+        averages = (0.0, 0.0, 0.0)
+
+    newest = computer.sessions[-1].id if computer.sessions else 0
+
+    return f"{averages[0]:.2f} {averages[1]:.2f} {averages[2]:.2f} " \
+           f"{threading.active_count()}/{len(computer.sessions)} {newest}\n"
+
+
+def route_address(address: str) -> str:
+    """
+    Format an IPv4 address like /proc/net/route does (the 32 bit value in host (little endian) order, as hex)
+
+    Args:
+        address (str): The dotted address
+
+    Returns:
+        str: The 8 hex digits
+    """
+    return "".join(f"{int(x):02X}" for x in reversed(address.split(".")))
+
+
+def net_route(computer) -> str:
+    """
+    /proc/net/route: the routing table (the LAN and the default route through our router)
+
+    Args:
+        computer: The `Computer` the file belongs to
+
+    Returns:
+        str: The content of the file
+    """
+    content = "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+
+    if not computer.lan:
+        return content
+
+    mask = "255.255.255.0"
+    network = ".".join(computer.lan.split(".")[:3] + ["0"])
+    gateway = computer.parent.lan if computer.parent and computer.parent.lan else None
+
+    if gateway:
+        content += f"eth0\t00000000\t{route_address(gateway)}\t{RTF_UP | RTF_GATEWAY:04X}\t0\t0\t0\t00000000\t0\t0\t0\n"
+
+    content += f"eth0\t{route_address(network)}\t00000000\t{RTF_UP:04X}\t0\t0\t0\t{route_address(mask)}\t0\t0\t0\n"
+
+    return content
+
+
+def session_status(session) -> str:
+    """
+    /proc/<id>/status: who a session is running as and where it is
+
+    Args:
+        session (Session): The session
+
+    Returns:
+        str: The content of the file
+    """
+    return f"Session:\t{session.id}\n" \
+           f"Uid:\t{session.real_uid}\t{session.effective_uid}\t{session.saved_uid}\n" \
+           f"Cwd:\t{session.current_dir.pwd()}\n"
+
+
+def entries(computer) -> Dict[str, Union[Callable[[], str], dict]]:
+    """
+    Everything in /proc (the entries of its `ProcDirectory`)
+
+    Args:
+        computer: The `Computer` the file system belongs to
+
+    Returns:
+        dict: Name -> content provider (files) or dict of entries (directories)
+    """
+    proc = {"uptime": lambda: uptime(computer),
+            "meminfo": lambda: meminfo(computer),
+            "loadavg": lambda: loadavg(computer),
+            "net": {"route": lambda: net_route(computer)}}
+
+    for session in computer.sessions:
+        proc[str(session.id)] = {"status": lambda session=session: session_status(session)}
+
+    return proc
@@ -1,3 +1,27 @@
+from typing import FrozenSet, NamedTuple, Optional
+
+
+class Credentials(NamedTuple):
+    """
+    Who a `Session` is acting as, looked up once (see `Computer.get_credentials()`) instead of on every permission check.
+    Never changed: a new one is made whenever the session's UIDs or any user/group membership change
+    """
+    uid: int
+    """int: The real UID"""
+    euid: int
+    """int: The effective UID (used for permission checks)"""
+    gid: int
+    """int: The primary GID of the real user"""
+    egid: int
+    """int: The primary GID of the effective user"""
+    groups: FrozenSet[int]
+    """frozenset: Every GID the effective user is in"""
+    real_groups: FrozenSet[int]
+    """frozenset: Every GID the real user is in (the same object as `groups` unless the UIDs differ)"""
+    generation: int
+    """int: The `Computer.identity_generation` these were looked up at"""
+
+
 class Session:
     def __init__(self, uid: int, current_dir, id: int) -> None:
         """
@@ -21,3 +45,18 @@ def __init__(self, uid: int, current_dir, id: int) -> None:
 
         self.env = {"PATH": "/bin:/usr/bin"}
         """The map of environment variables in the current session"""
+
+        self.credentials: Optional[Credentials] = None
+        """Credentials: Who the session is acting as (`None` until the first permission check)"""
+
+        self.stdin: Optional[str] = None
+        """The (unsplit) output of the previous command in a pipeline, if the current command is being piped into"""
+
+        self.stdin_args: int = 0
+        """How many of the current command's args (at the end) are the split up output of the previous command"""
+
+    def __getstate__(self) -> dict:
+        # A copy of the environment, so the state doesn't change while it's pickled (see `Journal.snapshot()`)
+        state = self.__dict__.copy()
+        state["env"] = dict(self.env)
+        return state
@@ -11,6 +11,7 @@
 from .computer import Computer
 from .helpers import Result, ResultMessages
 import logging
+from typing import Optional
 
 
 class Shell:
@@ -240,6 +241,23 @@ def run_command(self, command: str, args: list, external_binary: bool, pipe: boo
         self.prompt = self.generate_prompt()
         return response
 
+    def set_stdin(self, text: Optional[str], arg_count: int = 0) -> None:
+        """
+        Make the (unsplit) output of the previous command in a pipeline available to the next command through
+        `Session.stdin`. Binaries still receive the output as split args, but line based tools (like `grep`) need the
+        original lines (and need to know which args to drop, see `Session.stdin_args`)
+
+        Args:
+            text (str, optional): The output of the previous command, or `None` once the pipeline moves on
+            arg_count (int): How many args (at the end of the next command's args) the output was split into
+
+        Returns:
+            None
+        """
+        if self.computers and self.computers[-1].sessions:
+            self.computers[-1].sessions[-1].stdin = text
+            self.computers[-1].sessions[-1].stdin_args = arg_count if text is not None else 0
+
     def try_run_command(self, command, args, pipe=False):
         external_binary = False
         # Try to flatten the list of args to make one list
@@ -326,6 +344,9 @@ def handle_command(self, command):
             self.try_run_command(command_name, command, False)
         else:
             prev_command_result = None
+            prev_command_output = None
+            # If `command_name` is a stage of the pipeline that still has to run (the command after a |)
+            next_stage = False
             while True:
                 for arg in command:
                     # Check if the current arg is | > or >> (because we do something different here)
@@ -335,24 +356,30 @@ def handle_command(self, command):
                         special_character = command[current_index]
                         break
                 else:
-                    # Run the last command and output
-                    if len(command) == 0:
-                        self.try_run_command(command_name, prev_command_result, False)
+                    # Run the last command (with its own args) and output
+                    if next_stage:
+                        self.set_stdin(prev_command_output, len(prev_command_result or []))
+                        self.try_run_command(command_name, command + (prev_command_result or []), False)
+                        self.set_stdin(None)
                     break
 
                 current_args = command[0:current_index]
 
                 if prev_command_result:
                     if type(prev_command_result) == list:
+                        self.set_stdin(prev_command_output, len(prev_command_result))
                         command_result = self.try_run_command(command_name,
                                                               current_args + prev_command_result, True)
                     else:
+                        self.set_stdin(prev_command_output, 1)
                         command_result = self.try_run_command(command_name,
                                                               current_args + [prev_command_result], True)
+                    self.set_stdin(None)
                 else:
                     command_result = self.try_run_command(command_name, current_args, True)
                 # Remove everything up to the current index (including the special character) (for the next cycle)
                 del command[0:current_index + 1]
+                next_stage = False
 
                 # Don't even bother running if the command failed
                 if command_result:
@@ -398,10 +425,12 @@ def handle_command(self, command):
                         prev_command_result = None
                     # Pass the input of the previous command to the current command
                     elif special_character == "|":
+                        prev_command_output = command_result
                         prev_command_result = command_result
                         prev_command_result = prev_command_result.split()
                         command_name = command[0]
                         del command[0]
+                        next_stage = True
 
     def main(self):
         """
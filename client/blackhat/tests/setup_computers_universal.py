@@ -1,4 +1,5 @@
 from ..computer import Computer
+from ..database import MEMORY, get_database
 from ..session import Session
 from ..shell import Shell
 
@@ -10,7 +11,8 @@ def init():
     Returns:
         None
     """
-    computer = Computer()
+    # Tests don't need their users to survive the process (and parallel runs can't fight over blackhat.db)
+    computer = Computer(get_database(MEMORY))
 
     # Create a temporary root session for initializing stuff
     session = Session(0, computer.fs.files, 0)
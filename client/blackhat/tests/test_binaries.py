@@ -1,13 +1,29 @@
 import datetime
+import os
+import sys
+import tempfile
 import unittest
 from base64 import b32decode, b64decode
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
 from hashlib import md5, sha1, sha256, sha512, sha384, sha224
+from threading import Thread
+from io import StringIO
 from time import sleep
 import unittest.mock
 
 from .setup_computers_universal import init
-from ..helpers import Result, ResultMessages
+from ..bin import grep
+from ..blobstore import blob_store
+from ..computer import Computer
+from ..database import MEMORY, Database
+from ..events import event_batch
+from ..fs import MOUNT_ROOTS_VARIABLE, Directory
+from ..helpers import Result, ResultMessages, InotifyMask
+from ..indexing import PathIndex
+from ..modes import permissions_to_mode
 from ..session import Session
+from ..shell import Shell
 from ..user import User
 
 
@@ -20,6 +36,9 @@ class TestIncludedBinaries(unittest.TestCase):
     def setUp(self) -> None:
         self.computer = init()
 
+    def tearDown(self) -> None:
+        self.computer.unregister()
+
     def run_command(self, command, args=None):
         if args is None:
             args = []
@@ -56,6 +75,59 @@ def test_add_user(self):
                                           data=User(1001, "testuser", md5("password".encode()).hexdigest()))
         self.assertEqual(get_user_result, expected_get_user_result)
 
+        # Lookups are served from the identity cache, which matches what's in the database
+        queries = []
+        self.computer.connection.set_trace_callback(queries.append)
+        self.computer.get_user_groups(1001)
+        self.computer.get_group(name="testuser")
+        self.computer.sys_getgid()
+        self.computer.connection.set_trace_callback(None)
+        self.assertEqual(queries, [])
+
+        def identities():
+            return (self.computer.get_all_users().data,
+                    [(group.gid, group.name) for group in self.computer.get_all_groups().data],
+                    self.computer.memberships)
+
+        cached = identities()
+        self.computer.load_identities()
+        self.assertEqual(cached, identities())
+
+        # Transactions commit once at the end...
+        queries = []
+        self.computer.connection.set_trace_callback(queries.append)
+        with self.computer.identity_transaction():
+            for name in ["alice", "bob"]:
+                uid = self.computer.add_user(name, "password").data
+                gid = self.computer.add_group(name).data
+                self.computer.add_user_to_group(uid, gid, "primary")
+        self.computer.connection.set_trace_callback(None)
+        self.assertEqual(queries.count("COMMIT"), 1)
+        self.assertIn("bob:x:1003:1003", self.run_command("cat", ["/etc/passwd"]))
+
+        # ...or roll everything back
+        with self.assertRaises(ValueError):
+            with self.computer.identity_transaction():
+                self.computer.add_user("mallory", "password")
+                self.computer.change_user_password(0, "hunter2")
+                raise ValueError
+        self.assertFalse(self.computer.get_user(username="mallory").success)
+        self.assertEqual(self.computer.get_user(uid=0).data.password, md5("password".encode()).hexdigest())
+        self.assertEqual(cached[0] + self.computer.get_all_users().data[-2:], self.computer.get_all_users().data)
+
+        # A nested transaction that fails only rolls back its own changes
+        with self.computer.identity_transaction():
+            self.computer.add_group("frank")
+            adduser_result = self.run_command("adduser", ["frank", "-p", "password", "-n"])
+            self.assertIn("Failed to add the user 'frank'", adduser_result)
+        self.assertFalse(self.computer.get_user(username="frank").success)
+        self.assertTrue(self.computer.get_group(name="frank").success)
+        self.assertNotIn("frank:", self.run_command("cat", ["/etc/passwd"]))
+        in_cache = identities()
+        self.computer.load_identities()
+        self.assertEqual(in_cache, identities())
+
+
     def test_base32(self):
         self.run_command("base32", ["--version"])
         self.run_command("base32", ["--help"])
@@ -104,6 +176,12 @@ def test_cat(self):
         result = self.computer.run_command("cat", ["/etc/shadow"], True)
         self.assertIn("Permission denied", result.data)
 
+        # A symlink loop isn't reported as a missing file
+        self.run_command("ln", ["-s", "loop_b", "loop_a"])
+        self.run_command("ln", ["-s", "loop_a", "loop_b"])
+        result = self.computer.run_command("cat", ["loop_a"], True)
+        self.assertIn("loop_a: Too many levels of symbolic links", result.data)
+
     def test_cd(self):
         self.run_command("cd", ["--version"])
         self.run_command("cd", ["--help"])
@@ -118,6 +196,82 @@ def test_cd(self):
         self.run_command("cd", ["~"])
         self.assertEqual(self.computer.sys_getcwd().pwd(), "/home/steve")
 
+        # We need search (execute) permission on every directory in a path, and read permission to list one
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.computer.sys_mkdir("/tmp/private", 0o700)
+        self.computer.sys_creat("/tmp/private/note", 0o644)
+        self.computer.sessions.pop()
+
+        self.assertFalse(self.computer.run_command("cd", ["/tmp/private"], True).success)
+        self.assertFalse(self.computer.sys_read("/tmp/private/note").success)
+        self.assertIn("Permission denied", self.run_command("ls", ["/tmp/private"]))
+
+        # The cached result is dropped when the permissions change
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.computer.sys_chmod("/tmp/private", 0o711)
+        self.computer.sessions.pop()
+
+        self.assertTrue(self.computer.sys_read("/tmp/private/note").success)
+        self.assertIn("Permission denied", self.run_command("ls", ["/tmp/private"]))
+
+    def test_chmod(self):
+        self.run_command("chmod", ["--version"])
+        self.run_command("chmod", ["--help"])
+
+        def mode(path):
+            return permissions_to_mode(self.computer.fs.find(path).data.permissions)
+
+        self.run_command("touch", ["testfile"])
+        testfile = self.computer.fs.find("/home/steve/testfile").data
+
+        self.run_command("chmod", ["750", "testfile"])
+        self.assertEqual(permissions_to_mode(testfile.permissions), 0o750)
+        self.run_command("chmod", ["u-w,o+r", "testfile"])
+        self.assertEqual(permissions_to_mode(testfile.permissions), 0o554)
+        self.run_command("chmod", ["a=rX", "testfile"])
+        self.assertEqual(permissions_to_mode(testfile.permissions), 0o555)
+        self.assertIn("invalid mode", self.run_command("chmod", ["u+q", "testfile"]))
+
+        # -R changes the whole tree in one walk, X only adds execute to directories
+        self.run_command("mkdir", ["project"])
+        self.run_command("mkdir", ["project/src"])
+        self.run_command("touch", ["project/src/main.py"])
+        self.computer.sys_symlink("/etc", "/home/steve/project/etc")
+        main_py = self.computer.fs.find("/home/steve/project/src/main.py").data
+        etc_mode = mode("/etc")
+        events = []
+        main_py.events.subscribe("change_perm", events.append)
+
+        self.assertTrue(self.computer.run_command("chmod", ["-R", "go=,u+rwX", "project"], True).success)
+        self.assertEqual(mode("project/src"), 0o700)
+        self.assertEqual(permissions_to_mode(main_py.permissions), 0o600)
+        self.assertEqual(len(events), 1)
+        # The link isn't followed
+        self.assertEqual(mode("/etc"), etc_mode)
+
+        # Removing search permission doesn't stop us from reaching the children
+        self.run_command("chmod", ["-R", "a-x", "project"])
+        self.assertEqual(permissions_to_mode(main_py.permissions), 0o600)
+        self.assertFalse(self.computer.fs.find("/home/steve/project/src/main.py").success)
+
+        # Files we don't own are reported, the rest are still changed
+        self.run_command("chmod", ["-R", "u+rwx", "project"])
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.computer.sys_creat("/home/steve/project/rootfile", 0o644)
+        self.computer.sessions.pop()
+
+        chmod_result = self.computer.run_command("chmod", ["-R", "o+r", "project"], True)
+        self.assertFalse(chmod_result.success)
+        self.assertIn("'/home/steve/project/rootfile': Operation not permitted", chmod_result.data)
+        self.assertEqual(mode("project/src/main.py"), 0o704)
+
+        # Deeper trees than the recursion limit
+        current = self.computer.fs.find("/home/steve/project").data
+        for _ in range(sys.getrecursionlimit() + 100):
+            current = Directory("deep", current, 1000, 1000)
+        self.assertFalse(self.computer.run_command("chmod", ["-R", "750", "project"], True).success)
+        self.assertEqual(permissions_to_mode(current.permissions), 0o750)
+
     def test_chown(self):
         self.run_command("chown", ["--version"])
         self.run_command("chown", ["--help"])
@@ -131,6 +285,26 @@ def test_chown(self):
         self.assertEqual(self.computer.fs.find("/home/steve/testfile").data.owner, 0)
         self.assertEqual(self.computer.fs.find("/home/steve/testfile").data.group_owner, 0)
 
+        # -R moves the usage of every file in the tree to the new owner
+        self.run_command("mkdir", ["project"])
+        self.run_command("mkdir", ["project/src"])
+        self.run_command("touch", ["project/src/main.py", "project/README"])
+        self.computer.sys_write("/home/steve/project/src/main.py", "print('hello')")
+        self.computer.sys_write("/home/steve/project/README", "readme")
+        steve_usage = self.computer.fs.get_usage(1000)
+        root_usage = self.computer.fs.get_usage(0)
+        project_size = self.computer.fs.find("/home/steve/project").data.size
+
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.assertTrue(self.computer.run_command("chown", ["-R", "root", "/home/steve/project"], True).success)
+        self.computer.sessions.pop()
+
+        for path in ["project", "project/src", "project/src/main.py", "project/README"]:
+            self.assertEqual(self.computer.fs.find(f"/home/steve/{path}").data.owner, 0)
+        self.assertEqual(self.computer.fs.get_usage(1000), steve_usage - project_size)
+        self.assertEqual(self.computer.fs.get_usage(0), root_usage + project_size)
+        self.assertEqual(self.computer.sys_getusage("/home/steve/project").data, {0: project_size})
+
     def test_clear(self):
         self.run_command("clear", ["--version"])
         self.run_command("clear", ["--help"])
@@ -153,6 +327,36 @@ def test_commands(self):
         commands_result = self.run_command("commands")
         self.assertNotIn("ls", commands_result)
 
+    def test_cp(self):
+        self.run_command("cp", ["--version"])
+        self.run_command("cp", ["--help"])
+
+        self.run_command("cp", ["/etc/passwd", "passwd_copy"])
+        original = self.computer.fs.find("/etc/passwd").data
+        copied = self.computer.fs.find("passwd_copy").data
+        self.assertEqual(copied.content, original.content)
+
+        # Copies share the same blob instead of duplicating the content
+        self.assertEqual(copied._blob, original._blob)
+        self.assertGreaterEqual(blob_store.refcounts[original._blob], 2)
+
+        # Changing the copy doesn't change the original
+        self.computer.sys_write("/home/steve/passwd_copy", "only in the copy")
+        self.assertNotEqual(copied._blob, original._blob)
+        self.assertEqual(self.run_command("cat", ["passwd_copy"]), "only in the copy")
+        self.assertNotEqual(self.run_command("cat", ["/etc/passwd"]), "only in the copy")
+
+        # Content nothing uses anymore is freed
+        unique_blob = copied._blob
+        del copied
+        self.run_command("rm", ["passwd_copy"])
+        blob_store.collect()
+        self.assertNotIn(unique_blob, blob_store.blobs)
+
+        # Identical content is only stored once, even across computers
+        other_computer = init()
+        self.assertEqual(other_computer.fs.find("/bin/ls").data._blob, self.computer.fs.find("/bin/ls").data._blob)
+
     def test_date(self):
         self.run_command("date", ["--version"])
         self.run_command("date", ["--help"])
@@ -167,6 +371,74 @@ def test_date(self):
 
         self.assertEqual(date_result, expected_result)
 
+    def test_df(self):
+        self.run_command("df", ["--version"])
+        self.run_command("df", ["--help"])
+
+        header, row = self.run_command("df").split("\n")
+        total, used, available = [int(x) for x in row.split()[1:4]]
+
+        self.assertTrue(header.startswith("Filesystem"))
+        self.assertEqual(total, self.computer.fs.capacity // 1024)
+        self.assertEqual(used, -(-self.computer.fs.files.size // 1024))
+        self.assertEqual(total - used, available)
+        self.assertTrue(row.endswith("/"))
+
+        self.assertFalse(self.computer.run_command("df", ["/does/not/exist"], True).success)
+
+    def test_du(self):
+        self.run_command("du", ["--version"])
+        self.run_command("du", ["--help"])
+
+        self.run_command("mkdir", ["loot"])
+        self.run_command("touch", ["loot/data"])
+        self.computer.sys_write("/home/steve/loot/data", "A" * 4096)
+        data_size = self.computer.fs.find("/home/steve/loot/data").data.size
+
+        self.assertEqual(self.run_command("du", ["-s", "-b", "loot"]), f"{data_size}\tloot")
+        self.assertEqual(self.run_command("du", ["-a", "-b", "loot"]), f"{data_size}\tloot/data\n{data_size}\tloot")
+        self.assertEqual(len(self.run_command("du", ["--max-depth", "1", "/"]).split("\n")),
+                         len(self.computer.fs.files.files) + 1)
+
+        # The cached sizes always match a full recalculation
+        self.assertEqual(self.computer.fs.files.size, self.computer.fs.files.calculate_size())
+
+        # Usage is tracked per owner
+        home_size = self.computer.fs.find("/home/steve").data.size
+        self.assertEqual(self.run_command("du", ["--by-user", "-b", "/home"]), f"{home_size}\tsteve\t/home")
+        self.computer.fs.find("/home/steve/loot/data").data.owner = 0
+        self.assertEqual(self.run_command("du", ["--by-user", "-b", "/home"]),
+                         f"{data_size}\troot\t/home\n{home_size - data_size}\tsteve\t/home")
+
+        self.assertEqual(self.computer.fs.get_usage(0), self.computer.fs.files.owner_usage[0])
+        # Usage under directories we can't read isn't shown
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.run_command("mkdir", ["/tmp/private"])
+        self.run_command("chmod", ["700", "/tmp/private"])
+        self.computer.sessions.pop()
+        self.assertEqual(self.run_command("du", ["--by-user", "-b", "/tmp/private"]),
+                         "du: cannot read directory '/tmp/private': Permission denied")
+        # Not even as part of the totals of a directory above them (only root sees everything)
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.run_command("touch", ["/tmp/private/secret"])
+        self.computer.sys_write("/tmp/private/secret", "A" * 1000)
+        root_totals = self.computer.sys_getusage("/tmp").data
+        self.computer.sessions.pop()
+        private_usage = self.computer.fs.find("/tmp/private").data.get_usage()
+        self.assertEqual(self.computer.sys_getusage("/tmp").data.get(0, 0), root_totals[0] - private_usage[0])
+        self.computer.fs.find("/home/steve/loot/data").data.owner = 1000
+
+        self.run_command("rm", ["loot/data"])
+        self.assertEqual(self.run_command("du", ["-s", "-b", "loot"]), "0\tloot")
+        self.assertEqual(self.run_command("du", ["--by-user", "-b", "/home"]),
+                         f"{home_size - data_size}\tsteve\t/home")
+
+        # Writes that would go over the user's quota fail
+        self.computer.fs.quotas[1000] = self.computer.fs.get_usage(1000) + 100
+        self.run_command("touch", ["big"])
+        self.assertEqual(self.computer.sys_write("/home/steve/big", "A" * 200).message, ResultMessages.NO_SPACE)
+        self.assertTrue(self.computer.sys_write("/home/steve/big", "A" * 10).success)
+
     def test_echo(self):
         self.run_command("echo", ["--version"])
         self.run_command("echo", ["--help"])
@@ -200,6 +472,60 @@ def test_export(self):
         env_result = self.run_command("printenv")
         self.assertEqual("PATH=/bin:/usr/bin\nHOME=/home/steve\nUSER=steve\nBASH=/bin/bash", env_result)
 
+    def test_grep(self):
+        self.run_command("grep", ["--version"])
+        self.run_command("grep", ["--help"])
+
+        self.run_command("touch", ["notes"])
+        self.computer.sys_write("/home/steve/notes", "user: admin\npassword: hunter2\nPASSWORD: Hunter3\nnothing (here)")
+
+        self.assertEqual(self.run_command("grep", ["password", "notes"]), "password: hunter2")
+        self.assertEqual(self.run_command("grep", ["-i", "password", "notes"]),
+                         "password: hunter2\nPASSWORD: Hunter3")
+        self.assertEqual(self.run_command("grep", ["-n", "hunter", "notes"]), "2:password: hunter2")
+        self.assertEqual(self.run_command("grep", ["-c", "-i", "hunter", "notes"]), "2")
+        # Without -E, parentheses and friends are literal
+        self.assertEqual(self.run_command("grep", ["(here)", "notes"]), "nothing (here)")
+        self.assertEqual(self.run_command("grep", ["-E", "hunter[0-9]|admin", "notes"]),
+                         "user: admin\npassword: hunter2")
+        self.assertFalse(self.computer.run_command("grep", ["root", "notes"], True).success)
+
+        # Recursive searches skip files we can't read
+        self.run_command("mkdir", ["loot"])
+        self.run_command("touch", ["loot/creds"])
+        self.computer.sys_write("/home/steve/loot/creds", "password: letmein")
+        self.assertEqual(self.run_command("grep", ["-r", "-l", "password", "."]), "./loot/creds\n./notes")
+        self.assertIn("/etc/shadow: Permission denied", self.run_command("grep", ["-r", "steve", "/etc"]))
+        self.assertNotIn("shadow", self.run_command("grep", ["-r", "-s", "steve", "/etc"]))
+
+        # Piped input (through the shell) keeps its lines
+        self.run_command("touch", ["words"])
+        self.computer.sys_write("/home/steve/words", "one two\nthree\nnotes")
+        with unittest.mock.patch("logging.basicConfig"):
+            shell = Shell(self.computer)
+
+        def piped(command):
+            with redirect_stdout(StringIO()) as out:
+                shell.handle_command(command)
+            return out.getvalue().strip()
+
+        self.assertEqual(piped("cat words | grep three"), "three")
+        self.assertEqual(piped("cat words | grep -c o"), "2")
+        # Only the piped args are dropped, a file named like a piped word is still searched
+        self.assertEqual(piped("cat words | grep hunter2 notes"), "password: hunter2")
+        self.assertIsNone(self.computer.sessions[-1].stdin)
+
+        # Enough files are searched by a (bounded) thread pool, the output is in the same order either way
+        # (binaries are loaded fresh on every run, so the pool is patched where grep imports it from)
+        self.run_command("mkdir", ["many"])
+        for x in range(grep.THREAD_POOL_THRESHOLD):
+            self.run_command("touch", [f"many/{x:02}"])
+            self.computer.sys_write(f"/home/steve/many/{x:02}", f"file {x}")
+        with unittest.mock.patch("concurrent.futures.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+            self.assertEqual(self.run_command("grep", ["-r", "-l", "file", "many"]),
+                             "\n".join(f"many/{x:02}" for x in range(grep.THREAD_POOL_THRESHOLD)))
+        pool.assert_called_once_with(max_workers=grep.THREAD_POOL_WORKERS)
+
     def test_head(self):
         self.run_command("head", ["--version"])
         self.run_command("head", ["--help"])
@@ -267,6 +593,58 @@ def test_id(self):
         id_result = self.run_command("id", ["-n"])
         self.assertEqual(id_result, "steve")
 
+    def test_ln(self):
+        self.run_command("ln", ["--version"])
+        self.run_command("ln", ["--help"])
+
+        # Only symbolic links are supported
+        self.assertFalse(self.computer.run_command("ln", ["/etc/passwd", "passwd"], True).success)
+
+        self.run_command("ln", ["-s", "/etc/passwd", "passwd_link"])
+        self.assertEqual(self.run_command("cat", ["passwd_link"]), self.run_command("cat", ["/etc/passwd"]))
+        self.assertTrue(self.computer.sys_lstat("passwd_link").data.st_islink)
+        self.assertFalse(self.computer.sys_stat("passwd_link").data.st_islink)
+
+        # Links in the middle of a path are followed too
+        self.run_command("ln", ["-s", "/etc", "etc_link"])
+        self.assertEqual(self.run_command("cat", ["etc_link/hostname"]), self.run_command("cat", ["/etc/hostname"]))
+
+        # Relative links are relative to the directory they're in
+        self.run_command("ln", ["-s", "../.shellrc", "Desktop/shellrc_link"])
+        self.assertIs(self.computer.fs.find("Desktop/shellrc_link").data, self.computer.fs.find(".shellrc").data)
+
+        # The resolved target is memoized, but follows changes to the namespace
+        etc_link = self.computer.fs.find("etc_link", follow_symlinks=False).data
+        self.assertIs(etc_link.resolve(self.computer.fs).data, self.computer.fs.find("/etc").data)
+        self.run_command("rm", ["etc_link"])
+        self.run_command("mkdir", ["etc"])
+        self.run_command("ln", ["-s", "etc", "etc_link"])
+        self.assertEqual(self.computer.fs.find("etc_link").data.pwd(), "/home/steve/etc")
+
+        # Only changes to the directories on the way to the target invalidate it
+        self.run_command("touch", ["target"])
+        self.run_command("ln", ["-s", "../target", "Desktop/target_link"])
+        target_link = self.computer.fs.find("Desktop/target_link", follow_symlinks=False).data
+        target_link.resolve(self.computer.fs)
+        dependencies = target_link._resolved_dependencies
+        self.run_command("touch", ["/tmp/unrelated"])
+        target_link.resolve(self.computer.fs)
+        self.assertIs(target_link._resolved_dependencies, dependencies)
+        self.run_command("rm", ["target"])
+        self.assertFalse(self.computer.fs.find("Desktop/target_link").success)
+        self.run_command("touch", ["target"])
+        self.assertIs(self.computer.fs.find("Desktop/target_link").data, self.computer.fs.find("target").data)
+
+        # Loops are detected
+        self.run_command("ln", ["-s", "loop_b", "loop_a"])
+        self.run_command("ln", ["-s", "loop_a", "loop_b"])
+        self.assertEqual(self.computer.fs.find("loop_a").message, ResultMessages.TOO_MANY_LINKS)
+
+        # Removing a link doesn't touch its target
+        self.run_command("rm", ["passwd_link"])
+        self.assertFalse(self.computer.fs.find("passwd_link").success)
+        self.assertTrue(self.computer.fs.find("/etc/passwd").success)
+
     def test_ls(self):
         import re
         self.run_command("ls", ["--version"])
@@ -294,6 +672,69 @@ def test_ls(self):
         ls_result = self.run_command("ls", ["--no-color", "-l"])
         self.assertIn("steve", ls_result)
 
+        # Operands are printed as typed, even when they're dangling links
+        self.run_command("ln", ["-s", "/etc/missing", "Desktop/dangling"])
+        ls_result = self.run_command("ls", ["--no-color", "./Desktop/dangling"])
+        self.assertEqual(color_filter.sub('', ls_result).strip(), "./Desktop/dangling")
+        ls_result = self.run_command("ls", ["--no-color", "/etc/hostname"])
+        self.assertEqual(color_filter.sub('', ls_result).strip(), "/etc/hostname")
+
+        # A symlink loop is reported as such when it's an operand, and listed when it's inside a directory
+        self.run_command("ln", ["-s", "loop_b", "Desktop/loop_a"])
+        self.run_command("ln", ["-s", "loop_a", "Desktop/loop_b"])
+        self.assertEqual(self.run_command("ls", ["Desktop/loop_a"]),
+                         "ls: cannot access 'Desktop/loop_a': Too many levels of symbolic links")
+        ls_result = self.run_command("ls", ["--no-color", "Desktop"])
+        self.assertEqual(color_filter.sub('', ls_result).split(), ["dangling", "loop_a", "loop_b"])
+
+    def test_locate(self):
+        self.run_command("locate", ["--version"])
+        self.run_command("locate", ["--help"])
+
+        # The database doesn't exist until `updatedb` runs
+        self.assertFalse(self.computer.run_command("locate", ["passwd"], True).success)
+
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.run_command("updatedb")
+        self.computer.sessions.pop()
+
+        self.assertIn("/etc/passwd", self.run_command("locate", ["passwd"]).split("\n"))
+        self.assertEqual(self.run_command("locate", ["-b", "host*"]).split("\n"),
+                         ["/bin/hostname", "/etc/hostname", "/usr/share/man/hostname"])
+        self.assertEqual(self.run_command("locate", ["/etc/host*"]), "/etc/hostname")
+        self.assertIn("/etc/hostname", self.run_command("locate", ["-i", "HOSTNAME"]).split("\n"))
+
+        # Case insensitive globs match mixed case paths too
+        self.run_command("mkdir", ["/tmp/Secret"])
+        self.run_command("touch", ["/tmp/Secret/Key.txt"])
+        self.assertEqual(self.run_command("locate", ["-i", "/tmp/secret/*"]), "/tmp/Secret/Key.txt")
+
+        # The database is kept up to date as files are created and removed
+        self.run_command("touch", ["secret_notes"])
+        self.assertEqual(self.run_command("locate", ["secret_notes"]), "/home/steve/secret_notes")
+        self.run_command("rm", ["secret_notes"])
+        self.assertEqual(self.run_command("locate", ["secret_notes"]), "")
+
+        # A sibling that sorts between a directory and its contents ("-" comes before "/") doesn't hide them
+        self.run_command("mkdir", ["conf"])
+        self.run_command("mkdir", ["conf-old"])
+        self.run_command("touch", ["conf/app.ini"])
+        self.run_command("rm", ["-r", "conf"])
+        self.assertNotIn("/home/steve/conf/app.ini", self.computer.fs.path_index)
+        self.assertEqual(self.run_command("locate", ["/home/steve/conf"]), "/home/steve/conf-old")
+        index = PathIndex(use_trigrams=True)
+        index.add_many(["/etc", "/etc-old", "/etc/passwd", "/etc/shadow"])
+        index.remove("/etc")
+        self.assertEqual(index.paths, ["/etc-old"])
+        self.assertEqual(index.search("passwd"), [])
+        self.assertEqual(index.search("old"), ["/etc-old"])
+
+        # Paths inside of directories we can't read aren't shown
+        self.assertEqual(self.run_command("locate", ["/run/sudo/ts"]), "")
+
+        self.assertEqual(self.run_command("locate", ["-c", "-b", "hostname"]), "3")
+        self.assertEqual(len(self.run_command("locate", ["-l", "1", "passwd"]).split("\n")), 1)
+
     def test_md5sum(self):
         self.run_command("md5sum", ["--version"])
         self.run_command("md5sum", ["--help"])
@@ -309,6 +750,71 @@ def test_md5sum(self):
         self.assertEqual(self.run_command("md5sum", ["file", "-z", "--tag"]),
                          f"MD5 (file) = {md5(message.encode()).hexdigest()}")
 
+    def test_mount(self):
+        self.run_command("mount", ["--version"])
+        self.run_command("mount", ["--help"])
+
+        with tempfile.TemporaryDirectory() as host_dir:
+            os.mkdir(os.path.join(host_dir, "lists"))
+            with open(os.path.join(host_dir, "lists", "words.txt"), "w") as f:
+                f.write("alpha\nbeta\ngamma\n")
+
+            # Only root can mount
+            self.assertFalse(self.computer.run_command("mount", ["--bind-host", host_dir, "/tmp"], True).success)
+
+            self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+            used_before = self.computer.fs.files.size
+
+            # Only the allowed host directories can be mounted
+            self.run_command("mkdir", ["/mnt"])
+            with unittest.mock.patch.dict(os.environ, {MOUNT_ROOTS_VARIABLE: os.path.join(host_dir, "lists")}):
+                self.assertIn("BLACKHAT_MOUNT_ROOTS", self.run_command("mount", ["--bind-host", host_dir, "/mnt"]))
+            self.assertFalse(self.computer.fs.find("/mnt/lists").success)
+
+            os.environ[MOUNT_ROOTS_VARIABLE] = host_dir
+            self.addCleanup(os.environ.pop, MOUNT_ROOTS_VARIABLE)
+            os.symlink("/etc/passwd", os.path.join(host_dir, "lists", "escape"))
+            self.run_command("mount", ["--bind-host", host_dir, "/mnt"])
+            self.assertIn(f"{os.path.realpath(host_dir)} on /mnt type hostfs (ro,bind)", self.run_command("mount"))
+
+            # The content is read from the host when needed
+            self.assertEqual(self.run_command("cat", ["/mnt/lists/words.txt"]), "alpha\nbeta\ngamma")
+            self.assertEqual(self.computer.sys_pread("/mnt/lists/words.txt", 4, 6).data, b"beta")
+            self.assertEqual(self.computer.sys_pread("/mnt/lists/words.txt", 4, 100).data, b"")
+            self.assertEqual(self.computer.sys_stat("/mnt/lists/words.txt").data.st_size, 17)
+
+            # Host files don't use any space in the virtual file system
+            self.assertEqual(self.computer.fs.files.size, used_before + self.computer.fs.find("/mnt").data.size)
+            self.assertEqual(self.computer.fs.files.size, self.computer.fs.files.calculate_size())
+
+            # Mounts are read-only (even for root)
+            self.assertFalse(self.computer.sys_write("/mnt/lists/words.txt", "changed").success)
+            self.assertEqual(self.run_command("cat", ["/mnt/lists/words.txt"]), "alpha\nbeta\ngamma")
+
+            # Links on the host are skipped, they could lead out of the mount
+            self.assertFalse(self.computer.fs.find("/mnt/lists/escape").success)
+
+            # Files too big to read at once have to be read in ranges
+            with unittest.mock.patch("blackhat.fs.HOST_READ_LIMIT", 8):
+                self.assertEqual(self.run_command("cat", ["/mnt/lists/words.txt"]),
+                                 "cat: /mnt/lists/words.txt: File too large")
+                self.assertEqual(self.computer.sys_pread("/mnt/lists/words.txt", 4, 11).data, b"gamm")
+
+            # The mount point has to be empty
+            self.assertFalse(self.computer.run_command("mount", ["--bind-host", host_dir, "/mnt"], True).success)
+
+            # Host files aren't saved, loading mounts the host directory again
+            self.computer.sessions.pop()
+            with tempfile.TemporaryDirectory() as save_dir:
+                save_path = os.path.join(save_dir, "blackhat.save")
+                self.assertTrue(self.computer.save(save_path))
+                with open(save_path, "rb") as f:
+                    self.assertNotIn(b"gamma", f.read())
+                loaded = Computer.load(save_path, Database(MEMORY)).data
+
+            self.assertEqual(loaded.fs.find("/mnt/lists/words.txt").data.content, "alpha\nbeta\ngamma\n")
+            self.assertEqual(loaded.sys_getmounts().data, {"/mnt": os.path.realpath(host_dir)})
+
     def test_mv(self):
         self.run_command("mv", ["--version"])
         self.run_command("mv", ["--help"])
@@ -341,6 +847,63 @@ def test_mv(self):
         find_pwd = self.computer.fs.find("/tmp/pwd")
         self.assertTrue(find_pwd.success)
 
+        # Directories are moved in place, and the paths of everything inside of them follow
+        self.run_command("mkdir", ["/tmp/outer"])
+        self.run_command("mkdir", ["/tmp/outer/inner"])
+        inner = self.computer.fs.find("/tmp/outer/inner").data
+        self.assertEqual(inner.pwd(), "/tmp/outer/inner")
+
+        self.run_command("mv", ["/tmp/outer", "/root/renamed"])
+        self.assertIs(self.computer.fs.find("/root/renamed/inner").data, inner)
+        self.assertEqual(inner.pwd(), "/root/renamed/inner")
+        self.assertFalse(self.computer.fs.find("/tmp/outer").success)
+
+        # A directory can't be moved inside of itself
+        self.assertFalse(self.computer.run_command("mv", ["/root/renamed", "/root/renamed/inner"], True).success)
+
+    def test_newusers(self):
+        self.run_command("newusers", ["--version"])
+        self.run_command("newusers", ["--help"])
+
+        self.run_command("touch", ["users"])
+        self.computer.sys_write("/home/steve/users", "alice:password\n"
+                                                      "bob:password:2000\n"
+                                                      "\n"
+                                                      "carol:password::staff\n"
+                                                      "dave:password::2000::/tmp/dave\n")
+
+        result = self.computer.run_command("newusers", ["/home/steve/users"], True)
+        self.assertEqual(result.message, ResultMessages.NOT_ALLOWED)
+
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+
+        # Everyone is added with one commit
+        queries = []
+        self.computer.connection.set_trace_callback(queries.append)
+        self.assertTrue(self.computer.run_command("newusers", ["/home/steve/users"], True).success)
+        self.computer.connection.set_trace_callback(None)
+        self.assertEqual(queries.count("COMMIT"), 1)
+
+        # New UIDs follow the highest one, and each user's group gets the same number (if it's free)
+        passwd = self.run_command("cat", ["/etc/passwd"])
+        self.assertIn("alice:x:1001:1001", passwd)
+        self.assertIn("bob:x:2000:2000", passwd)
+        self.assertIn("carol:x:2001:2001", passwd)
+        self.assertIn("dave:x:2002:2000", passwd)
+        self.assertIn("staff:x:2001:carol", self.run_command("cat", ["/etc/group"]))
+
+        # Home directories are made from /etc/skel
+        home = self.computer.fs.find("/home/alice").data
+        self.assertEqual((home.owner, home.group_owner), (1001, 1001))
+        self.assertIn("export HOME=/tmp/dave", self.computer.sys_read("/tmp/dave/.shellrc").data)
+
+        # A bad line (or an existing user) means nobody is added
+        self.computer.sys_write("/home/steve/users", "eve:password\nalice:password\n")
+        result = self.run_command("newusers", ["/home/steve/users"])
+        self.assertEqual(result, "newusers: line 2: can't add user")
+        self.assertFalse(self.computer.get_user(username="eve").success)
+        self.assertEqual(self.computer.allocate_uid(), 2003)
+
     def test_passwd(self):
         self.run_command("passwd", ["--version"])
         self.run_command("passwd", ["--help"])
@@ -388,6 +951,18 @@ def test_pwd(self):
 
         self.assertEqual("/home/steve", pwd_result)
 
+    def test_readlink(self):
+        self.run_command("readlink", ["--version"])
+        self.run_command("readlink", ["--help"])
+
+        self.run_command("ln", ["-s", "/etc", "etc_link"])
+        self.run_command("ln", ["-s", "etc_link/hostname", "hostname_link"])
+
+        self.assertEqual(self.run_command("readlink", ["hostname_link"]), "etc_link/hostname")
+        self.assertEqual(self.run_command("readlink", ["-f", "hostname_link"]), "/etc/hostname")
+        # Not a link
+        self.assertFalse(self.computer.run_command("readlink", ["/etc/hostname"], True).success)
+
     def test_rm(self):
         self.run_command("rm", ["--version"])
         self.run_command("rm", ["--help"])
@@ -453,6 +1028,67 @@ def test_rm(self):
         self.assertNotIn("file1", ls_result)
         self.assertNotIn("file2", ls_result)
 
+    def test_search(self):
+        self.run_command("search", ["--version"])
+        self.run_command("search", ["--help"])
+
+        self.computer.sys_write("/home/steve/.shellrc", "export SECRET=hunter2\n")
+        expected = "/home/steve/.shellrc:1:export SECRET=hunter2"
+
+        # Without a content index, every file is read
+        self.assertEqual(self.run_command("search", ["hunter2"]), expected)
+        self.assertEqual(self.run_command("search", ["-i", "HUNTER2", "/home"]), expected)
+
+        # Only root can build the index
+        self.assertFalse(self.computer.run_command("updatedb", ["--content"], True).success)
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.run_command("updatedb", ["--content"])
+        self.computer.sessions.pop()
+
+        index = self.computer.fs.content_index
+        self.assertIn(self.computer.fs.find("/home/steve/.shellrc").data, index.candidates(["hunter2"]))
+        self.assertEqual(self.run_command("search", ["hunter2"]), expected)
+        self.assertEqual(self.run_command("search", ["-l", "hunter2", "/home"]), "/home/steve/.shellrc")
+
+        # The index follows writes, moves and deletes
+        self.run_command("touch", ["notes"])
+        self.computer.sys_write("/home/steve/notes", "the wifi password is hunter3")
+        self.assertEqual(self.run_command("search", ["-l", "hunter3"]), "/home/steve/notes")
+        self.computer.sys_write("/home/steve/notes", "nothing to see here")
+        self.assertEqual(self.run_command("search", ["-l", "hunter3"]), "")
+        notes = self.computer.fs.find("/home/steve/notes").data
+        self.assertIn(notes, index.candidates(["nothing to see"]))
+        self.run_command("rm", ["notes"])
+        self.assertNotIn(notes, index.candidates(["nothing to see"]))
+
+        # A file is reindexed once per command, and not at all if it's gone by the end of it
+        self.run_command("touch", ["log", "temp"])
+        log = self.computer.fs.find("/home/steve/log").data
+        temp = self.computer.fs.find("/home/steve/temp").data
+        with unittest.mock.patch.object(index, "add", wraps=index.add) as add, event_batch():
+            for line in ["one\n", "two\n", "three\n"]:
+                self.computer.sys_write("/home/steve/log", log.content + line)
+            self.computer.sys_write("/home/steve/temp", "hunter4")
+            self.run_command("rm", ["temp"])
+        add.assert_called_once_with(log, "one\ntwo\nthree\n")
+        self.assertNotIn(temp, index.candidates(["hunter4"]))
+
+        # grep -r uses the index too (and still reports files it can't read)
+        self.assertEqual(self.run_command("grep", ["-r", "hunter2", "/home"]), "/home/steve/.shellrc:export SECRET=hunter2")
+        self.assertIn("/etc/shadow: Permission denied", self.run_command("grep", ["-r", "hunter2", "/etc"]))
+
+        # /etc/group is regenerated without write(), the index still has to know about new groups
+        self.computer.add_group("searchme")
+        self.assertTrue(self.computer.sync_user_and_group_files().success)
+        self.assertEqual(self.run_command("search", ["-l", "searchme", "/etc"]), "/etc/group")
+
+        # Over the memory cap, the index gives up and searches read every file again
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.run_command("updatedb", ["--content", "--content-limit", "10"])
+        self.computer.sessions.pop()
+        self.assertTrue(self.computer.fs.content_index.overflowed)
+        self.assertEqual(self.run_command("search", ["hunter2"]), expected)
+
     def test_sha1sum(self):
         self.run_command("sha1sum", ["--version"])
         self.run_command("sha1sum", ["--help"])
@@ -593,6 +1229,62 @@ def test_tail(self):
         actual_result = self.run_command("tail", ["bigfile"])
 
         self.assertEqual(expected_result, actual_result)
+        self.assertEqual(self.run_command("tail", ["-n", "2", "bigfile"]), "ninteen\ntwenty")
+
+        # --follow waits for changes with inotify, so run it in another thread and change the file from here
+        follow_result = {}
+        follow_thread = Thread(target=lambda: follow_result.setdefault(
+            "data", self.run_command("tail", ["-f", "-n", "1", "-s", "0.05", "bigfile"])))
+        follow_thread.start()
+
+        # Wait for tail to start watching
+        while not any(instance.watches for instance in self.computer.inotify_instances.values()):
+            sleep(0.01)
+
+        self.computer.sys_write("/home/steve/bigfile", message + "\ntwenty one")
+        sleep(0.2)
+        self.computer.sys_unlink("/home/steve/bigfile")
+        follow_thread.join(5)
+
+        self.assertEqual(follow_result["data"], "twenty\n\ntwenty one\n"
+                                                "tail: 'bigfile' has become inaccessible: No such file or directory\n"
+                                                "tail: no files remaining")
+        # The inotify instance was closed
+        self.assertEqual(self.computer.inotify_instances, {})
+
+        # Watches only report what they were asked for, and only on the watched path
+        fd = self.computer.sys_inotify_init().data
+        self.run_command("mkdir", ["watched"])
+        self.run_command("mkdir", ["watched/sub"])
+        wd = self.computer.sys_inotify_add_watch(fd, "watched", InotifyMask.IN_CREATE | InotifyMask.IN_DELETE).data
+        recursive_wd = self.computer.sys_inotify_add_watch(fd, "watched/sub",
+                                                           InotifyMask.IN_CREATE | InotifyMask.IN_RECURSIVE).data
+        self.run_command("touch", ["unwatched"])
+        self.run_command("touch", ["watched/file"])
+        self.run_command("mkdir", ["watched/sub/deeper"])
+        self.run_command("touch", ["watched/sub/deeper/file"])
+        self.run_command("rm", ["watched/file"])
+
+        events = [(x.wd, x.mask, x.name) for x in self.computer.sys_inotify_read(fd).data]
+        self.assertEqual(events, [(wd, InotifyMask.IN_CREATE, "file"),
+                                  (recursive_wd, InotifyMask.IN_CREATE | InotifyMask.IN_ISDIR, "deeper"),
+                                  (recursive_wd, InotifyMask.IN_CREATE, "deeper/file"),
+                                  (wd, InotifyMask.IN_DELETE, "file")])
+
+        # A full queue drops events and reports a single overflow
+        self.computer.inotify_instances[fd].max_queued_events = 2
+        for name in ["a", "b", "c", "d"]:
+            self.run_command("touch", [f"watched/{name}"])
+        events = [(x.wd, x.mask, x.name) for x in self.computer.sys_inotify_read(fd).data]
+        self.assertEqual(events, [(wd, InotifyMask.IN_CREATE, "a"), (wd, InotifyMask.IN_CREATE, "b"),
+                                  (wd, InotifyMask.IN_Q_OVERFLOW, "")])
+
+        # Removing the watch is reported too
+        self.assertTrue(self.computer.sys_inotify_rm_watch(fd, wd).success)
+        self.run_command("touch", ["watched/e"])
+        events = [(x.wd, x.mask) for x in self.computer.sys_inotify_read(fd).data]
+        self.assertEqual(events, [(wd, InotifyMask.IN_IGNORED)])
+        self.assertTrue(self.computer.sys_close(fd).success)
 
         # TODO: Test --wrap flag
 
@@ -636,6 +1328,21 @@ def test_unset(self):
         self.run_command("unset", ["BASH"])
         self.assertEqual("PATH=/bin:/usr/bin\nHOME=/home/steve\nUSER=steve", self.run_command("printenv"))
 
+    def test_updatedb(self):
+        self.run_command("updatedb", ["--version"])
+        self.run_command("updatedb", ["--help"])
+
+        # Only root can build the database
+        self.assertFalse(self.computer.run_command("updatedb", [], True).success)
+
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+
+        self.assertTrue(self.computer.run_command("updatedb", ["-t"], True).success)
+        self.assertIn("/etc/passwd", self.computer.fs.path_index)
+        self.assertIn("/bin/updatedb", self.computer.fs.path_index)
+        # /proc is pruned
+        self.assertNotIn("/proc/uptime", self.computer.fs.path_index)
+
     def test_uptime(self):
         self.run_command("uptime", ["--version"])
         self.run_command("uptime", ["--help"])
@@ -756,6 +1463,9 @@ class TestInstallableBinaries(unittest.TestCase):
     def setUp(self) -> None:
         self.computer = init()
 
+    def tearDown(self) -> None:
+        self.computer.unregister()
+
     def run_command(self, command, args=None):
         if args is None:
             args = []
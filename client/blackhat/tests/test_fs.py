@@ -0,0 +1,475 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from random import Random
+from threading import Event, Thread, current_thread
+from time import sleep
+from unittest.mock import patch
+
+from .setup_computers_universal import init
+from ..blobstore import blob_store
+from ..computer import Computer, Router
+from ..database import MEMORY, Database
+from ..fs import Directory, File
+from ..journal import SnapshotPickler
+from ..session import Session
+
+
+class TestFileSystem(unittest.TestCase):
+    """
+    These test cases test the file system itself (things that aren't tied to a single binary)
+    """
+
+    def setUp(self) -> None:
+        self.computer = init()
+
+    def tearDown(self) -> None:
+        self.computer.unregister()
+
+    def test_proc(self):
+        blobs = len(blob_store)
+
+        uptime = self.computer.sys_read("/proc/uptime")
+        self.assertTrue(uptime.success)
+        self.assertGreaterEqual(float(uptime.data), 0)
+        self.assertIn("MemTotal:", self.computer.sys_read("/proc/meminfo").data)
+        self.assertEqual(len(self.computer.sys_read("/proc/loadavg").data.split()), 5)
+        self.assertTrue(self.computer.sys_read("/proc/net/route").data.startswith("Iface\tDestination"))
+
+        # Generated content is never stored
+        self.assertEqual(len(blob_store), blobs)
+        self.assertEqual(self.computer.fs.find("/proc/meminfo").data.size, 0)
+
+        # Every session gets a directory, for as long as it's open
+        session = Session(0, self.computer.fs.files, 42)
+        self.computer.sessions.append(session)
+        status = self.computer.fs.find("/proc/42/status").data
+        self.assertIn("Uid:\t0\t0\t0", self.computer.sys_read("/proc/42/status").data)
+        # The node stays the same while the entry exists
+        self.assertIs(self.computer.fs.find("/proc/42/status").data, status)
+        self.computer.sessions.pop()
+        self.assertFalse(self.computer.fs.find("/proc/42").success)
+
+        # Not even root can change /proc
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.assertFalse(self.computer.sys_write("/proc/uptime", "0").success)
+        self.assertFalse(self.computer.fs.find("/proc/uptime").data.delete(self.computer).success)
+        self.assertFalse(self.computer.sys_creat("/proc/new", 0o644).success)
+        self.assertFalse(self.computer.sys_rename("/proc/uptime", "/tmp/uptime").success)
+
+        # And it's left out of saves
+        self.assertNotIn("proc", self.computer.fs.files.__getstate__()["files"])
+
+    def test_rendered_identity_files(self):
+        passwd = self.computer.fs.find("/etc/passwd").data
+        group = self.computer.fs.find("/etc/group").data
+        renders = []
+        render = passwd.render
+        passwd.render = lambda: renders.append(1) or render()
+
+        # Changes only mark the files stale...
+        for name in ["alice", "bob"]:
+            uid = self.computer.add_user(name, "password").data
+            gid = self.computer.add_group(name).data
+            self.computer.add_user_to_group(uid, gid, "primary")
+        self.assertTrue(passwd.stale)
+        self.assertEqual(renders, [])
+
+        # ...and they're rendered once, when they're read
+        self.assertIn("alice:x:1001:1001\nbob:x:1002:1002\n", self.computer.sys_read("/etc/passwd").data)
+        self.assertEqual(renders, [1])
+        self.assertFalse(passwd.stale)
+
+        self.computer.add_user_to_group(1001, 1002)
+        self.assertIn("bob:x:1002:alice,bob\n", group.content)
+
+        # Sizes are passed up the tree when they're rendered
+        root = self.computer.fs.files
+        self.assertEqual(root.size, root.calculate_size())
+
+        # Reading the size of a directory renders the stale files inside of it first (du doesn't have to read them)
+        du_before = self.computer.run_command("du", ["-s", "-b", "/etc"], True).data
+        self.computer.add_user("carol", "password")
+        self.assertTrue(passwd.stale)
+        self.assertNotEqual(self.computer.run_command("du", ["-s", "-b", "/etc"], True).data, du_before)
+        self.assertFalse(passwd.stale)
+        self.assertEqual(root.size, root.calculate_size())
+
+    def test_membership_type_change(self):
+        gid = self.computer.add_group("staff").data
+        self.assertTrue(self.computer.add_user_to_group(1000, gid).success)
+        self.assertTrue(self.computer.add_user_to_group(1000, gid, "primary").success)
+
+        # Still one membership, in the database and in the cache
+        rows = self.computer.database.execute("SELECT membership_type FROM group_membership WHERE computer_id=? AND "
+                                              "user_uid=1000 AND group_gid=?", (self.computer.id, gid)).fetchall()
+        self.assertEqual(rows, [("primary",)])
+        self.computer.load_identities()
+        self.assertEqual(self.computer.memberships[1000][gid], "primary")
+
+    def test_identity_file_edits(self):
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        passwd = self.computer.sys_read("/etc/passwd").data
+
+        # Saving the file unchanged doesn't touch the database
+        queries = []
+        self.computer.connection.set_trace_callback(queries.append)
+        self.computer.sys_write("/etc/passwd", passwd)
+        self.assertEqual(queries, [])
+
+        # Only the new/changed lines are applied, with one commit
+        self.computer.sys_write("/etc/passwd", passwd + "alice:x:2000:2000\nbob:x:2001:2000\n")
+        self.computer.sys_write("/etc/shadow", self.computer.sys_read("/etc/shadow").data.replace(
+            "steve:" + self.computer.get_user(uid=1000).data.password, "steve:hash"))
+        self.computer.connection.set_trace_callback(None)
+        self.assertEqual(queries.count("COMMIT"), 2)
+        self.assertEqual(self.computer.get_user(uid=1000).data.password, "hash")
+        self.assertEqual(self.computer.get_user_primary_group(2001).data, [2000])
+
+        # Lines that can't be applied disappear when the file is read again
+        group = self.computer.sys_read("/etc/group").data
+        self.computer.sys_write("/etc/group", group + "staff:x:2000:\nwheel:x:10:\n")
+        group = self.computer.sys_read("/etc/group").data
+        self.assertNotIn("staff", group)
+        self.assertIn("wheel:x:10:\n", group)
+        self.computer.sessions.pop()
+
+    def test_database_cleanup(self):
+        database = Database(MEMORY)
+        router, kept, dropped = Router(database), Computer(database), Computer(database)
+        router.add_new_client(kept)
+        self.assertEqual({x.id for x in kept.get_world()}, {router.id, kept.id})
+
+        def rows(computer_id):
+            return sum(database.connection.execute(f"SELECT COUNT(*) FROM {table} WHERE {column}=?",
+                                                   (computer_id,)).fetchone()[0]
+                       for table, column in [("computer", "id"), ("blackhat_user", "computer_id"),
+                                             ("blackhat_group", "computer_id"), ("group_membership", "computer_id")])
+
+        # Everything that isn't part of the world is deleted
+        self.assertEqual(database.collect_garbage(x.id for x in kept.get_world()), 1)
+        self.assertEqual(rows(dropped.id), 0)
+        self.assertEqual(rows(kept.id), 4)
+        self.assertTrue(database.optimize())
+
+        # Unregistering takes the computer's rows (and cached users) with it
+        kept.unregister()
+        self.assertEqual(rows(kept.id), 0)
+        self.assertFalse(kept.get_user(uid=0).success)
+
+    def test_save_and_load(self):
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.computer.run_command("adduser", ["alice", "-p", "password", "-n"], True)
+        self.computer.run_command("updatedb", ["--content"], True)
+        self.computer.sessions.pop()
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_path = os.path.join(directory, "blackhat.save")
+            self.assertTrue(self.computer.save(save_path))
+
+            # Loaded into an empty database, which isn't touched until it's needed
+            database = Database(MEMORY)
+            loaded = Computer.load(save_path, database).data
+
+        self.assertIsNone(loaded._db)
+        # (Looking for attributes doesn't connect either)
+        self.assertFalse(hasattr(loaded, "missing"))
+        self.assertIsNone(loaded._db)
+        self.assertEqual(database.connection.execute("SELECT COUNT(*) FROM blackhat_user").fetchone()[0], 0)
+        self.assertEqual([x.username for x in loaded.get_all_users().data], ["root", "steve", "alice"])
+        self.assertIn("alice:x:1001:1001", loaded.sys_read("/etc/passwd").data)
+        self.assertTrue(loaded.sys_read("/proc/uptime").success)
+
+        # The identity tables are written back the first time the database is used
+        loaded.update_libs()
+        loaded.sessions.append(Session(0, loaded.fs.files, loaded.sessions[-1].id + 1))
+        self.assertTrue(loaded.run_command("adduser", ["bob", "-p", "password", "-n"], True).success)
+        self.assertIs(loaded.db, database)
+        loaded.load_identities()
+        self.assertEqual([x.username for x in loaded.get_all_users().data], ["root", "steve", "alice", "bob"])
+        self.assertEqual(loaded.get_user_primary_group(1001).data, [1001])
+
+    def test_journaled_save(self):
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_path = os.path.join(directory, "blackhat.save")
+            self.assertTrue(self.computer.save(save_path))
+            snapshot = os.stat(save_path).st_mtime_ns
+
+            for path in ["/tmp/a", "/tmp/dir/sub/file", "/tmp/gone"]:
+                self.computer.run_command("mkdir", ["-p", os.path.dirname(path)], True)
+                self.computer.sys_creat(path, 0o644)
+                self.computer.sys_write(path, path)
+            self.computer.run_command("mv", ["/tmp/dir", "/tmp/moved"], True)
+            self.computer.run_command("chmod", ["-R", "700", "/tmp/moved"], True)
+            self.computer.run_command("rm", ["/tmp/gone"], True)
+            self.computer.run_command("adduser", ["alice", "-p", "password", "-n"], True)
+
+            # Only the changes are appended to the journal
+            self.assertTrue(self.computer.save(save_path))
+            self.assertEqual(os.stat(save_path).st_mtime_ns, snapshot)
+
+            # A batch that was only partly written is ignored
+            with open(save_path + ".journal", "ab") as f:
+                f.write(b"\x80\x05torn")
+
+            loaded = Computer.load(save_path, Database(MEMORY)).data
+            self.assertEqual(loaded.sys_read("/tmp/a").data, "/tmp/a")
+            self.assertEqual(loaded.sys_read("/tmp/moved/sub/file").data, "/tmp/dir/sub/file")
+            self.assertEqual(loaded.fs.find("/tmp/moved/sub/file").data.get_perm_octal(), 0o700)
+            self.assertFalse(loaded.fs.find("/tmp/dir").success)
+            self.assertFalse(loaded.fs.find("/tmp/gone").success)
+            self.assertEqual(loaded.get_user(username="alice").data.uid, 1001)
+            self.assertTrue(loaded.fs.find("/home/alice").success)
+
+            # Past the threshold, a new snapshot is written (in the background) and the journal starts over
+            loaded.fs.journal.threshold = 0
+            loaded.update_libs()
+            loaded.sys_creat("/tmp/b", 0o644)
+            threads = []
+            dump = SnapshotPickler.dump
+            with patch.object(SnapshotPickler, "dump",
+                              lambda pickler, world: threads.append(current_thread()) or dump(pickler, world)):
+                self.assertTrue(loaded.save(save_path))
+                # The world is pickled as it was when it was saved, changes made in the meantime go in the new journal
+                loaded.sys_write("/tmp/b", "after")
+                loaded.fs.journal.wait()
+            self.assertEqual(len(threads), 1)
+            self.assertIsNot(threads[0], current_thread())
+            self.assertNotEqual(os.stat(save_path).st_mtime_ns, snapshot)
+            self.assertEqual(loaded.fs.journal.size, os.path.getsize(save_path + ".journal"))
+            with open(save_path, "rb") as f:
+                self.assertEqual(pickle.load(f).fs.find("/tmp/b").data.content, "")
+
+            self.assertTrue(loaded.save(save_path))
+            loaded.fs.journal.wait()
+            compacted = Computer.load(save_path, Database(MEMORY)).data
+            self.assertEqual(compacted.sys_read("/tmp/b").data, "after")
+            self.assertEqual(compacted.sys_read("/tmp/a").data, "/tmp/a")
+
+            # Changes to what the journal doesn't record make the next save a full snapshot
+            compacted.update_libs()
+            snapshot = os.stat(save_path).st_mtime_ns
+            self.assertTrue(compacted.run_command("hostname", ["newhost"], True).success)
+            compacted.fs.quotas[1000] = 1 << 20
+            self.assertTrue(compacted.save(save_path))
+            self.assertNotEqual(os.stat(save_path).st_mtime_ns, snapshot)
+
+            renamed = Computer.load(save_path, Database(MEMORY)).data
+            self.assertEqual(renamed.hostname, "newhost")
+            self.assertEqual(renamed.sys_read("/etc/hostname").data, "newhost")
+            self.assertEqual(renamed.fs.quotas, {1000: 1 << 20})
+
+    def test_rejected_move(self):
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        self.computer.run_command("updatedb", [], True)
+        self.computer.run_command("mkdir", ["-p", "/tmp/a/b"], True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_path = os.path.join(directory, "blackhat.save")
+            self.assertTrue(self.computer.save(save_path))
+
+            # A directory can't be moved inside of itself, and nothing acts like it was
+            self.assertFalse(self.computer.sys_rename("/tmp/a", "/tmp/a/b/c").success)
+            self.assertIn("/tmp/a", self.computer.fs.path_index)
+            self.assertIn("/tmp/a/b", self.computer.fs.path_index)
+            self.assertEqual(self.computer.run_command("locate", ["/tmp/a"], True).data.split(), ["/tmp/a", "/tmp/a/b"])
+
+            self.computer.sys_creat("/tmp/a/b/file", 0o644)
+            self.assertTrue(self.computer.save(save_path))
+            loaded = Computer.load(save_path, Database(MEMORY)).data
+            self.assertTrue(loaded.fs.find("/tmp/a/b/file").success)
+
+        self.computer.sessions.pop()
+
+    def test_credentials(self):
+        credentials = self.computer.get_credentials()
+        self.assertEqual((credentials.uid, credentials.euid, credentials.gid), (1000, 1000, 1000))
+        # Looked up once, then reused
+        self.assertIs(self.computer.get_credentials(), credentials)
+
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+        gid = self.computer.add_group("staff").data
+        self.computer.sys_creat("/tmp/staff_only", 0o640)
+        self.computer.sys_chown("/tmp/staff_only", 0, gid)
+        self.computer.sessions.pop()
+
+        staff_only = self.computer.fs.find("/tmp/staff_only").data
+        self.assertFalse(staff_only.check_perm("read", self.computer).success)
+
+        # Group changes make new credentials
+        self.computer.add_user_to_group(1000, gid)
+        self.assertIsNot(self.computer.get_credentials(), credentials)
+        self.assertIn(gid, self.computer.get_credentials().groups)
+        self.assertTrue(staff_only.check_perm("read", self.computer).success)
+
+        # So do UID changes
+        self.computer.sessions[-1].effective_uid = 0
+        self.assertEqual(self.computer.get_credentials().euid, 0)
+        self.assertEqual(self.computer.get_credentials().egid, 0)
+
+    def test_concurrent_create_rename_delete(self):
+        # Deleting needs read+write permission on every file, so the workers run as root
+        self.computer.sessions.append(Session(0, self.computer.fs.files, self.computer.sessions[-1].id + 1))
+
+        work_dir = Directory("stress", self.computer.fs.find("/tmp").data, 0, 0)
+        for name in ["a", "b", "c"]:
+            Directory(name, work_dir, 0, 0)
+
+        # Give up the GIL between the checks and the changes of every create/rename/delete, so the races actually happen
+        for event in ["write", "move", "delete"]:
+            work_dir.events.subscribe(event, lambda node: sleep(0), "before", recursive=True)
+
+        root = self.computer.fs.files
+        root_size = root.size
+        created, deleted, errors = [], [], []
+
+        def nodes(directory):
+            # Snapshot of everything under `directory` (each file map is copied under its lock)
+            found = []
+            stack = [directory]
+            while stack:
+                current = stack.pop()
+                with current.lock.read():
+                    children = list(current.files.values())
+                found.extend(children)
+                stack.extend(x for x in children if x.is_directory())
+            return found
+
+        def worker(seed):
+            random = Random(seed)
+            try:
+                for step in range(300):
+                    everything = nodes(work_dir)
+                    directories = [work_dir] + [x for x in everything if x.is_directory()]
+                    action = random.random()
+
+                    if action < 0.4 or not everything:
+                        parent = random.choice(directories)
+                        if random.random() < 0.2:
+                            node = Directory(f"d{seed}-{step}", parent, 0, 0)
+                        else:
+                            node = File(f"f{seed}-{step}", "x" * random.randint(0, 64), parent, 0, 0)
+                        if node.parent is parent and parent.find(node.name) is node:
+                            created.append(node)
+                    elif action < 0.75:
+                        # Names are picked from a small pool so renames collide
+                        random.choice(everything).move(random.choice(directories), f"n{random.randint(0, 20)}")
+                    else:
+                        node = random.choice(everything)
+                        if node.delete(self.computer).success:
+                            deleted.append(node)
+            except Exception as e:
+                errors.append(e)
+
+        # Switch threads as often as possible to shake out races
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [Thread(target=worker, args=(x,)) for x in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(errors, [])
+
+        # Every node is in its parent's file map under its own name, and reachable exactly once
+        seen = set()
+        for node in nodes(work_dir):
+            self.assertNotIn(id(node), seen)
+            seen.add(id(node))
+            self.assertIs(node.parent.files[node.name], node)
+            self.assertEqual(node.pwd(), f"{node.parent.pwd()}/{node.name}")
+
+        # Nothing was lost or left behind (deleting a directory takes everything inside of it with it)
+        gone = {id(x) for x in deleted}
+        for node in deleted:
+            if node.is_directory():
+                gone |= {id(x) for x in nodes(node)}
+        for node in created:
+            self.assertEqual(id(node) in seen, id(node) not in gone)
+
+        # Sizes were passed up the tree without losing any updates
+        self.assertEqual(root.size, root.calculate_size())
+        for directory in [work_dir] + [x for x in nodes(work_dir) if x.is_directory()]:
+            self.assertEqual(directory.size, directory.calculate_size())
+            self.assertEqual(sum(directory.owner_usage.values()), directory.size)
+        self.assertEqual(root.size - root_size, work_dir.size)
+
+    def test_concurrent_appends(self):
+        # Only directories have a lock (and only nodes with listeners have an `EventBus`)
+        log = File("log", "", self.computer.fs.find("/tmp").data, 1000, 1000)
+        self.assertFalse(hasattr(log, "lock"))
+        self.assertIsNone(log._events)
+
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(200):
+                    self.assertTrue(log.append("x", self.computer).success)
+                    self.assertIs(self.computer.fs.find("/tmp/log").data, log)
+            except Exception as e:
+                errors.append(e)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        # No append was lost, and neither was any size change
+        self.assertEqual(errors, [])
+        self.assertEqual(log.content, "x" * 1600)
+        self.assertEqual(self.computer.fs.files.size, self.computer.fs.files.calculate_size())
+
+    def test_concurrent_identity_transactions(self):
+        started, changed = Event(), Event()
+        depths = []
+
+        def failing():
+            try:
+                with self.computer.identity_transaction():
+                    self.computer.add_user("frank", "password")
+                    started.set()
+                    # Give the other thread time to try its change while this transaction is open
+                    changed.wait(0.2)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        def adding():
+            started.wait()
+            # Transactions belong to the thread that opened them
+            depths.append(self.computer.db.transaction_depth)
+            self.assertTrue(self.computer.add_user("grace", "password").success)
+            changed.set()
+
+        threads = [Thread(target=failing), Thread(target=adding)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # The other thread's user wasn't rolled back with the failed transaction (or committed in the middle of it)
+        self.assertEqual(depths, [0])
+        self.assertFalse(self.computer.get_user(username="frank").success)
+        self.assertTrue(self.computer.get_user(username="grace").success)
+        self.computer.load_identities()
+        self.assertFalse(self.computer.get_user(username="frank").success)
+        self.assertTrue(self.computer.get_user(username="grace").success)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,9 @@
 import os
-import pickle
 import sys
 from getpass import getpass
 
 from blackhat.computer import Computer, Router, ISPRouter
+from blackhat.database import MEMORY, get_database
 from blackhat.services.aptserver import AptServer
 from blackhat.services.sshserver import SSHServer
 from blackhat.services.webserver import WebServer
@@ -21,38 +21,85 @@
 else:
     os.environ["DEBUGMODE"] = "false"
 
+# The world's identity database: in memory (written next to the save file when the game is saved) unless a database
+# file is given
+if "--db" in sys.argv:
+    try:
+        database_path = sys.argv[sys.argv.index("--db") + 1]
+        sys.argv.remove("--db")
+        sys.argv.remove(database_path)
+    except IndexError:
+        print(f"{__file__}: --db requires additional arguments")
+        exit()
+else:
+    database_path = MEMORY
+
+database = get_database(database_path)
+
+# Maintenance mode: delete the rows of every computer that isn't part of the save (argv[1], or blackhat.save) from the
+# database file, then compact it
+if "--gc-db" in sys.argv:
+    sys.argv.remove("--gc-db")
+
+    if database_path == MEMORY:
+        print(f"{__file__}: --gc-db requires --db")
+        exit()
+
+    save_path = sys.argv[1] if len(sys.argv) > 1 else "blackhat.save"
+
+    load_result = Computer.load(save_path, database)
+
+    if not load_result.success:
+        print(f"Failed to load save '{save_path}'! Nothing was removed.")
+        exit()
+
+    removed = database.collect_garbage([computer.id for computer in load_result.data.get_world()])
+    database.optimize()
+    print(f"Removed {removed} computers from {database_path}")
+    exit()
+
 # Try to load the game from argv[1]
 if len(sys.argv) > 1:
-    try:
-        with open(sys.argv[1], "rb") as f:
-            comp = pickle.load(f)
-            load_save_success = True
-            comp.run_current_user_shellrc()
-    except Exception:
+    load_result = Computer.load(sys.argv[1], database)
+
+    if load_result.success:
+        comp = load_result.data
+        load_save_success = True
+        shell = Shell(comp)  # We need to setup the shell BEFORE the shellrc because aliases are shell-level things
+        comp.run_current_user_shellrc()
+    else:
         print("Failed to load save! Trying to load default save.")
 
 elif "toload" in os.listdir():
-    try:
-        with open("toload", "r") as f:
-            save_to_load = f.read().split("\n")[0]
-
-        with open(save_to_load, "rb") as f:
-            comp = pickle.load(f)
-            os.remove("toload")
-            load_save_success = True
-            comp.run_current_user_shellrc()
-    except Exception:
+    with open("toload", "r") as f:
+        save_to_load = f.read().split("\n")[0]
+
+    load_result = Computer.load(save_to_load, database)
+
+    if load_result.success:
+        comp = load_result.data
+        os.remove("toload")
+        load_save_success = True
+        shell = Shell(comp)
+        comp.run_current_user_shellrc()
+    else:
         print("Failed to load save! Trying to load default save.")
 
 # If we couldn't load a specific save, lets try to load the default `blackhat.save` file
 if not load_save_success:
     if "blackhat.save" in os.listdir():
-        with open("blackhat.save", "rb") as f:
-            comp = pickle.load(f)
+        load_result = Computer.load("blackhat.save", database)
+
+        if not load_result.success:
+            print("Failed to load save!")
+            exit()
+
+        comp = load_result.data
+        shell = Shell(comp)
         comp.run_current_user_shellrc()
     # Let's start a new game save
     else:
-        comp = Computer()
+        comp = Computer(database)
 
         if "-u" in sys.argv:
             try:
@@ -88,8 +135,10 @@
 
         comp.sessions.append(session)
 
-        comp.run_command("adduser", ["steve", "-p", "password", "-n"], False)
-        comp.run_command("adduser", ["mike", "-p", "password", "-n"], False)
+        # One commit (and one /etc/passwd sync) for every account in the world
+        with comp.identity_transaction():
+            comp.run_command("adduser", ["steve", "-p", "password", "-n"], False)
+            comp.run_command("adduser", ["mike", "-p", "password", "-n"], False)
         # comp.add_user(username, password)
 
         # Add user to /etc/sudoers file
@@ -105,21 +154,21 @@
         session = Session(1000, comp.fs.files, 0)
 
         # Tests for networking
-        isp = ISPRouter()
+        isp = ISPRouter(database)
 
         isp.wan = "1.1.1.1"
 
-        lan = Router()
+        lan = Router(database)
 
-        other_comp = Computer()
+        other_comp = Computer(database)
 
         lan.add_new_client(comp)
         lan.add_new_client(other_comp)
 
-        lan2 = Router()
+        lan2 = Router(database)
 
-        lan2_client1 = Computer()
-        lan2_client2 = Computer()
+        lan2_client1 = Computer(database)
+        lan2_client2 = Computer(database)
 
         lan2.add_new_client(lan2_client1)
         lan2.add_new_client(lan2_client2)
@@ -261,4 +310,9 @@
 # shell = NewShell(comp)
 # shell.main()
 
-shell.main()
+try:
+    shell.main()
+finally:
+    # World teardown: a save has its own copy of the identity tables (see `Computer.save()`), so the world's rows don't
+    # need to stay in the database
+    database.delete_computers([computer.id for computer in comp.get_world()])